@@ -0,0 +1,60 @@
+"""Use UUIDv7 primary keys
+
+Revision ID: 3f9a6b0d5e12
+Revises: e7b2d94c1f08
+Create Date: 2026-10-17 15:52:33.604917
+
+Новые строки получают UUIDv7 из приложения (app.core.uuid7), а серверный
+default uuid_generate_v7() покрывает вставки в обход приложения.
+Существующие id не меняются: идентификаторы кошельков уже известны
+клиентам, а старые случайные ключи просто остаются в начале индекса.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a6b0d5e12'
+down_revision: Union[str, None] = 'e7b2d94c1f08'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TABLES = ('wallets', 'transactions', 'wallet_audit_log')
+
+UUID_GENERATE_V7 = """
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(
+                        floor(extract(epoch FROM clock_timestamp()) * 1000)
+                        ::bigint
+                    ) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(UUID_GENERATE_V7)
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('uuid_generate_v7()'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table in TABLES:
+        op.alter_column(table, 'id', server_default=sa.text('gen_random_uuid()'))
+    op.execute('DROP FUNCTION uuid_generate_v7()')
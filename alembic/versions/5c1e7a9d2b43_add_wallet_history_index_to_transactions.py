@@ -0,0 +1,54 @@
+"""Add (wallet_id, created_at, id) index to transactions
+
+Revision ID: 5c1e7a9d2b43
+Revises: 837a8228a5a0
+Create Date: 2026-10-17 12:04:18.552710
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e7a9d2b43'
+down_revision: Union[str, None] = '837a8228a5a0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в большую таблицу, но не может
+    # выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_wallet_id_created_at_id',
+            'transactions',
+            ['wallet_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        # Префикс нового индекса покрывает поиск по одному wallet_id
+        op.drop_index(
+            'ix_transactions_wallet_id',
+            table_name='transactions',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_transactions_wallet_id',
+            'transactions',
+            ['wallet_id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_transactions_wallet_id_created_at_id',
+            table_name='transactions',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,54 @@
+"""Add (wallet_id, created_at, id) index to wallet_audit_log
+
+Revision ID: a41f0c6e8d27
+Revises: 5c1e7a9d2b43
+Create Date: 2026-10-17 13:21:47.190385
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a41f0c6e8d27'
+down_revision: Union[str, None] = '5c1e7a9d2b43'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # CONCURRENTLY не блокирует запись в большую таблицу, но не может
+    # выполняться внутри транзакции
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_wallet_audit_log_wallet_id_created_at_id',
+            'wallet_audit_log',
+            ['wallet_id', 'created_at', 'id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        # Префикс нового индекса покрывает поиск по одному wallet_id
+        op.drop_index(
+            'ix_wallet_audit_log_wallet_id',
+            table_name='wallet_audit_log',
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_wallet_audit_log_wallet_id',
+            'wallet_audit_log',
+            ['wallet_id'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+        op.drop_index(
+            'ix_wallet_audit_log_wallet_id_created_at_id',
+            table_name='wallet_audit_log',
+            postgresql_concurrently=True
+        )
@@ -0,0 +1,52 @@
+"""Add wallet transfers
+
+Revision ID: d5f8a1c3e7b6
+Revises: c2a7f4e9b3d1
+Create Date: 2026-10-17 19:12:40.318274
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd5f8a1c3e7b6'
+down_revision: Union[str, None] = 'c2a7f4e9b3d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Новые значения enum нельзя использовать в той же транзакции,
+    # в которой они добавлены
+    with op.get_context().autocommit_block():
+        op.execute(
+            "ALTER TYPE transactiontype ADD VALUE IF NOT EXISTS 'TRANSFER_IN'"
+        )
+        op.execute(
+            "ALTER TYPE transactiontype ADD VALUE IF NOT EXISTS 'TRANSFER_OUT'"
+        )
+
+    # Колонка без значения по умолчанию: таблица не переписывается
+    op.add_column(
+        'transactions', sa.Column('transfer_id', sa.UUID(), nullable=True)
+    )
+    op.create_index(
+        op.f('ix_transactions_transfer_id'),
+        'transactions',
+        ['transfer_id'],
+        unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Значения TRANSFER_IN/TRANSFER_OUT остаются в типе transactiontype:
+    # PostgreSQL не умеет удалять значения enum
+    op.drop_index(
+        op.f('ix_transactions_transfer_id'), table_name='transactions'
+    )
+    op.drop_column('transactions', 'transfer_id')
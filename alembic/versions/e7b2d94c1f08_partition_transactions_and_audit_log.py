@@ -0,0 +1,158 @@
+"""Partition transactions and wallet_audit_log by month of created_at
+
+Revision ID: e7b2d94c1f08
+Revises: a41f0c6e8d27
+Create Date: 2026-10-17 14:40:09.831562
+
+Существующие таблицы не копируются: они переименовываются в
+<table>_legacy и подключаются первой секцией FROM (MINVALUE) TO (начало
+следующего месяца). Для этого первичный ключ legacy-таблицы
+перестраивается в (id, created_at), а ATTACH проверяет диапазон одним
+последовательным чтением таблицы.
+
+Уникальный индекс по idempotency_key на секционированной таблице
+невозможен без created_at, поэтому ключи переезжают в idempotency_keys.
+"""
+from datetime import datetime, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e7b2d94c1f08'
+down_revision: Union[str, None] = 'a41f0c6e8d27'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+MONTHS_AHEAD = 3
+
+
+def _add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def _transactions_columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('wallet_id', sa.UUID(), nullable=True),
+        sa.Column('type', postgresql.ENUM('DEPOSIT', 'WITHDRAW', name='transactiontype', create_type=False), nullable=False),
+        sa.Column('amount', sa.BigInteger(), nullable=False),
+        sa.Column('status', postgresql.ENUM('PENDING', 'SUCCESS', 'FAILED', name='transactionstatus', create_type=False), nullable=False),
+        sa.Column('balance_after', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+    ]
+
+
+def _audit_log_columns() -> list:
+    return [
+        sa.Column('id', sa.UUID(), server_default=sa.text('gen_random_uuid()'), nullable=False),
+        sa.Column('wallet_id', sa.UUID(), nullable=False),
+        sa.Column('action', sa.String(length=100), nullable=False),
+        sa.Column('old_balance', sa.BigInteger(), nullable=True),
+        sa.Column('new_balance', sa.BigInteger(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+    ]
+
+
+PARTITIONED_TABLES = (
+    ('transactions', _transactions_columns),
+    ('wallet_audit_log', _audit_log_columns),
+)
+
+
+def _partition_table(table: str, columns, boundary: datetime) -> None:
+    legacy = f'{table}_legacy'
+    index = f'ix_{table}_wallet_id_created_at_id'
+
+    op.execute(f'UPDATE {table} SET created_at = now() WHERE created_at IS NULL')
+    op.rename_table(table, legacy)
+    op.execute(f'ALTER TABLE {legacy} ALTER COLUMN created_at SET NOT NULL')
+    op.execute(f'ALTER TABLE {legacy} DROP CONSTRAINT {table}_pkey')
+    op.execute(f'ALTER TABLE {legacy} ADD CONSTRAINT {legacy}_pkey PRIMARY KEY (id, created_at)')
+    op.execute(f'ALTER INDEX {index} RENAME TO {legacy}_wallet_id_created_at_id')
+
+    op.create_table(table, *columns(), postgresql_partition_by='RANGE (created_at)')
+    op.create_index(index, table, ['wallet_id', 'created_at', 'id'], unique=False)
+
+    op.execute(
+        f"ALTER TABLE {table} ATTACH PARTITION {legacy} "
+        f"FOR VALUES FROM (MINVALUE) TO ('{boundary.isoformat()}')"
+    )
+    op.execute(f'CREATE TABLE {table}_default PARTITION OF {table} DEFAULT')
+    for months in range(MONTHS_AHEAD):
+        start = _add_months(boundary, months)
+        op.execute(
+            f"CREATE TABLE {table}_p{start:%Y_%m} PARTITION OF {table} "
+            f"FOR VALUES FROM ('{start.isoformat()}') "
+            f"TO ('{_add_months(start, 1).isoformat()}')"
+        )
+
+
+def _unpartition_table(table: str, columns) -> None:
+    legacy = f'{table}_legacy'
+    index = f'ix_{table}_wallet_id_created_at_id'
+    names = ', '.join(
+        column.name for column in columns() if isinstance(column, sa.Column)
+    )
+
+    op.execute(f'ALTER TABLE {table} DETACH PARTITION {legacy}')
+    op.execute(f'INSERT INTO {legacy} ({names}) SELECT {names} FROM {table}')
+    op.drop_table(table)
+
+    op.rename_table(legacy, table)
+    op.execute(f'ALTER INDEX {legacy}_wallet_id_created_at_id RENAME TO {index}')
+    op.execute(f'ALTER TABLE {table} DROP CONSTRAINT {legacy}_pkey')
+    op.execute(f'ALTER TABLE {table} ADD CONSTRAINT {table}_pkey PRIMARY KEY (id)')
+    op.execute(f'ALTER TABLE {table} ALTER COLUMN created_at DROP NOT NULL')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('idempotency_keys',
+    sa.Column('key', sa.String(length=255), nullable=False),
+    sa.Column('wallet_id', sa.UUID(), nullable=False),
+    sa.Column('type', postgresql.ENUM('DEPOSIT', 'WITHDRAW', name='transactiontype', create_type=False), nullable=False),
+    sa.Column('amount', sa.BigInteger(), nullable=False),
+    sa.Column('new_balance', sa.BigInteger(), nullable=False),
+    sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+    sa.ForeignKeyConstraint(['wallet_id'], ['wallets.id'], ),
+    sa.PrimaryKeyConstraint('key')
+    )
+    op.create_index(op.f('ix_idempotency_keys_created_at'), 'idempotency_keys', ['created_at'], unique=False)
+    op.execute(
+        'INSERT INTO idempotency_keys '
+        '(key, wallet_id, type, amount, new_balance, created_at) '
+        'SELECT idempotency_key, wallet_id, type, amount, balance_after, created_at '
+        'FROM transactions '
+        'WHERE idempotency_key IS NOT NULL AND balance_after IS NOT NULL'
+    )
+    op.drop_index(op.f('ix_transactions_idempotency_key'), table_name='transactions')
+    op.drop_column('transactions', 'idempotency_key')
+
+    now = datetime.now(timezone.utc)
+    boundary = _add_months(
+        now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), 1
+    )
+    for table, columns in PARTITIONED_TABLES:
+        _partition_table(table, columns, boundary)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for table, columns in PARTITIONED_TABLES:
+        _unpartition_table(table, columns)
+
+    # Сохраненные результаты для ключей не переносятся обратно:
+    # повтор запроса со старым ключом будет выполнен заново
+    op.add_column('transactions', sa.Column('idempotency_key', sa.String(length=255), nullable=True))
+    op.create_index(op.f('ix_transactions_idempotency_key'), 'transactions', ['idempotency_key'], unique=True)
+    op.drop_index(op.f('ix_idempotency_keys_created_at'), table_name='idempotency_keys')
+    op.drop_table('idempotency_keys')
@@ -0,0 +1,40 @@
+"""Add as_of index to wallet_balance_snapshots
+
+Revision ID: f4a8c2e6b9d3
+Revises: d5f8a1c3e7b6
+Create Date: 2026-10-17 21:14:05.318276
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4a8c2e6b9d3'
+down_revision: Union[str, None] = 'd5f8a1c3e7b6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Снимок читает max(as_of) - срез предыдущего запуска
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_wallet_balance_snapshots_as_of',
+            'wallet_balance_snapshots',
+            ['as_of'],
+            unique=False,
+            postgresql_concurrently=True
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_wallet_balance_snapshots_as_of',
+            table_name='wallet_balance_snapshots',
+            postgresql_concurrently=True
+        )
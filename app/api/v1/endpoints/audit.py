@@ -3,3 +3,70 @@
 
 GET    /                  - История изменений кошелька
 """
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.pagination import keyset_page
+from app.database import get_read_db
+from app.models import Wallet, WalletAuditLog
+from app.schemas import AuditLogPageSchema
+
+router = APIRouter(
+    prefix="/wallets/{wallet_uuid}/audit",
+    tags=["audit"]
+)
+
+
+@router.get(
+    "/",
+    response_model=AuditLogPageSchema,
+    summary="List wallet audit log"
+)
+async def list_audit_log(
+    wallet_uuid: UUID,
+    limit: int = Query(
+        default=settings.PAGE_DEFAULT_SIZE, ge=1, le=settings.PAGE_MAX_SIZE
+    ),
+    cursor: str | None = Query(default=None),
+    action: str | None = Query(default=None, max_length=100),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Newest first. created_from is inclusive, created_to is exclusive.
+    """
+    query = select(WalletAuditLog).where(
+        WalletAuditLog.wallet_id == wallet_uuid
+    )
+    if action is not None:
+        query = query.where(WalletAuditLog.action == action)
+    if created_from is not None:
+        query = query.where(WalletAuditLog.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(WalletAuditLog.created_at < created_to)
+
+    items, next_cursor = await keyset_page(
+        db,
+        query,
+        WalletAuditLog.created_at,
+        WalletAuditLog.id,
+        limit=limit,
+        cursor=cursor
+    )
+
+    # Пустая первая страница: отличаем кошелек без истории от отсутствующего
+    if not items and cursor is None and not await db.get(Wallet, wallet_uuid):
+        logger.warning("Wallet not found: %s", wallet_uuid)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wallet not found"
+        )
+
+    return {"items": items, "next_cursor": next_cursor}
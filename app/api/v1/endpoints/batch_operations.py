@@ -0,0 +1,94 @@
+"""
+/api/v1/operations
+
+POST   /batch             - Пакет DEPOSIT/WITHDRAW операций по многим кошелькам
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.logger import logger
+from app.core.middleware import writes
+from app.database import WalletSessions, get_wallet_sessions
+from app.schemas import (
+    BatchOperationModeSchema,
+    BatchOperationRequestSchema,
+    BatchOperationResponseSchema,
+    BatchOperationResultSchema
+)
+from app.services.operations import apply_bulk_operations
+
+router = APIRouter(prefix="/operations", tags=["operations"])
+
+
+@router.post(
+    "/batch",
+    response_model=BatchOperationResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Perform DEPOSIT/WITHDRAW operations on many wallets"
+)
+@writes
+async def batch_operations(
+    batch: BatchOperationRequestSchema,
+    sessions: WalletSessions = Depends(get_wallet_sessions)
+):
+    """
+    Apply many operations in one database transaction per shard.
+
+    ALL_OR_NOTHING applies the batch only if every item succeeds and
+    requires all wallets to be on one shard, BEST_EFFORT applies the
+    successful items and reports the failed ones. In BEST_EFFORT mode
+    a shard whose transaction fails marks only its own items as failed.
+    """
+    all_or_nothing = batch.mode == BatchOperationModeSchema.ALL_OR_NOTHING
+    shards = sessions.group(item.wallet_id for item in batch.items)
+    if all_or_nothing and len(shards) > 1:
+        logger.warning("ALL_OR_NOTHING batch spans %s shards", len(shards))
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="ALL_OR_NOTHING batch spans several shards"
+        )
+
+    applied = True
+    results = [None] * len(batch.items)
+    for shard_ids in shards.values():
+        shard_wallets = set(shard_ids)
+        positions = [
+            position
+            for position, item in enumerate(batch.items)
+            if item.wallet_id in shard_wallets
+        ]
+        shard_items = [batch.items[position] for position in positions]
+        try:
+            async with sessions(shard_ids[0]) as db:
+                shard_applied, shard_results = await apply_bulk_operations(
+                    db, shard_items, all_or_nothing=all_or_nothing
+                )
+        except HTTPException as e:
+            if all_or_nothing:
+                raise
+            # Транзакции других шардов уже закоммичены: их результаты
+            # остаются в ответе, элементы этого шарда не применены
+            logger.warning(
+                "Batch shard with %s operations failed: %s",
+                len(shard_items),
+                e.detail
+            )
+            shard_applied = False
+            shard_results = [
+                BatchOperationResultSchema(
+                    wallet_id=item.wallet_id,
+                    status_code=e.status_code,
+                    detail=e.detail
+                )
+                for item in shard_items
+            ]
+        applied = applied and shard_applied
+        for position, result in zip(positions, shard_results):
+            results[position] = result
+
+    logger.info(
+        "Batch of %s operations (%s) %s",
+        len(batch.items),
+        batch.mode.value,
+        "applied" if applied else "rolled back"
+    )
+    return {"mode": batch.mode, "applied": applied, "results": results}
@@ -0,0 +1,28 @@
+"""
+/api/v1/monitoring
+
+GET    /cache             - Статистика кэша кошельков
+GET    /pool              - Состояние пула соединений с БД
+"""
+from fastapi import APIRouter
+
+from app.database import get_pool_stats
+from app.services.wallet_cache import wallet_cache
+
+router = APIRouter(prefix="/monitoring", tags=["monitoring"])
+
+
+@router.get("/cache", summary="Wallet cache statistics")
+async def cache_stats():
+    """
+    Hit/miss counters of the wallet cache in this process.
+    """
+    return wallet_cache.stats()
+
+
+@router.get("/pool", summary="Database connection pool statistics")
+async def pool_stats():
+    """
+    Checked-out, idle and overflow connections and checkout wait time.
+    """
+    return get_pool_stats()
@@ -2,5 +2,163 @@
 /api/v1/wallets/{wallet_uuid}/transactions
 
 GET    /                  - Список транзакций кошелька
+GET    /export            - Потоковая выгрузка всей истории (ndjson/csv)
 GET    /{transaction_id}  - Детали транзакции
 """
+from datetime import datetime
+from typing import Callable
+from uuid import UUID
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.pagination import keyset_page
+from app.database import get_read_db, get_session_factory
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet
+)
+from app.schemas import (
+    ExportFormatSchema,
+    TransactionPageSchema,
+    TransactionResponseSchema,
+    TransactionStatusSchema,
+    TransactionTypeSchema
+)
+from app.services.export import MEDIA_TYPES, stream_transactions
+
+router = APIRouter(
+    prefix="/wallets/{wallet_uuid}/transactions",
+    tags=["transactions"]
+)
+
+
+@router.get(
+    "/",
+    response_model=TransactionPageSchema,
+    summary="List wallet transactions"
+)
+async def list_transactions(
+    wallet_uuid: UUID,
+    limit: int = Query(
+        default=settings.PAGE_DEFAULT_SIZE, ge=1, le=settings.PAGE_MAX_SIZE
+    ),
+    cursor: str | None = Query(default=None),
+    transaction_type: TransactionTypeSchema | None = Query(
+        default=None, alias="type"
+    ),
+    transaction_status: TransactionStatusSchema | None = Query(
+        default=None, alias="status"
+    ),
+    created_from: datetime | None = Query(default=None),
+    created_to: datetime | None = Query(default=None),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Newest first. created_from is inclusive, created_to is exclusive.
+    """
+    query = select(Transaction).where(Transaction.wallet_id == wallet_uuid)
+    if transaction_type is not None:
+        query = query.where(
+            Transaction.type == TransactionType(transaction_type.value)
+        )
+    if transaction_status is not None:
+        query = query.where(
+            Transaction.status == TransactionStatus(transaction_status.value)
+        )
+    if created_from is not None:
+        query = query.where(Transaction.created_at >= created_from)
+    if created_to is not None:
+        query = query.where(Transaction.created_at < created_to)
+
+    items, next_cursor = await keyset_page(
+        db,
+        query,
+        Transaction.created_at,
+        Transaction.id,
+        limit=limit,
+        cursor=cursor
+    )
+
+    # Пустая первая страница: отличаем кошелек без истории от отсутствующего
+    if not items and cursor is None and not await db.get(Wallet, wallet_uuid):
+        logger.warning("Wallet not found: %s", wallet_uuid)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wallet not found"
+        )
+
+    return {"items": items, "next_cursor": next_cursor}
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Export full wallet transaction history"
+)
+async def export_transactions(
+    wallet_uuid: UUID,
+    export_format: ExportFormatSchema = Query(
+        default=ExportFormatSchema.NDJSON, alias="format"
+    ),
+    db: AsyncSession = Depends(get_read_db),
+    session_factory: Callable[[], AsyncSession] = Depends(
+        get_session_factory
+    )
+):
+    """
+    Stream all transactions oldest first as NDJSON or CSV.
+    """
+    if not await db.get(Wallet, wallet_uuid):
+        logger.warning("Wallet not found: %s", wallet_uuid)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wallet not found"
+        )
+
+    filename = f"wallet-{wallet_uuid}-transactions.{export_format.value}"
+    return StreamingResponse(
+        stream_transactions(session_factory, wallet_uuid, export_format),
+        media_type=MEDIA_TYPES[export_format],
+        headers={
+            "Content-Disposition": f'attachment; filename="{filename}"'
+        }
+    )
+
+
+@router.get(
+    "/{transaction_id}",
+    response_model=TransactionResponseSchema,
+    summary="Get transaction details"
+)
+async def get_transaction(
+    wallet_uuid: UUID,
+    transaction_id: UUID,
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Get a transaction of the wallet by ID
+    """
+    transaction = await db.scalar(
+        select(Transaction).where(
+            Transaction.id == transaction_id,
+            Transaction.wallet_id == wallet_uuid
+        )
+    )
+    if transaction is None:
+        logger.warning(
+            "Transaction %s of wallet %s not found",
+            transaction_id,
+            wallet_uuid
+        )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Transaction not found"
+        )
+    return transaction
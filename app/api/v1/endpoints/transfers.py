@@ -0,0 +1,54 @@
+"""
+/api/v1/transfers
+
+POST   /                  - Перевод между кошельками
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+
+from app.core.logger import logger
+from app.core.middleware import writes
+from app.database import WalletSessions, get_wallet_sessions
+from app.schemas import TransferRequestSchema, TransferResponseSchema
+from app.services.transfers import apply_transfer
+
+router = APIRouter(prefix="/transfers", tags=["transfers"])
+
+
+@router.post(
+    "/",
+    response_model=TransferResponseSchema,
+    status_code=status.HTTP_200_OK,
+    summary="Transfer funds between wallets"
+)
+@writes
+async def create_transfer(
+    transfer: TransferRequestSchema,
+    sessions: WalletSessions = Depends(get_wallet_sessions)
+):
+    """
+    Debit one wallet and credit another in a single database transaction.
+
+    Both wallets must be ACTIVE, stored on the same shard, and the source
+    wallet must have sufficient funds; otherwise neither balance changes.
+    """
+    wallet_ids = (transfer.from_wallet_id, transfer.to_wallet_id)
+    if len(sessions.group(wallet_ids)) > 1:
+        logger.warning(
+            "Cross-shard transfer from wallet %s to wallet %s", *wallet_ids
+        )
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Transfers between shards are not supported"
+        )
+
+    async with sessions(transfer.from_wallet_id) as db:
+        result = await apply_transfer(db, transfer)
+
+    logger.info(
+        "Transfer %s of %s from wallet %s to wallet %s",
+        result.transfer_id,
+        result.amount,
+        result.from_wallet_id,
+        result.to_wallet_id
+    )
+    return result
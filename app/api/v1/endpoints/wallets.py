@@ -2,53 +2,199 @@
 /api/v1/wallets
 
 POST   /                  - Создание нового кошелька
+POST   /batch             - Создание пакета кошельков (ndjson)
+POST   /lookup            - Получение многих кошельков одним запросом
 GET    /{wallet_uuid}     - Получение информации о кошельке
 PATCH  /{wallet_uuid}     - Изменение статуса кошелька
+GET    /{wallet_uuid}/balance - Баланс кошелька на момент времени
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from contextlib import AsyncExitStack
+from datetime import datetime, timezone
+from fastapi import (
+    APIRouter,
+    Body,
+    Depends,
+    HTTPException,
+    Query,
+    Response,
+    status
+)
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from uuid import UUID
 
+from app import repository
+from app.core.config import settings
 from app.core.logger import logger
-from app.database import get_db
+from app.core.middleware import read_primary_var, writes
+from app.core.uuid7 import uuid7
+from app.database import (
+    WalletSessions,
+    get_db,
+    get_read_db,
+    get_wallet_sessions,
+    is_replica_session
+)
 from app.models import Wallet, WalletStatus
 from app.schemas import (
+    WalletBalanceSchema,
+    WalletBatchCreateSchema,
+    WalletLookupRequestSchema,
+    WalletLookupResponseSchema,
+    WalletLookupStatusSchema,
     WalletResponseSchema,
     WalletStatusSchema,
     WalletUpdateSchema
 )
+from app.services.balance_snapshots import balance_at
+from app.services.wallet_cache import serialize_wallet, wallet_cache
+from app.services.wallets import (
+    fetch_wallets,
+    insert_wallet,
+    insert_wallets,
+    lookup_response_adapter,
+    stream_wallets
+)
 
 router = APIRouter(prefix="/wallets", tags=["wallets"])
 
 
+def _use_query_rows() -> bool:
+    """Кошелек читается строкой запроса (app.repository), а не ORM"""
+    return repository.core_enabled() or settings.WALLET_FAST_SERIALIZATION
+
+
+async def _refresh_cache(wallet_id: UUID, payload: bytes):
+    """Новое поколение записи: чтения, начатые до смены, ее не затрут"""
+    version = await wallet_cache.invalidate(wallet_id)
+    await wallet_cache.set(wallet_id, payload, version)
+
+
 @router.post(
     "/",
     response_model=WalletResponseSchema,
     status_code=status.HTTP_201_CREATED,
     summary="Create new wallet"
 )
+@writes
 async def create_wallet(
-    db: AsyncSession = Depends(get_db)
+    sessions: WalletSessions = Depends(get_wallet_sessions)
 ):
     """
     Create a new wallet with initial balance 0 and ACTIVE status
     """
-    new_wallet = Wallet()
-    db.add(new_wallet)
-
-    try:
-        await db.commit()
-        await db.refresh(new_wallet)
-    except Exception as e:
-        logger.error(f"Error creating wallet: {str(e)}")
-        await db.rollback()
+    wallet_id = uuid7()
+    async with sessions(wallet_id) as db:
+        try:
+            new_wallet = await insert_wallet(db, wallet_id)
+        except Exception as e:
+            logger.error("Error creating wallet: %s", e)
+            await db.rollback()
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Could not create wallet"
+            )
+
+    logger.info(
+        "Wallet created: %s",
+        new_wallet["id"],
+        extra={"wallet_id": str(new_wallet["id"])}
+    )
+    return new_wallet
+
+
+@router.post(
+    "/batch",
+    status_code=status.HTTP_201_CREATED,
+    response_class=StreamingResponse,
+    summary="Create many wallets"
+)
+@writes
+async def create_wallets(
+    count: int | None = Query(
+        default=None, ge=1, le=settings.WALLET_BATCH_MAX_SIZE
+    ),
+    batch: WalletBatchCreateSchema | None = Body(default=None),
+    sessions: WalletSessions = Depends(get_wallet_sessions)
+):
+    """
+    Create `count` wallets, or wallets with the given `ids`, in one
+    transaction per shard and stream them back as NDJSON. Transactions
+    are committed only after every shard has inserted its wallets
+    """
+    if batch is None and count is None:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Either count or ids is required"
+        )
+    if batch is not None and count is not None and count != len(batch.ids):
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Could not create wallet"
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="count does not match the number of ids"
         )
 
-    logger.info(f"Wallet created: {new_wallet.id}")
-    return new_wallet
+    ids = batch.ids if batch is not None else [uuid7() for _ in range(count)]
+    created = {}
+    async with AsyncExitStack() as stack:
+        # Существующий id на любом шарде (409) отменяет весь пакет
+        shard_sessions = []
+        for shard_ids in sessions.group(ids).values():
+            db = await stack.enter_async_context(sessions(shard_ids[0]))
+            for wallet in await insert_wallets(db, shard_ids, commit=False):
+                created[wallet["id"]] = wallet
+            shard_sessions.append(db)
+        for db in shard_sessions:
+            await db.commit()
+    wallets = [created[wallet_id] for wallet_id in ids]
+
+    logger.info("Wallets created: %s", len(wallets))
+    return StreamingResponse(
+        stream_wallets(wallets),
+        status_code=status.HTTP_201_CREATED,
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post(
+    "/lookup",
+    response_model=WalletLookupResponseSchema,
+    summary="Get many wallets by ID"
+)
+async def lookup_wallets(
+    lookup: WalletLookupRequestSchema,
+    sessions: WalletSessions = Depends(get_wallet_sessions)
+):
+    """
+    Get wallets in the order of the requested IDs, each marked as
+    FOUND, NOT_FOUND or DELETED
+    """
+    wallets = {}
+    for shard_ids in sessions.group(lookup.ids).values():
+        async with sessions(shard_ids[0], read_only=True) as db:
+            wallets.update(await fetch_wallets(db, shard_ids))
+
+    results = []
+    for wallet_id in lookup.ids:
+        wallet = wallets.get(wallet_id)
+        if wallet is None:
+            result = WalletLookupStatusSchema.NOT_FOUND
+        elif wallet["status"] == WalletStatus.DELETED:
+            result = WalletLookupStatusSchema.DELETED
+        else:
+            result = WalletLookupStatusSchema.FOUND
+        results.append({"id": wallet_id, "result": result, "wallet": wallet})
+
+    logger.info(
+        "Wallets looked up: %s requested, %s found",
+        len(lookup.ids),
+        len(wallets)
+    )
+    if settings.WALLET_FAST_SERIALIZATION:
+        return Response(
+            content=lookup_response_adapter.dump_json({"results": results}),
+            media_type="application/json"
+        )
+    return {"results": results}
 
 
 @router.get(
@@ -58,33 +204,60 @@ async def create_wallet(
 )
 async def get_wallet(
     wallet_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """
     Get wallet information by ID
     """
-    logger.debug(f"Fetching wallet: {wallet_id}")
-    wallet = await db.get(Wallet, wallet_id)
+    logger.debug("Fetching wallet: %s", wallet_id)
+    payload = None
+    # После записи (read-your-writes) кэш мог не увидеть инвалидацию
+    # другого воркера: такие запросы читают из БД
+    if not read_primary_var.get():
+        payload = await wallet_cache.get(wallet_id)
+    if payload is not None:
+        logger.info(
+            "Wallet retrieved from cache: %s",
+            wallet_id,
+            extra={"wallet_id": str(wallet_id)}
+        )
+        return Response(content=payload, media_type="application/json")
+
+    cache_version = await wallet_cache.version(wallet_id)
+    if _use_query_rows():
+        wallet = await repository.get_wallet(db, wallet_id)
+    else:
+        wallet = await db.get(Wallet, wallet_id)
 
     if not wallet:
-        logger.warning(f"Wallet not found: {wallet_id}")
+        logger.warning("Wallet not found: %s", wallet_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Wallet not found"
         )
 
     if wallet.status == WalletStatus.DELETED:
-        logger.warning(f"Attempt to access deleted wallet: {wallet_id}")
-        return {
+        logger.warning("Attempt to access deleted wallet: %s", wallet_id)
+        payload = serialize_wallet({
             "id": wallet_id,
             "status": WalletStatusSchema.DELETED,
             "balance": wallet.balance,  # или обнулять
             "created_at": wallet.created_at,
             "updated_at": wallet.updated_at
-        }
+        })
+    else:
+        logger.info(
+            "Wallet retrieved: %s",
+            wallet_id,
+            extra={"wallet_id": str(wallet_id)}
+        )
+        payload = serialize_wallet(wallet)
 
-    logger.info(f"Wallet retrieved: {wallet_id}")
-    return wallet
+    # Ответ реплики может отставать: в общий кэш пишутся только
+    # чтения с primary
+    if not is_replica_session(db):
+        await wallet_cache.set(wallet_id, payload, cache_version)
+    return Response(content=payload, media_type="application/json")
 
 
 @router.patch(
@@ -92,6 +265,7 @@ async def get_wallet(
     response_model=WalletResponseSchema,
     summary="Update wallet status"
 )
+@writes
 async def update_wallet_status(
     wallet_id: UUID,
     update_data: WalletUpdateSchema,
@@ -101,19 +275,37 @@ async def update_wallet_status(
     Update wallet status (ACTIVE/FROZEN/DELETED)
     """
     logger.info(
-        f"Attempt to update wallet {wallet_id} status to {update_data.status}"
+        "Attempt to update wallet %s status to %s",
+        wallet_id,
+        update_data.status
     )
 
+    if _use_query_rows():
+        row = await repository.set_wallet_status(
+            db, wallet_id, WalletStatus(update_data.status.value)
+        )
+        if row is not None:
+            payload = serialize_wallet(row)
+            await _refresh_cache(wallet_id, payload)
+            logger.info(
+                "Wallet %s status updated to %s",
+                wallet_id,
+                row.status,
+                extra={"wallet_id": str(wallet_id)}
+            )
+            return Response(content=payload, media_type="application/json")
+        # Кошелек не найден или удален: ответ ниже по обычному пути
+
     wallet = await db.get(Wallet, wallet_id)
     if not wallet:
-        logger.warning(f"Wallet not found for update: {wallet_id}")
+        logger.warning("Wallet not found for update: %s", wallet_id)
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Wallet not found"
         )
 
     if wallet.status == WalletStatus.DELETED:
-        logger.warning(f"Attempt to modify deleted wallet: {wallet_id}")
+        logger.warning("Attempt to modify deleted wallet: %s", wallet_id)
         raise HTTPException(
             status_code=status.HTTP_410_GONE,
             detail="Cannot modify deleted wallet"
@@ -121,9 +313,46 @@ async def update_wallet_status(
 
     wallet.status = update_data.status  # type: ignore
     await db.commit()
-    await db.refresh(wallet)
+
+    payload = serialize_wallet(wallet)
+    await _refresh_cache(wallet_id, payload)
 
     logger.info(
-        f"Wallet {wallet_id} status updated to {wallet.status}"
+        "Wallet %s status updated to %s",
+        wallet_id,
+        wallet.status,
+        extra={"wallet_id": str(wallet_id)}
     )
-    return wallet
+    return Response(content=payload, media_type="application/json")
+
+
+@router.get(
+    "/{wallet_id}/balance",
+    response_model=WalletBalanceSchema,
+    summary="Get wallet balance at a point in time"
+)
+async def get_wallet_balance(
+    wallet_id: UUID,
+    at: datetime | None = Query(
+        default=None, description="Defaults to the current time"
+    ),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """
+    Balance after every successful transaction created at or before `at`
+    """
+    if not await db.get(Wallet, wallet_id):
+        logger.warning("Wallet not found: %s", wallet_id)
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Wallet not found"
+        )
+
+    at = at or datetime.now(timezone.utc)
+    if at.tzinfo is None:
+        at = at.replace(tzinfo=timezone.utc)
+    return {
+        "wallet_id": wallet_id,
+        "at": at,
+        "balance": await balance_at(db, wallet_id, at)
+    }
@@ -1,7 +1,20 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import wallets, operations
+from app.api.v1.endpoints import (
+    audit,
+    batch_operations,
+    monitoring,
+    operations,
+    transactions,
+    transfers,
+    wallets
+)
 
 
 router = APIRouter(prefix="/api/v1")
 router.include_router(wallets.router, tags=["wallets"])
 router.include_router(operations.router, tags=["operations"])
+router.include_router(batch_operations.router, tags=["operations"])
+router.include_router(transfers.router, tags=["transfers"])
+router.include_router(transactions.router, tags=["transactions"])
+router.include_router(audit.router, tags=["audit"])
+router.include_router(monitoring.router, tags=["monitoring"])
@@ -0,0 +1,203 @@
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import count
+from typing import Any, Hashable
+
+from app.core.config import settings
+
+# Поколение ключа должно пережить любое чтение из БД между generation()
+# и set(): иначе запись, прочитанная до инвалидации, снова попадет в кэш
+GENERATION_TTL_SECONDS = 60 * 60
+
+
+class TTLCache:
+    """
+    LRU-кэш в памяти процесса с ограничением времени жизни записей.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            del self._data[key]
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float | None = None):
+        """ttl - время жизни этой записи вместо общего self.ttl"""
+        self._data[key] = (
+            time.monotonic() + (self.ttl if ttl is None else ttl), value
+        )
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """
+    Общий интерфейс хранилища кэша: значения - готовые байты.
+
+    delete увеличивает поколение ключа. set с generation записывает
+    значение, только если поколение с тех пор не менялось: так ответ,
+    прочитанный из БД до инвалидации, не перезапишет ее.
+    """
+
+    @abstractmethod
+    async def get(self, key: str) -> bytes | None:
+        ...
+
+    @abstractmethod
+    async def generation(self, key: str) -> int:
+        ...
+
+    @abstractmethod
+    async def set(
+        self, key: str, value: bytes, generation: int | None = None
+    ):
+        ...
+
+    @abstractmethod
+    async def delete(self, key: str) -> int:
+        """Удаляет значение и возвращает новое поколение ключа"""
+        ...
+
+
+class MemoryCacheBackend(CacheBackend):
+    """Кэш в памяти процесса (TTL + LRU)."""
+
+    def __init__(self, max_size: int, ttl: float):
+        self._cache = TTLCache(max_size=max_size, ttl=ttl)
+        # Поколения инвалидированных ключей в порядке выдачи. Общий
+        # счетчик монотонен, поэтому вытесненный ключ получает поколение
+        # последнего вытесненного: оно не меньше его собственного, и
+        # запись, прочитанная до его инвалидации, не сохранится
+        self._generations: OrderedDict[str, int] = OrderedDict()
+        self._generations_size = max_size
+        self._evicted_generation = 0
+        self._counter = count(1)
+
+    def _generation(self, key: str) -> int:
+        return self._generations.get(key, self._evicted_generation)
+
+    async def get(self, key: str) -> bytes | None:
+        return self._cache.get(key)
+
+    async def generation(self, key: str) -> int:
+        return self._generation(key)
+
+    async def set(
+        self, key: str, value: bytes, generation: int | None = None
+    ):
+        if generation is not None and generation != self._generation(key):
+            return
+        self._cache.set(key, value)
+
+    async def delete(self, key: str) -> int:
+        generation = next(self._counter)
+        self._generations[key] = generation
+        self._generations.move_to_end(key)
+        while len(self._generations) > self._generations_size:
+            _, self._evicted_generation = self._generations.popitem(
+                last=False
+            )
+        self._cache.delete(key)
+        return generation
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class RedisCacheBackend(CacheBackend):
+    """
+    Общий для всех процессов кэш в Redis.
+    client - асинхронный клиент с интерфейсом redis.asyncio.Redis.
+    """
+
+    # Проверка поколения и запись значения - одна атомарная операция
+    SET_IF_GENERATION_SCRIPT = """
+if (redis.call('GET', KEYS[2]) or '0') == ARGV[2] then
+    return redis.call('SET', KEYS[1], ARGV[1], 'PX', ARGV[3])
+end
+return false
+"""
+
+    def __init__(self, client, ttl: float, prefix: str = "wallet_api:"):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+
+    def _generation_key(self, key: str) -> str:
+        return f"{self.prefix}generation:{key}"
+
+    async def get(self, key: str) -> bytes | None:
+        return await self.client.get(self.prefix + key)
+
+    async def generation(self, key: str) -> int:
+        return int(await self.client.get(self._generation_key(key)) or 0)
+
+    async def set(
+        self, key: str, value: bytes, generation: int | None = None
+    ):
+        if generation is None:
+            await self.client.set(
+                self.prefix + key, value, px=int(self.ttl * 1000)
+            )
+            return
+        await self.client.eval(
+            self.SET_IF_GENERATION_SCRIPT,
+            2,
+            self.prefix + key,
+            self._generation_key(key),
+            value,
+            str(generation),
+            int(self.ttl * 1000)
+        )
+
+    async def delete(self, key: str) -> int:
+        generation_key = self._generation_key(key)
+        generation = await self.client.incr(generation_key)
+        await self.client.pexpire(
+            generation_key, GENERATION_TTL_SECONDS * 1000
+        )
+        await self.client.delete(self.prefix + key)
+        return generation
+
+
+def create_cache_backend() -> CacheBackend | None:
+    """Создает хранилище кэша по настройкам (None - кэш выключен)."""
+    if settings.WALLET_CACHE_BACKEND == "memory":
+        return MemoryCacheBackend(
+            max_size=settings.WALLET_CACHE_MAX_SIZE,
+            ttl=settings.WALLET_CACHE_TTL_SECONDS
+        )
+
+    if settings.WALLET_CACHE_BACKEND == "redis":
+        # Необязательная зависимость: нужна только для этого режима
+        from redis.asyncio import from_url
+
+        return RedisCacheBackend(
+            from_url(settings.REDIS_URL),
+            ttl=settings.WALLET_CACHE_TTL_SECONDS
+        )
+
+    return None
@@ -1,5 +1,6 @@
 import logging
 import os
+from typing import Literal
 from pydantic import ConfigDict, field_validator  # PostgresDsn,
 from pydantic_settings import BaseSettings
 
@@ -16,12 +17,121 @@ class Settings(BaseSettings):
     POSTGRES_USER: str
     POSTGRES_PASSWORD: str
 
+    # Пул соединений SQLAlchemy и параметры asyncpg/PostgreSQL
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = -1  # секунды, -1 - не пересоздавать
+    DB_POOL_PRE_PING: bool = False
+    DB_ECHO: bool = False
+    DB_STATEMENT_CACHE_SIZE: int = 100  # 0 - для pgbouncer
+    DB_STATEMENT_TIMEOUT_MS: int = 0  # 0 - без ограничения
+    DB_LOCK_TIMEOUT_MS: int = 0
+
+    # Слой запросов горячих путей (чтение кошелька, смена статуса,
+    # операции): orm - сессия и ORM-объекты, core - app.repository
+    DB_QUERY_LAYER: Literal["orm", "core"] = "orm"
+
+    # Реплики для чтения (GET-обработчики): выбор реплики, допустимое
+    # отставание, период его проверки и сколько секунд после записи
+    # клиент читает с primary (read-your-writes, 0 - не закреплять)
+    READ_REPLICA_URLS: list[str] = []
+    READ_REPLICA_POLICY: Literal["round_robin", "least_loaded"] = (
+        "round_robin"
+    )
+    READ_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    READ_REPLICA_LAG_CHECK_INTERVAL_SECONDS: float = 5.0
+    READ_YOUR_WRITES_SECONDS: float = 5.0
+
+    # Шарды кошельков: DATABASE_URL - шард 0, SHARD_URLS - шарды 1..N
+    # (JSON-список, новые шарды добавляются в конец). Виртуальных узлов
+    # на шард в кольце хешей, кошельков на чанк при перебалансировке и
+    # строк таблицы на один запрос при копировании чанка
+    SHARD_URLS: list[str] = []
+    SHARD_VIRTUAL_NODES: int = 100
+    SHARD_REBALANCE_CHUNK_SIZE: int = 500
+    SHARD_REBALANCE_COPY_BATCH_SIZE: int = 5000
+
     LOG_DIR: str = "logs"
     LOG_FILE: str = "wallet_api.log"
     LOG_MAX_BYTES: int = 5 * 1024 * 1024  # 5 MB
     LOG_BACKUP_COUNT: int = 5
     LOG_LEVEL: int = logging.INFO
     LOG_FORMAT: str = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+    # JSON-строки вместо LOG_FORMAT; быстрее с extra fast-logging (orjson)
+    LOG_JSON: bool = False
+    # Очередь асинхронного логирования и политика при переполнении
+    LOG_QUEUE_SIZE: int = 10_000
+    LOG_QUEUE_OVERFLOW: Literal["drop", "block", "sample"] = "drop"
+    LOG_SAMPLE_RATE: int = 10
+
+    # Операция над кошельком одним CTE-запросом (UPDATE ... RETURNING +
+    # INSERT) вместо SELECT ... FOR UPDATE и ORM unit of work
+    OPERATION_SINGLE_STATEMENT: bool = True
+
+    # Группировка конкурентных операций над одним кошельком: окно ожидания
+    # и максимальный размер пакета (одна блокировка и один коммит на пакет)
+    OPERATION_BATCHING_ENABLED: bool = False
+    OPERATION_BATCH_WINDOW_MS: float = 2.0
+    OPERATION_BATCH_MAX_SIZE: int = 100
+
+    # Максимум элементов в POST /operations/batch. Строки пакета
+    # передаются в SQL массивами, поэтому лимит asyncpg на число
+    # bind-параметров (32767) размер пакета не ограничивает
+    BATCH_OPERATIONS_MAX_ITEMS: int = 5000
+
+    # POST /wallets/batch: максимум кошельков за запрос, порог перехода
+    # с INSERT ... RETURNING на COPY и кошельков на чанк ответа
+    WALLET_BATCH_MAX_SIZE: int = 100_000
+    WALLET_BATCH_COPY_THRESHOLD: int = 10_000
+    WALLET_BATCH_CHUNK_SIZE: int = 1000
+
+    # Максимум id в POST /wallets/lookup
+    WALLET_LOOKUP_MAX_IDS: int = 1000
+
+    # Idempotency-Key: время жизни и размер LRU-кэша недавних ключей
+    IDEMPOTENCY_KEY_TTL_SECONDS: int = 24 * 60 * 60
+    IDEMPOTENCY_CACHE_SIZE: int = 10_000
+
+    # Кэш GET /wallets/{id}: memory - в памяти процесса, redis - общий
+    # (extra redis).
+    # memory не видит инвалидаций других воркеров: при нескольких
+    # воркерах ответ может отставать на WALLET_CACHE_TTL_SECONDS
+    WALLET_CACHE_BACKEND: Literal["memory", "redis", "none"] = "none"
+    WALLET_CACHE_TTL_SECONDS: float = 5.0
+    WALLET_CACHE_MAX_SIZE: int = 10_000
+    REDIS_URL: str = "redis://localhost:6379/0"
+
+    # Ответы /wallets собираются из строк запроса готовым сериализатором
+    # (TypeAdapter) без ORM-объекта и повторной валидации response_model
+    WALLET_FAST_SERIALIZATION: bool = False
+
+    # Keyset-пагинация списков (транзакции, аудит)
+    PAGE_DEFAULT_SIZE: int = 50
+    PAGE_MAX_SIZE: int = 500
+
+    # Выгрузка истории: строк на один fetch серверного курсора и на чанк
+    EXPORT_CHUNK_SIZE: int = 1000
+
+    # Месячные секции transactions/wallet_audit_log: сколько месяцев
+    # создавать заранее и сколько хранить (0 - не отсоединять старые)
+    PARTITION_MONTHS_AHEAD: int = 3
+    PARTITION_RETENTION_MONTHS: int = 0
+
+    # Снимки балансов: период фоновой задачи и отставание среза от now(),
+    # чтобы незакоммиченные транзакции с более ранним created_at успели
+    # попасть в снимок. Включается явно, как и сверка журнала
+    BALANCE_SNAPSHOT_ENABLED: bool = False
+    BALANCE_SNAPSHOT_INTERVAL_SECONDS: float = 60 * 60
+    BALANCE_SNAPSHOT_LAG_SECONDS: float = 5 * 60
+
+    # Сверка wallets.balance с журналом транзакций: фоновая задача,
+    # параллельные соединения, кошельков в чанке и отставание чекпоинта
+    LEDGER_VERIFY_ENABLED: bool = False
+    LEDGER_VERIFY_INTERVAL_SECONDS: float = 15 * 60
+    LEDGER_VERIFY_WORKERS: int = 4
+    LEDGER_VERIFY_CHUNK_SIZE: int = 1000
+    LEDGER_VERIFY_LAG_SECONDS: float = 5 * 60
 
     @field_validator("DATABASE_URL")
     def validate_db_url(cls, v):
@@ -31,6 +141,16 @@ class Settings(BaseSettings):
             )
         return v
 
+    @field_validator("READ_REPLICA_URLS", "SHARD_URLS")
+    def validate_db_urls(cls, v, info):
+        for url in v:
+            if not url.startswith("postgresql+asyncpg://"):
+                raise ValueError(
+                    f"{info.field_name} должны начинаться с "
+                    "'postgresql+asyncpg://'"
+                )
+        return v
+
     @property
     def db_url(self) -> str:
         """Автоматически выбирает правильный URL в зависимости от контекста"""
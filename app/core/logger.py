@@ -1,19 +1,129 @@
+import atexit
+import json
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from logging import StreamHandler
 from pathlib import Path
 from app.core.config import settings
+from app.core.metrics import registry
 
+try:
+    import orjson
+except ImportError:  # необязательная зависимость: extra fast-logging
+    orjson = None
 
-def setup_logging() -> logging.Logger:
+# Идентификатор текущего запроса (выставляется RequestIdMiddleware)
+request_id_var: ContextVar[str | None] = ContextVar(
+    "request_id", default=None
+)
+
+# Поля, которые передаются через extra= и попадают в JSON отдельно
+LOG_EXTRA_FIELDS = (
+    "wallet_id",
+    "operation_type",
+    "amount",
+    "new_balance",
+    "latency_ms",
+)
+
+
+def _dumps(data: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(data, default=str).decode()
+    return json.dumps(data, default=str, ensure_ascii=False)
+
+
+class RequestIdFilter(logging.Filter):
+    """Добавляет в запись request_id из контекста запроса."""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """Одна JSON-строка на запись с фиксированным набором полей."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "timestamp": datetime.fromtimestamp(
+                record.created, tz=timezone.utc
+            ).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for field in LOG_EXTRA_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                data[field] = value
+        # Трейсбек уже в message: QueueHandler.prepare дописывает его
+        # в текст записи и очищает exc_info перед постановкой в очередь
+        return _dumps(data)
+
+
+class BoundedQueueHandler(QueueHandler):
+    """
+    QueueHandler с ограниченной очередью и политикой переполнения:
+    drop   - отбрасывать новые записи, пока очередь полна;
+    block  - ждать освобождения места (тормозит вызывающий код);
+    sample - при заполнении очереди наполовину пропускать только каждую
+             sample_rate-ю запись ниже WARNING, остальное как drop.
+    """
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        overflow_policy: str = "drop",
+        sample_rate: int = 10
+    ):
+        super().__init__(log_queue)
+        self.overflow_policy = overflow_policy
+        self.sample_rate = max(sample_rate, 1)
+        self.dropped = 0
+        self._sampled = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        if self.overflow_policy == "block":
+            self.queue.put(record)
+            return
+
+        if (
+            self.overflow_policy == "sample" and
+            record.levelno < logging.WARNING and
+            self.queue.qsize() >= self.queue.maxsize // 2
+        ):
+            self._sampled += 1
+            if self._sampled % self.sample_rate:
+                self.dropped += 1
+                return
+
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging() -> tuple[logging.Logger, QueueListener]:
     """
     Настройка логгера с ротацией лог-файлов.
+
+    Обработчики с файловым и консольным выводом работают в отдельном
+    потоке QueueListener, поэтому запись логов не блокирует event loop.
     """
     # Создаем директорию для логов, если её нет
     Path(settings.LOG_DIR).mkdir(exist_ok=True)
 
     # Форматтер
-    formatter = logging.Formatter(settings.LOG_FORMAT)
+    formatter = (
+        JsonFormatter()
+        if settings.LOG_JSON
+        else logging.Formatter(settings.LOG_FORMAT)
+    )
 
     # Файловый обработчик с ротацией
     file_handler = RotatingFileHandler(
@@ -28,14 +138,38 @@ def setup_logging() -> logging.Logger:
     console_handler = StreamHandler()
     console_handler.setFormatter(formatter)
 
+    # Очередь между приложением и обработчиками
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.LOG_QUEUE_SIZE)
+    queue_handler = BoundedQueueHandler(
+        log_queue,
+        overflow_policy=settings.LOG_QUEUE_OVERFLOW,
+        sample_rate=settings.LOG_SAMPLE_RATE
+    )
+    # request_id читается в потоке запроса, до постановки в очередь
+    queue_handler.addFilter(RequestIdFilter())
+    listener = QueueListener(
+        log_queue,
+        file_handler,
+        console_handler,
+        respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+
+    registry.gauge(
+        "log_records_dropped_total",
+        "Log records dropped because the log queue was full",
+        lambda: queue_handler.dropped,
+        type_="counter",
+    )
+
     # Настройка корневого логгера
     logger = logging.getLogger("wallet_api")
     logger.setLevel(settings.LOG_LEVEL)
-    logger.addHandler(file_handler)
-    logger.addHandler(console_handler)
+    logger.addHandler(queue_handler)
 
-    return logger
+    return logger, listener
 
 
 # Инициализация логгера при импорте модуля
-logger = setup_logging()
+logger, log_listener = setup_logging()
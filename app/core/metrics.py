@@ -0,0 +1,237 @@
+"""
+Метрики в текстовом формате Prometheus без внешних зависимостей.
+
+Все обновления происходят в потоке event loop, поэтому блокировки
+не нужны. Значения живут в памяти процесса.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0,
+)
+
+
+def _escape(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_labels(names: tuple[str, ...], values: tuple) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"'
+        for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    type_ = ""
+
+    def __init__(self, name: str, help_: str, labelnames=()):
+        self.name = name
+        self.help = help_
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(labels.get(name, "") for name in self.labelnames)
+
+    def header(self) -> list[str]:
+        return [
+            f"# HELP {self.name} {self.help}",
+            f"# TYPE {self.name} {self.type_}",
+        ]
+
+    def samples(self) -> list[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type_ = "counter"
+
+    def __init__(self, name: str, help_: str, labelnames=()):
+        super().__init__(name, help_, labelnames)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def samples(self) -> list[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} "
+            f"{_format_value(value)}"
+            for key, value in self._values.items()
+        ]
+
+
+class Histogram(_Metric):
+    type_ = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        labelnames=(),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ):
+        super().__init__(name, help_, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._counts: dict[tuple, list[int]] = {}
+        self._sums: dict[tuple, float] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def count(self, **labels) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def sum(self, **labels) -> float:
+        return self._sums.get(self._key(labels), 0.0)
+
+    def samples(self) -> list[str]:
+        lines = []
+        names = ("le",) + self.labelnames
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                labels = _format_labels(names, (_format_value(bound),) + key)
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(
+                f"{self.name}_sum{labels} {_format_value(self._sums[key])}"
+            )
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class CallbackGauge(_Metric):
+    """
+    Значение вычисляется в момент сбора метрик. С labelnames callback
+    возвращает словарь: кортеж значений меток -> значение.
+    """
+    type_ = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help_: str,
+        callback: Callable[[], float | dict[tuple, float]],
+        type_: str = "gauge",
+        labelnames=()
+    ):
+        super().__init__(name, help_, labelnames)
+        self.callback = callback
+        self.type_ = type_
+
+    def samples(self) -> list[str]:
+        if not self.labelnames:
+            return [f"{self.name} {_format_value(self.callback())}"]
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} "
+            f"{_format_value(value)}"
+            for key, value in self.callback().items()
+        ]
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_: str, labelnames=()) -> Counter:
+        return self.register(Counter(name, help_, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help_: str,
+        labelnames=(),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, help_, labelnames, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help_: str,
+        callback: Callable[[], float | dict[tuple, float]],
+        type_: str = "gauge",
+        labelnames=()
+    ) -> CallbackGauge:
+        return self.register(
+            CallbackGauge(name, help_, callback, type_, labelnames)
+        )
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.header())
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_request_duration_seconds = registry.histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route and status",
+    ("method", "route", "status"),
+)
+db_query_duration_seconds = registry.histogram(
+    "db_query_duration_seconds",
+    "Time spent executing SQL statements",
+)
+db_locking_statement_seconds = registry.histogram(
+    "db_locking_statement_seconds",
+    "Duration of statements that lock wallet rows, lock wait included",
+    ("operation",),
+)
+db_pool_checkout_wait_seconds = registry.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ("target",),
+)
+wallet_operations_total = registry.counter(
+    "wallet_operations_total",
+    "Applied wallet operations",
+    ("operation_type",),
+)
+wallet_operation_rejections_total = registry.counter(
+    "wallet_operation_rejections_total",
+    "Rejected wallet operations",
+    ("reason",),
+)
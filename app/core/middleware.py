@@ -0,0 +1,160 @@
+import math
+import time
+import uuid
+from contextvars import ContextVar
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.requests import cookie_parser
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.logger import request_id_var
+from app.core.metrics import http_request_duration_seconds
+
+REQUEST_ID_HEADER = "X-Request-ID"
+MAX_REQUEST_ID_LENGTH = 128
+
+READ_CONSISTENCY_HEADER = "X-Read-Consistency"
+READ_PRIMARY_COOKIE = "read_primary_until"
+# Атрибут обработчика, выставляемый декоратором writes
+WRITES_ATTR = "writes_data"
+
+# Читать текущий запрос с primary, а не с реплики
+# (выставляется ReadYourWritesMiddleware)
+read_primary_var: ContextVar[bool] = ContextVar(
+    "read_primary", default=False
+)
+
+
+class RequestIdMiddleware:
+    """
+    Correlation ID запроса: берется из заголовка X-Request-ID или
+    генерируется, доступен в логах через contextvars и возвращается
+    клиенту в том же заголовке.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get(REQUEST_ID_HEADER)
+        if not request_id or len(request_id) > MAX_REQUEST_ID_LENGTH:
+            request_id = uuid.uuid4().hex
+
+        async def send_with_request_id(message: Message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append(REQUEST_ID_HEADER, request_id)
+            await send(message)
+
+        token = request_id_var.set(request_id)
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
+
+
+class MetricsMiddleware:
+    """
+    Гистограмма задержки HTTP-запросов. Метка route - шаблон пути
+    (/api/v1/wallets/{wallet_id}), чтобы число рядов не зависело от id.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message: Message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            route = scope.get("route")
+            http_request_duration_seconds.observe(
+                time.perf_counter() - started,
+                method=scope["method"],
+                route=getattr(route, "path", "<unmatched>"),
+                status=status_code
+            )
+
+
+def writes(endpoint):
+    """
+    Помечает обработчик, изменяющий данные: после его успешного ответа
+    чтения клиента идут на primary (ReadYourWritesMiddleware)
+    """
+    setattr(endpoint, WRITES_ATTR, True)
+    return endpoint
+
+
+class ReadYourWritesMiddleware:
+    """
+    Read-your-writes при чтении с реплик. После успешного запроса к
+    обработчику, помеченному writes (не по HTTP-методу: POST /lookup
+    только читает), клиент получает cookie read_primary_until, и следующие
+    READ_YOUR_WRITES_SECONDS секунд его чтения идут на primary. Заголовок
+    X-Read-Consistency: primary закрепляет на primary отдельный запрос.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        headers = Headers(scope=scope)
+        token = read_primary_var.set(_read_primary(headers))
+        pin_seconds = settings.READ_YOUR_WRITES_SECONDS
+        pin = bool(settings.READ_REPLICA_URLS) and pin_seconds > 0
+
+        async def send_with_pin(message: Message):
+            if (
+                pin and
+                message["type"] == "http.response.start" and
+                message["status"] < 400 and
+                # Обработчик известен после маршрутизации
+                getattr(scope.get("endpoint"), WRITES_ATTR, False)
+            ):
+                until = time.time() + pin_seconds
+                MutableHeaders(scope=message).append(
+                    "set-cookie",
+                    f"{READ_PRIMARY_COOKIE}={until:.3f}; "
+                    f"Max-Age={math.ceil(pin_seconds)}; Path=/; "
+                    "HttpOnly; SameSite=Lax"
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_pin)
+        finally:
+            read_primary_var.reset(token)
+
+
+def _read_primary(headers: Headers) -> bool:
+    """Нужно ли читать с primary: заголовок или незакончившийся pin"""
+    if headers.get(READ_CONSISTENCY_HEADER, "").lower() == "primary":
+        return True
+    until = cookie_parser(headers.get("cookie", "")).get(
+        READ_PRIMARY_COOKIE
+    )
+    try:
+        return until is not None and float(until) > time.time()
+    except ValueError:
+        return False
@@ -0,0 +1,60 @@
+"""
+Keyset (cursor) пагинация по (created_at, id) в порядке убывания.
+
+Курсор - непрозрачная base64-строка с ключом последней строки страницы.
+Следующая страница начинается строго после него, поэтому стоимость
+запроса не зависит от номера страницы (в отличие от OFFSET).
+"""
+import base64
+import binascii
+import json
+from datetime import datetime
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy import Select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+def encode_cursor(created_at: datetime, row_id: UUID) -> str:
+    raw = json.dumps([created_at.isoformat(), str(row_id)])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, row_id = json.loads(base64.urlsafe_b64decode(padded))
+        return datetime.fromisoformat(created_at), UUID(row_id)
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+async def keyset_page(
+    db: AsyncSession,
+    query: Select,
+    created_at_column,
+    id_column,
+    limit: int,
+    cursor: str | None = None
+) -> tuple[list, str | None]:
+    """
+    Выполняет query (select модели с created_at и id) страницей из limit
+    объектов. Возвращает объекты и курсор следующей страницы (None, если
+    это последняя).
+    """
+    if cursor is not None:
+        query = query.where(
+            tuple_(created_at_column, id_column) < decode_cursor(cursor)
+        )
+    query = query.order_by(
+        created_at_column.desc(), id_column.desc()
+    ).limit(limit + 1)
+
+    rows = list((await db.execute(query)).scalars().all())
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(rows[-1].created_at, rows[-1].id)
@@ -0,0 +1,135 @@
+"""
+Маршрутизация чтения между primary и репликами.
+
+Обработчики, которые только читают, получают сессию на реплике,
+выбранной по READ_REPLICA_POLICY: round_robin - по кругу, least_loaded -
+с наименьшим числом выданных соединений пула. Реплика, отставание
+которой неизвестно или больше READ_REPLICA_MAX_LAG_SECONDS, пропускается;
+если подходящих реплик нет или запрос закреплен за primary
+(read-your-writes), чтение идет на primary.
+"""
+import asyncio
+from dataclasses import dataclass
+from itertools import count
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import registry
+from app.core.middleware import read_primary_var
+
+# Отставание реплики в секундах. Если все полученные WAL уже применены,
+# реплика догнала primary (время последней транзакции на простаивающем
+# primary не считается отставанием). Не реплика - 0. Реплика без
+# потоковой репликации (WAL receiver отключен) - NULL: применить все
+# полученное не значит догнать primary. status в pg_stat_wal_receiver
+# виден только ролям с pg_read_all_stats (pg_monitor).
+REPLICA_LAG_STATEMENT = text("""
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() THEN 0
+        WHEN NOT EXISTS (
+            SELECT FROM pg_stat_wal_receiver WHERE status = 'streaming'
+        ) THEN NULL
+        WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+""")
+
+db_read_routes_total = registry.counter(
+    "db_read_routes_total",
+    "Read-only sessions by target database",
+    ("target",),
+)
+
+
+@dataclass
+class Replica:
+    name: str
+    engine: AsyncEngine
+    lag_seconds: float | None = None  # None - не проверялась или ошибка
+
+    @property
+    def available(self) -> bool:
+        return (
+            self.lag_seconds is not None and
+            self.lag_seconds <= settings.READ_REPLICA_MAX_LAG_SECONDS
+        )
+
+
+class ReplicaRouter:
+    """Выбор движка для сессии чтения."""
+
+    def __init__(self, primary: AsyncEngine, replicas: list[Replica]):
+        self.primary = primary
+        self.replicas = replicas
+        self._turn = count()
+
+    def choose(self) -> Replica | None:
+        """Реплика для чтения или None, если читать нужно с primary"""
+        if read_primary_var.get():
+            return None
+        available = [replica for replica in self.replicas
+                     if replica.available]
+        if not available:
+            return None
+        if settings.READ_REPLICA_POLICY == "least_loaded":
+            return min(
+                available, key=lambda replica: replica.engine.pool.checkedout()
+            )
+        return available[next(self._turn) % len(available)]
+
+    def is_replica(self, engine: AsyncEngine) -> bool:
+        return any(replica.engine is engine for replica in self.replicas)
+
+    def read_engine(self) -> AsyncEngine:
+        """Движок для сессии чтения текущего запроса"""
+        replica = self.choose()
+        if replica is None:
+            db_read_routes_total.inc(target="primary")
+            return self.primary
+        db_read_routes_total.inc(target="replica")
+        return replica.engine
+
+    async def check_lag(self):
+        """Обновить отставание всех реплик"""
+        await asyncio.gather(*(
+            self._check_replica(replica) for replica in self.replicas
+        ))
+
+    async def _check_replica(self, replica: Replica):
+        try:
+            async with replica.engine.connect() as conn:
+                lag = await conn.scalar(REPLICA_LAG_STATEMENT)
+        except Exception as e:
+            logger.warning("Replica %s is unavailable: %s", replica.name, e)
+            replica.lag_seconds = None
+            return
+        if lag is None:
+            logger.warning(
+                "Replica %s is not streaming WAL, reads go elsewhere",
+                replica.name
+            )
+            replica.lag_seconds = None
+            return
+        replica.lag_seconds = float(lag)
+        if not replica.available:
+            logger.warning(
+                "Replica %s lags by %.1f seconds, reads go elsewhere",
+                replica.name,
+                replica.lag_seconds
+            )
+
+    async def dispose(self):
+        for replica in self.replicas:
+            await replica.engine.dispose()
+
+
+async def run_lag_check_loop(router: ReplicaRouter):
+    """Фоновая задача приложения: проверка отставания раз в интервал"""
+    while True:
+        await router.check_lag()
+        await asyncio.sleep(settings.READ_REPLICA_LAG_CHECK_INTERVAL_SECONDS)
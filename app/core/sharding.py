@@ -0,0 +1,79 @@
+"""
+Распределение кошельков по базам (шардам) консистентным хешированием.
+
+Каждый шард занимает SHARD_VIRTUAL_NODES точек на кольце хешей, кошелек
+принадлежит первому шарду по часовой стрелке от хеша своего id. При
+добавлении шарда меняют владельца только ~1/N кошельков - их переносит
+app.maintenance.rebalance_shards. Строки транзакций, аудита и прочих
+таблиц кошелька хранятся на шарде кошелька: они пишутся в той же сессии.
+"""
+from bisect import bisect
+from collections import defaultdict
+from hashlib import blake2b
+from typing import Iterable
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+PRIMARY_SHARD = "0"
+
+
+def _hash(value: bytes) -> int:
+    return int.from_bytes(blake2b(value, digest_size=8).digest(), "big")
+
+
+class HashRing:
+    """Кольцо консистентного хеширования с виртуальными узлами."""
+
+    def __init__(self, nodes: Iterable[str], virtual_nodes: int = 100):
+        points = sorted(
+            (_hash(f"{node}#{replica}".encode()), node)
+            for node in nodes
+            for replica in range(virtual_nodes)
+        )
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node_for(self, key: UUID) -> str:
+        """Узел, которому принадлежит ключ"""
+        index = bisect(self._hashes, _hash(key.bytes))
+        return self._nodes[index % len(self._nodes)]
+
+
+class ShardRouter:
+    """Движки шардов и выбор шарда по id кошелька."""
+
+    def __init__(
+        self,
+        engines: dict[str, AsyncEngine],
+        virtual_nodes: int = 100
+    ):
+        self.engines = engines
+        # Чтение без транзакции, как read_engine для primary
+        self.read_engines = {
+            name: shard_engine.execution_options(
+                isolation_level="AUTOCOMMIT"
+            )
+            for name, shard_engine in engines.items()
+        }
+        self.ring = HashRing(engines, virtual_nodes)
+
+    def shard_for(self, wallet_id: UUID) -> str:
+        if len(self.engines) == 1:
+            return PRIMARY_SHARD
+        return self.ring.node_for(wallet_id)
+
+    def engine_for(self, wallet_id: UUID) -> AsyncEngine:
+        return self.engines[self.shard_for(wallet_id)]
+
+    def group(self, wallet_ids: Iterable[UUID]) -> dict[str, list[UUID]]:
+        """id кошельков по шардам, в исходном порядке внутри шарда"""
+        groups = defaultdict(list)
+        for wallet_id in wallet_ids:
+            groups[self.shard_for(wallet_id)].append(wallet_id)
+        return dict(groups)
+
+    async def dispose(self):
+        for name, shard_engine in self.engines.items():
+            if name != PRIMARY_SHARD:
+                await shard_engine.dispose()
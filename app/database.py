@@ -1,25 +1,333 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+import time
+from functools import partial
+from typing import Callable, Iterable
+from uuid import UUID
+
+from fastapi import Request
+from sqlalchemy import event, make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    create_async_engine
+)
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
+from app.core.metrics import (
+    db_pool_checkout_wait_seconds,
+    db_query_duration_seconds,
+    registry
+)
+from app.core.replicas import Replica, ReplicaRouter
+from app.core.sharding import PRIMARY_SHARD, ShardRouter
+
+
+class PoolMetrics:
+    """Счетчики ожидания выдачи соединений из пула одного движка"""
+
+    def __init__(self, target: str):
+        self.target = target
+        self.checkouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def record_checkout(self, wait_seconds: float):
+        self.checkouts += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        db_pool_checkout_wait_seconds.observe(wait_seconds, target=self.target)
+
+
+class InstrumentedAsyncPool(AsyncAdaptedQueuePool):
+    """
+    Пул соединений, измеряющий время ожидания checkout. metrics
+    назначает _create_engine: у каждого шарда и реплики свои.
+    """
+    metrics: PoolMetrics | None = None
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            if self.metrics is not None:
+                self.metrics.record_checkout(time.perf_counter() - started)
+
+    def recreate(self):
+        # dispose() заменяет пул новым: счетчики переходят к нему
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        return pool
+
+
+def _connect_args() -> dict:
+    """Параметры asyncpg-соединения из настроек"""
+    return {
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "server_settings": {
+            "statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS),
+            "lock_timeout": str(settings.DB_LOCK_TIMEOUT_MS),
+        },
+    }
+
+
+def _create_engine(url: str, target: str) -> AsyncEngine:
+    """
+    Движок с общими настройками пула и таймером запросов. target -
+    метка пула в метриках: shard:<номер> или replica:<имя>.
+    """
+    new_engine = create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedAsyncPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args=_connect_args(),
+    )
+    new_engine.pool.metrics = PoolMetrics(target)
+    event.listen(
+        new_engine.sync_engine, "before_cursor_execute", _start_query_timer
+    )
+    event.listen(
+        new_engine.sync_engine, "after_cursor_execute", _stop_query_timer
+    )
+    return new_engine
+
+
+def _start_query_timer(conn, cursor, statement, parameters, context, many):
+    context._query_started = time.perf_counter()
 
-engine = create_async_engine(settings.db_url, echo=True)
+
+def _stop_query_timer(conn, cursor, statement, parameters, context, many):
+    db_query_duration_seconds.observe(
+        time.perf_counter() - context._query_started
+    )
+
+
+engine = _create_engine(settings.db_url, f"shard:{PRIMARY_SHARD}")
+
+
+# expire_on_commit=False: объекты остаются загруженными после коммита,
+# значения, вычисленные сервером, приходят через RETURNING (eager_defaults)
 SessionLocal = sessionmaker(
     autocommit=False,
     autoflush=False,
     bind=engine,
-    class_=AsyncSession
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+# Чтение без транзакции: в режиме AUTOCOMMIT драйвер не отправляет
+# BEGIN/ROLLBACK вокруг запросов. Пул соединений общий с engine.
+read_engine = engine.execution_options(isolation_level="AUTOCOMMIT")
+
+ReadSessionLocal = sessionmaker(
+    autoflush=False,
+    bind=read_engine,
+    class_=AsyncSession,
+    expire_on_commit=False
+)
+
+
+def _create_replica(url: str) -> Replica:
+    name = make_url(url).render_as_string(hide_password=True)
+    return Replica(
+        name=name,
+        engine=_create_engine(url, f"replica:{name}").execution_options(
+            isolation_level="AUTOCOMMIT"
+        ),
+    )
+
+
+# Реплики для чтения: отдельный пул на каждую, тоже без транзакций
+replica_router = ReplicaRouter(
+    read_engine, [_create_replica(url) for url in settings.READ_REPLICA_URLS]
 )
 
 Base = declarative_base()
 
 
-async def get_db():
-    """Генератор сессий для FastAPI Depends"""
-    async with SessionLocal() as session:
+# Шарды кошельков: шард 0 - engine, остальные - SHARD_URLS
+shard_router = ShardRouter(
+    {
+        PRIMARY_SHARD: engine,
+        **{
+            str(number): _create_engine(url, f"shard:{number}")
+            for number, url in enumerate(settings.SHARD_URLS, start=1)
+        },
+    },
+    virtual_nodes=settings.SHARD_VIRTUAL_NODES
+)
+
+# Параметры пути, по которым обработчик относится к кошельку
+WALLET_PATH_PARAMS = ("wallet_id", "wallet_uuid")
+
+
+def _path_wallet_id(request: Request) -> UUID | None:
+    for name in WALLET_PATH_PARAMS:
+        value = request.path_params.get(name)
+        if value is not None:
+            try:
+                return UUID(value)
+            except ValueError:
+                return None  # 422 вернет валидация параметров обработчика
+    return None
+
+
+def wallet_session(
+    wallet_id: UUID | None,
+    read_only: bool = False
+) -> AsyncSession:
+    """
+    Сессия на шарде кошелька (None - шард 0). Сессия чтения на шарде 0
+    открывается на реплике, если она настроена и не отстает.
+    """
+    shard = (
+        PRIMARY_SHARD
+        if wallet_id is None
+        else shard_router.shard_for(wallet_id)
+    )
+    if not read_only:
+        return SessionLocal(bind=shard_router.engines[shard])
+    if shard == PRIMARY_SHARD:
+        return ReadSessionLocal(bind=replica_router.read_engine())
+    return ReadSessionLocal(bind=shard_router.read_engines[shard])
+
+
+def is_replica_session(session: AsyncSession) -> bool:
+    """Сессия открыта на реплике: прочитанное может отставать от primary"""
+    return replica_router.is_replica(session.bind)
+
+
+async def get_db(request: Request):
+    """
+    Генератор сессий для FastAPI Depends. Сессия открывается на шарде
+    кошелька из пути запроса ({wallet_id} или {wallet_uuid}).
+    """
+    async with wallet_session(_path_wallet_id(request)) as session:
         yield session
 
 
+async def get_read_db(request: Request):
+    """
+    Генератор сессий для FastAPI Depends в обработчиках, которые только
+    читают: каждый запрос к БД выполняется отдельно, без транзакции.
+    """
+    async with wallet_session(
+        _path_wallet_id(request), read_only=True
+    ) as session:
+        yield session
+
+
+def get_session_factory(request: Request) -> Callable[[], AsyncSession]:
+    """
+    Фабрика сессий для FastAPI Depends. Нужна потоковым ответам:
+    зависимости с yield закрываются до отправки тела StreamingResponse,
+    поэтому генератор открывает собственную сессию.
+    """
+    return partial(wallet_session, _path_wallet_id(request))
+
+
+class WalletSessions:
+    """
+    Сессии на шардах кошельков для обработчиков, у которых кошельки
+    в теле запроса, а не в пути.
+    """
+
+    def group(self, wallet_ids: Iterable[UUID]) -> dict[str, list[UUID]]:
+        """id кошельков по шардам, в исходном порядке внутри шарда"""
+        return shard_router.group(wallet_ids)
+
+    def __call__(
+        self,
+        wallet_id: UUID,
+        read_only: bool = False
+    ) -> AsyncSession:
+        return wallet_session(wallet_id, read_only)
+
+
+wallet_sessions = WalletSessions()
+
+
+def get_wallet_sessions() -> WalletSessions:
+    """Сессии на шардах кошельков для FastAPI Depends"""
+    return wallet_sessions
+
+
+def _pools() -> dict[str, AsyncAdaptedQueuePool]:
+    """Пулы соединений по меткам: шарды и реплики"""
+    return {
+        **{
+            f"shard:{name}": shard_engine.pool
+            for name, shard_engine in shard_router.engines.items()
+        },
+        **{
+            f"replica:{replica.name}": replica.engine.pool
+            for replica in replica_router.replicas
+        },
+    }
+
+
+def get_pool_stats() -> dict:
+    """Состояние пулов соединений и время ожидания checkout по пулам"""
+    stats = {}
+    for target, pool in _pools().items():
+        metrics = getattr(pool, "metrics", None) or PoolMetrics(target)
+        stats[target] = {
+            "size": pool.size(),
+            "checked_out": pool.checkedout(),
+            "idle": pool.checkedin(),
+            "overflow": max(pool.overflow(), 0),
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "checkouts": metrics.checkouts,
+            "checkout_wait_seconds_total": metrics.wait_seconds_total,
+            "checkout_wait_seconds_max": metrics.wait_seconds_max,
+            "checkout_wait_seconds_avg": (
+                metrics.wait_seconds_total / metrics.checkouts
+                if metrics.checkouts else 0.0
+            ),
+        }
+    return stats
+
+
+def _pool_gauge(value: Callable[[AsyncAdaptedQueuePool], int]):
+    return lambda: {
+        (target,): value(pool) for target, pool in _pools().items()
+    }
+
+
+registry.gauge(
+    "db_pool_checked_out_connections",
+    "Connections currently checked out of the pool",
+    _pool_gauge(lambda pool: pool.checkedout()),
+    labelnames=("target",),
+)
+registry.gauge(
+    "db_pool_idle_connections",
+    "Idle connections in the pool",
+    _pool_gauge(lambda pool: pool.checkedin()),
+    labelnames=("target",),
+)
+registry.gauge(
+    "db_pool_overflow_connections",
+    "Connections opened above pool_size",
+    _pool_gauge(lambda pool: max(pool.overflow(), 0)),
+    labelnames=("target",),
+)
+registry.gauge(
+    "db_replicas_available",
+    "Read replicas within READ_REPLICA_MAX_LAG_SECONDS",
+    lambda: sum(replica.available for replica in replica_router.replicas),
+)
+
+
 async def close_db():
     """Закрыть соединения с БД при завершении приложения"""
+    await replica_router.dispose()
+    await shard_router.dispose()
     await engine.dispose()
@@ -1,11 +1,69 @@
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from functools import partial
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from app.api.v1 import router as api_router
 from app.core.config import settings
+from app.core.metrics import registry
+from app.core.middleware import (
+    MetricsMiddleware,
+    ReadYourWritesMiddleware,
+    RequestIdMiddleware
+)
+from app.core.replicas import run_lag_check_loop
+from app.database import (
+    SessionLocal,
+    close_db,
+    replica_router,
+    shard_router
+)
+from app.services.balance_snapshots import run_snapshot_loop
+from app.services.ledger_verifier import run_verification_loop
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    tasks = []
+    # Снимки и сверка работают на каждом шарде отдельно
+    for shard_engine in shard_router.engines.values():
+        if settings.BALANCE_SNAPSHOT_ENABLED:
+            tasks.append(asyncio.create_task(
+                run_snapshot_loop(partial(SessionLocal, bind=shard_engine))
+            ))
+        if settings.LEDGER_VERIFY_ENABLED:
+            tasks.append(
+                asyncio.create_task(run_verification_loop(shard_engine))
+            )
+    if replica_router.replicas:
+        tasks.append(
+            asyncio.create_task(run_lag_check_loop(replica_router))
+        )
+    yield
+    for task in tasks:
+        task.cancel()
+        with suppress(asyncio.CancelledError):
+            await task
+    await close_db()
 
-app = FastAPI(title=settings.PROJECT_NAME)
+
+app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
+app.add_middleware(ReadYourWritesMiddleware)
+app.add_middleware(RequestIdMiddleware)
+app.add_middleware(MetricsMiddleware)
 app.include_router(api_router.router)
 
 
 @app.get("/")
 async def root():
     return {"message": "Wallet API"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition format"""
+    return PlainTextResponse(
+        registry.render(),
+        media_type="text/plain; version=0.0.4"
+    )
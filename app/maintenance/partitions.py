@@ -0,0 +1,272 @@
+"""
+Обслуживание месячных секций transactions и wallet_audit_log.
+
+    python -m app.maintenance.partitions create
+    python -m app.maintenance.partitions detach --retention-months 12
+    python -m app.maintenance.partitions detach --retention-months 12 --drop
+    python -m app.maintenance.partitions prune-idempotency-keys
+
+create - создает секции с текущего месяца на PARTITION_MONTHS_AHEAD
+вперед. Строки, уже попавшие в DEFAULT для этого месяца, переносятся
+в новую секцию. Месяцы, которые покрывает существующая секция (например
+<table>_legacy FROM (MINVALUE)), пропускаются.
+
+detach - отсоединяет секции, которые целиком старше срока хранения, и
+переносит их в схему archive (pg_dump -t archive.<name> для выгрузки)
+либо удаляет с --drop. Это заменяет DELETE старых строк.
+
+prune-idempotency-keys - удаляет ключи старше IDEMPOTENCY_KEY_TTL_SECONDS.
+
+Команды выполняются на каждом шарде (DATABASE_URL и SHARD_URLS),
+идемпотентны, их можно запускать по cron.
+"""
+import argparse
+import asyncio
+import re
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger
+
+PARTITIONED_TABLES = ("transactions", "wallet_audit_log")
+ARCHIVE_SCHEMA = "archive"
+
+_RANGE_BOUND = re.compile(
+    r"FROM \((MINVALUE|'[^']+')\) TO \((MAXVALUE|'[^']+')\)"
+)
+
+
+def month_start(value: datetime) -> datetime:
+    return value.astimezone(timezone.utc).replace(
+        day=1, hour=0, minute=0, second=0, microsecond=0
+    )
+
+
+def add_months(value: datetime, months: int) -> datetime:
+    month = value.month - 1 + months
+    return value.replace(year=value.year + month // 12, month=month % 12 + 1)
+
+
+def partition_name(table: str, start: datetime) -> str:
+    return f"{table}_p{start:%Y_%m}"
+
+
+def partition_range(
+    partition_bound: str
+) -> tuple[datetime | None, datetime | None] | None:
+    """
+    Границы [FROM, TO) из pg_get_expr(relpartbound): None вместо
+    MINVALUE/MAXVALUE. Для DEFAULT возвращает None.
+    """
+    match = _RANGE_BOUND.search(partition_bound)
+    if match is None:
+        return None
+    lower, upper = (
+        None if value.endswith("VALUE")
+        else datetime.fromisoformat(value.strip("'"))
+        for value in match.groups()
+    )
+    return lower, upper
+
+
+def upper_bound(partition_bound: str) -> datetime | None:
+    """Верхняя граница из pg_get_expr(relpartbound); None для DEFAULT"""
+    bounds = partition_range(partition_bound)
+    return bounds[1] if bounds else None
+
+
+async def list_partitions(
+    conn: AsyncConnection, table: str
+) -> list[tuple[str, str]]:
+    """Имена секций таблицы и выражения их границ"""
+    result = await conn.execute(
+        text(
+            "SELECT c.relname, pg_get_expr(c.relpartbound, c.oid) "
+            "FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+            "WHERE i.inhparent = CAST(:table AS regclass) "
+            "ORDER BY c.relname"
+        ),
+        {"table": table}
+    )
+    return [tuple(row) for row in result]
+
+
+async def create_partition(
+    conn: AsyncConnection, table: str, start: datetime
+) -> bool:
+    """
+    Создает секцию месяца start. Возвращает False, если месяц уже
+    пересекается с какой-либо секцией таблицы (по границам, а не по имени).
+
+    Секция собирается как отдельная таблица, в нее переносятся строки
+    этого месяца из DEFAULT, затем она подключается через ATTACH: иначе
+    PostgreSQL отказал бы в создании секции при непустом DEFAULT.
+    """
+    name = partition_name(table, start)
+    end = add_months(start, 1)
+    for existing, bound in await list_partitions(conn, table):
+        bounds = partition_range(bound)
+        if bounds is None:
+            continue
+        lower, upper = bounds
+        if (lower is None or lower < end) and (upper is None or upper > start):
+            if (lower is not None and lower > start) or (
+                upper is not None and upper < end
+            ):
+                # ATTACH месячной секции упал бы на пересечении границ
+                logger.warning(
+                    "Partition %s overlaps %s partly, %s is skipped",
+                    existing,
+                    f"{start:%Y-%m}",
+                    name
+                )
+            return False
+
+    bounds = {"start": start, "end": end}
+    await conn.execute(text(
+        f"CREATE TABLE {name} (LIKE {table} INCLUDING DEFAULTS)"
+    ))
+    moved = await conn.execute(
+        text(
+            f"WITH moved AS ("
+            f"DELETE FROM {table}_default "
+            f"WHERE created_at >= :start AND created_at < :end "
+            f"RETURNING *"
+            f") INSERT INTO {name} SELECT * FROM moved"
+        ),
+        bounds
+    )
+    await conn.execute(text(
+        f"ALTER TABLE {table} ATTACH PARTITION {name} "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    ))
+    logger.info(
+        "Created partition %s (%s rows moved from default)",
+        name,
+        moved.rowcount
+    )
+    return True
+
+
+async def create_partitions(
+    engine: AsyncEngine,
+    months_ahead: int,
+    now: datetime | None = None
+) -> list[str]:
+    first = month_start(now or datetime.now(timezone.utc))
+    created = []
+    for table in PARTITIONED_TABLES:
+        for months in range(months_ahead + 1):
+            start = add_months(first, months)
+            async with engine.begin() as conn:
+                if await create_partition(conn, table, start):
+                    created.append(partition_name(table, start))
+    return created
+
+
+async def detach_partitions(
+    engine: AsyncEngine,
+    retention_months: int,
+    drop: bool = False,
+    now: datetime | None = None
+) -> list[str]:
+    """
+    Отсоединяет секции, все строки которых старше retention_months
+    полных месяцев. DEFAULT не трогается.
+    """
+    cutoff = add_months(
+        month_start(now or datetime.now(timezone.utc)), -retention_months
+    )
+    detached = []
+    for table in PARTITIONED_TABLES:
+        async with engine.begin() as conn:
+            partitions = await list_partitions(conn, table)
+
+        for name, bound in partitions:
+            end = upper_bound(bound)
+            if end is None or end > cutoff:
+                continue
+            async with engine.begin() as conn:
+                await conn.execute(text(
+                    f"ALTER TABLE {table} DETACH PARTITION {name}"
+                ))
+                if drop:
+                    await conn.execute(text(f"DROP TABLE {name}"))
+                else:
+                    await conn.execute(text(
+                        f"CREATE SCHEMA IF NOT EXISTS {ARCHIVE_SCHEMA}"
+                    ))
+                    await conn.execute(text(
+                        f"ALTER TABLE {name} SET SCHEMA {ARCHIVE_SCHEMA}"
+                    ))
+            logger.info(
+                "Partition %s %s",
+                name,
+                "dropped" if drop else f"moved to {ARCHIVE_SCHEMA}"
+            )
+            detached.append(name)
+    return detached
+
+
+async def prune_idempotency_keys(engine: AsyncEngine) -> int:
+    cutoff = datetime.now(timezone.utc) - timedelta(
+        seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS
+    )
+    async with engine.begin() as conn:
+        result = await conn.execute(
+            text("DELETE FROM idempotency_keys WHERE created_at < :cutoff"),
+            {"cutoff": cutoff}
+        )
+    logger.info("Pruned %s idempotency keys", result.rowcount)
+    return result.rowcount
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Partition maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    create = commands.add_parser("create")
+    create.add_argument(
+        "--months-ahead", type=int, default=settings.PARTITION_MONTHS_AHEAD
+    )
+
+    detach = commands.add_parser("detach")
+    detach.add_argument(
+        "--retention-months",
+        type=int,
+        default=settings.PARTITION_RETENTION_MONTHS
+    )
+    detach.add_argument("--drop", action="store_true")
+
+    commands.add_parser("prune-idempotency-keys")
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace):
+    from app.database import close_db, shard_router
+
+    if args.command == "detach" and args.retention_months <= 0:
+        logger.info("Partition retention is disabled")
+        return
+
+    try:
+        # Журналы кошельков лежат на шарде кошелька
+        for shard, shard_engine in shard_router.engines.items():
+            logger.info("Partition maintenance on shard %s", shard)
+            if args.command == "create":
+                await create_partitions(shard_engine, args.months_ahead)
+            elif args.command == "detach":
+                await detach_partitions(
+                    shard_engine, args.retention_months, args.drop
+                )
+            else:
+                await prune_idempotency_keys(shard_engine)
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
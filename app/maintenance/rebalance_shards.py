@@ -0,0 +1,65 @@
+"""
+Перенос кошельков между шардами после изменения SHARD_URLS.
+
+    python -m app.maintenance.rebalance_shards --dry-run
+    python -m app.maintenance.rebalance_shards --chunk-size 1000
+
+Схема на новом шарде должна быть создана заранее (alembic upgrade head
+с DATABASE_URL шарда). Запускать в окно обслуживания: пока перенос не
+закончен, часть кошельков API не найдет (404), см.
+app.services.shard_rebalance. Повторный запуск безопасен: переносятся
+только кошельки, которые еще лежат не на своем шарде.
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.services.shard_rebalance import rebalance_shards
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Shard rebalancing")
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.SHARD_REBALANCE_CHUNK_SIZE
+    )
+    parser.add_argument(
+        "--copy-batch-size",
+        type=int,
+        default=settings.SHARD_REBALANCE_COPY_BATCH_SIZE,
+        help="rows of a table copied per query"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="only report wallets that would be moved"
+    )
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.database import close_db, shard_router
+
+    try:
+        report = await rebalance_shards(
+            shard_router,
+            chunk_size=args.chunk_size,
+            dry_run=args.dry_run,
+            copy_batch_size=args.copy_batch_size
+        )
+    finally:
+        await close_db()
+
+    for (source, target), wallets in sorted(report.moved.items()):
+        print(f"shard {source} -> shard {target}: {wallets} wallets")
+    print(
+        f"{report.wallets} wallets scanned, "
+        f"{sum(report.moved.values())} "
+        f"{'to move' if args.dry_run else 'moved'}, "
+        f"{report.elapsed_seconds:.1f}s"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -0,0 +1,57 @@
+"""
+Сверка балансов кошельков с журналом транзакций.
+
+    python -m app.maintenance.verify_ledger
+    python -m app.maintenance.verify_ledger --workers 8 --chunk-size 5000
+
+Сверка идет на каждом шарде по очереди. Код возврата 1, если на
+каком-либо шарде найдены кошельки с расхождением. Повторные запуски
+продолжают от сохраненных чекпоинтов (ledger_checkpoints).
+"""
+import argparse
+import asyncio
+import sys
+
+from app.core.config import settings
+from app.services.ledger_verifier import verify_ledger
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Ledger verification")
+    parser.add_argument(
+        "--workers", type=int, default=settings.LEDGER_VERIFY_WORKERS
+    )
+    parser.add_argument(
+        "--chunk-size", type=int, default=settings.LEDGER_VERIFY_CHUNK_SIZE
+    )
+    return parser.parse_args(argv)
+
+
+async def main(args: argparse.Namespace) -> int:
+    from app.database import close_db, shard_router
+
+    reports = {}
+    try:
+        for shard, shard_engine in shard_router.engines.items():
+            reports[shard] = await verify_ledger(
+                shard_engine, workers=args.workers, chunk_size=args.chunk_size
+            )
+    finally:
+        await close_db()
+
+    for shard, report in reports.items():
+        for drift in report.drift:
+            print(
+                f"{drift.wallet_id}: balance {drift.balance}, "
+                f"ledger {drift.ledger_balance}"
+            )
+        print(
+            f"shard {shard}: {report.wallets} wallets, "
+            f"{report.chunks} chunks, {len(report.drift)} with drift, "
+            f"{report.elapsed_seconds:.1f}s"
+        )
+    return 1 if any(report.drift for report in reports.values()) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1,17 +1,27 @@
 import enum
 from sqlalchemy import (
+    DDL,
     BigInteger,
     Column,
     DateTime,
     Enum,
     ForeignKey,
-    String
+    Index,
+    String,
+    event
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 
+from app.core.uuid7 import uuid7
 from app.database import Base
 
+# Журнальные таблицы секционированы по месяцам created_at. Первичный
+# ключ включает ключ секционирования, как того требует PostgreSQL.
+# Секции на будущие месяцы создает app.maintenance.partitions, а строки
+# вне существующих секций попадают в секцию DEFAULT.
+PARTITION_BY_CREATED_AT = {"postgresql_partition_by": "RANGE (created_at)"}
+
 
 class WalletStatus(enum.Enum):
     """Wallet status options."""
@@ -24,6 +34,8 @@ class TransactionType(enum.Enum):
     """Transaction type options."""
     DEPOSIT = "DEPOSIT"
     WITHDRAW = "WITHDRAW"
+    TRANSFER_IN = "TRANSFER_IN"
+    TRANSFER_OUT = "TRANSFER_OUT"
 
 
 class TransactionStatus(enum.Enum):
@@ -36,11 +48,15 @@ class TransactionStatus(enum.Enum):
 class Wallet(Base):
     """Wallet model to store user wallet information."""
     __tablename__ = "wallets"
+    # created_at/updated_at приходят из INSERT/UPDATE ... RETURNING,
+    # без повторного SELECT после коммита
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        server_default=func.gen_random_uuid()
+        default=uuid7,
+        server_default=func.uuid_generate_v7()
     )
     balance = Column(BigInteger, default=0)
     status = Column(
@@ -55,40 +71,167 @@ class Wallet(Base):
 class Transaction(Base):
     """Transaction model to store all wallet operations."""
     __tablename__ = "transactions"
+    __table_args__ = (
+        # История кошелька: keyset-пагинация по (created_at, id)
+        Index(
+            "ix_transactions_wallet_id_created_at_id",
+            "wallet_id",
+            "created_at",
+            "id"
+        ),
+        PARTITION_BY_CREATED_AT,
+    )
 
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        server_default=func.gen_random_uuid()
+        default=uuid7,
+        server_default=func.uuid_generate_v7()
     )
     wallet_id = Column(
         UUID(as_uuid=True),
-        ForeignKey("wallets.id"),
-        index=True
+        ForeignKey("wallets.id")
     )
     type = Column(Enum(TransactionType), nullable=False)
     amount = Column(BigInteger, nullable=False,)
     status = Column(Enum(TransactionStatus), nullable=False)
+    balance_after = Column(BigInteger)
+    # Общий для пары TRANSFER_OUT/TRANSFER_IN одного перевода
+    transfer_id = Column(UUID(as_uuid=True), index=True)
     # tx_hash = Column(String(66), unique=True)  # Хеш транзакции в блокчейне
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now()
+    )
 
 
 class WalletAuditLog(Base):
     """Audit log for tracking wallet changes."""
     __tablename__ = "wallet_audit_log"
+    __table_args__ = (
+        # История изменений кошелька: keyset-пагинация по (created_at, id)
+        Index(
+            "ix_wallet_audit_log_wallet_id_created_at_id",
+            "wallet_id",
+            "created_at",
+            "id"
+        ),
+        PARTITION_BY_CREATED_AT,
+    )
 
     id = Column(
         UUID(as_uuid=True),
         primary_key=True,
-        server_default=func.gen_random_uuid()
+        default=uuid7,
+        server_default=func.uuid_generate_v7()
     )
     wallet_id = Column(
         UUID(as_uuid=True),
         ForeignKey("wallets.id"),
-        index=True,
         nullable=False,
     )
     action = Column(String(100), nullable=False)  # Например: "BALANCE_UPDATE", "STATUS_CHANGE"  # noqa e501
     old_balance = Column(BigInteger)
     new_balance = Column(BigInteger)
+    created_at = Column(
+        DateTime(timezone=True),
+        primary_key=True,
+        server_default=func.now()
+    )
+
+
+class IdempotencyKey(Base):
+    """
+    Idempotency-Key and the result of the operation it was used for.
+
+    Kept outside the partitioned transactions table because a unique
+    index there would have to include created_at.
+    """
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(255), primary_key=True)
+    wallet_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("wallets.id"),
+        nullable=False
+    )
+    type = Column(Enum(TransactionType), nullable=False)
+    amount = Column(BigInteger, nullable=False)
+    new_balance = Column(BigInteger, nullable=False)
+    created_at = Column(
+        DateTime(timezone=True),
+        server_default=func.now(),
+        index=True
+    )
+
+
+class WalletBalanceSnapshot(Base):
+    """
+    Wallet balance including every successful transaction
+    with created_at <= as_of.
+    """
+    __tablename__ = "wallet_balance_snapshots"
+    __table_args__ = (
+        # Срез последнего запуска: нижняя граница окна нового снимка
+        Index("ix_wallet_balance_snapshots_as_of", "as_of"),
+    )
+
+    wallet_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("wallets.id"),
+        primary_key=True
+    )
+    as_of = Column(DateTime(timezone=True), primary_key=True)
+    balance = Column(BigInteger, nullable=False)
+    last_tx_id = Column(UUID(as_uuid=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class LedgerCheckpoint(Base):
+    """
+    Last verified ledger state of a wallet: verified_balance is the sum
+    of successful transactions with created_at <= verified_through.
+    """
+    __tablename__ = "ledger_checkpoints"
+
+    wallet_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("wallets.id"),
+        primary_key=True
+    )
+    verified_balance = Column(BigInteger, nullable=False)
+    verified_through = Column(DateTime(timezone=True), nullable=False)
+    last_tx_id = Column(UUID(as_uuid=True))
+    verified_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+# Серверный генератор UUIDv7 для вставок в обход приложения. Функция
+# создается и миграцией, и create_all (тесты).
+UUID_GENERATE_V7 = DDL("""
+CREATE OR REPLACE FUNCTION uuid_generate_v7() RETURNS uuid AS $$
+    SELECT encode(
+        set_bit(
+            set_bit(
+                overlay(
+                    uuid_send(gen_random_uuid())
+                    PLACING substring(int8send(
+                        floor(extract(epoch FROM clock_timestamp()) * 1000)
+                        ::bigint
+                    ) FROM 3)
+                    FROM 1 FOR 6
+                ),
+                52, 1
+            ),
+            53, 1
+        ),
+        'hex'
+    )::uuid
+$$ LANGUAGE sql VOLATILE
+""")
+event.listen(Base.metadata, "before_create", UUID_GENERATE_V7)
+
+for _table in (Transaction.__table__, WalletAuditLog.__table__):
+    event.listen(_table, "after_create", DDL(
+        "CREATE TABLE %(table)s_default PARTITION OF %(table)s DEFAULT"
+    ))
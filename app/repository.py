@@ -0,0 +1,86 @@
+"""
+Слой запросов на SQLAlchemy Core для горячих путей (DB_QUERY_LAYER=core).
+
+Запросы собираются один раз при импорте из колонок таблиц, а не
+атрибутов моделей, и выполняются прямо на соединении сессии: без
+identity map, инструментирования атрибутов и unit of work. SQL берется
+из кэша компиляции SQLAlchemy, prepared statements - из кэша asyncpg.
+"""
+from uuid import UUID
+
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.config import settings
+from app.models import Wallet, WalletStatus
+
+wallets = Wallet.__table__
+
+# Порядок полей WalletResponseSchema (и WalletRow): строка отдается
+# в wallet_row_adapter как есть, и байты JSON должны совпасть
+WALLET_COLUMNS = (
+    wallets.c.status,
+    wallets.c.id,
+    wallets.c.balance,
+    wallets.c.created_at,
+    wallets.c.updated_at,
+)
+
+GET_WALLET_STATEMENT = (
+    select(*WALLET_COLUMNS).where(wallets.c.id == bindparam("wallet_id"))
+)
+
+# Удаленный кошелек не меняется: для него UPDATE не найдет строку
+SET_WALLET_STATUS_STATEMENT = (
+    update(wallets)
+    .where(
+        wallets.c.id == bindparam("wallet_id"),
+        wallets.c.status != WalletStatus.DELETED
+    )
+    .values(status=bindparam("new_status"), updated_at=func.now())
+    .returning(*WALLET_COLUMNS)
+)
+
+
+def core_enabled() -> bool:
+    return settings.DB_QUERY_LAYER == "core"
+
+
+async def query_executor(
+    db: AsyncSession
+) -> AsyncSession | AsyncConnection:
+    """
+    Куда отправлять Core-запросы: в соединение сессии (core) или
+    в саму сессию (orm). Соединение участвует в транзакции сессии.
+    """
+    if core_enabled():
+        return await db.connection()
+    return db
+
+
+async def get_wallet(db: AsyncSession, wallet_id: UUID) -> Row | None:
+    """Строка кошелька без загрузки ORM-объекта"""
+    connection = await db.connection()
+    return (await connection.execute(
+        GET_WALLET_STATEMENT, {"wallet_id": wallet_id}
+    )).one_or_none()
+
+
+async def set_wallet_status(
+    db: AsyncSession,
+    wallet_id: UUID,
+    wallet_status: WalletStatus
+) -> Row | None:
+    """
+    Смена статуса одним UPDATE ... RETURNING без refresh.
+    None, если кошелек не найден или удален.
+    """
+    connection = await db.connection()
+    row = (await connection.execute(
+        SET_WALLET_STATUS_STATEMENT,
+        {"wallet_id": wallet_id, "new_status": wallet_status}
+    )).one_or_none()
+    await db.commit()
+    return row
@@ -5,8 +5,11 @@ from pydantic import (
     ConfigDict,
     Field,
     field_validator,
-    UUID4
+    model_validator
 )
+from uuid import UUID
+
+from app.core.config import settings
 
 
 class WalletStatusSchema(str, Enum):
@@ -20,7 +23,7 @@ class WalletBase(BaseModel):
 
 
 class WalletResponseSchema(WalletBase):
-    id: UUID4
+    id: UUID
     balance: int
     created_at: datetime
     updated_at: datetime | None
@@ -39,6 +42,48 @@ class WalletResponseSchema(WalletBase):
     )
 
 
+class WalletBatchCreateSchema(BaseModel):
+    ids: list[UUID] = Field(
+        min_length=1,
+        max_length=settings.WALLET_BATCH_MAX_SIZE,
+        description="Client-supplied wallet IDs"
+    )
+
+    @field_validator("ids")
+    def validate_unique(cls, v):
+        if len(set(v)) != len(v):
+            raise ValueError("Wallet IDs must be unique")
+        return v
+
+
+class WalletLookupRequestSchema(BaseModel):
+    ids: list[UUID] = Field(
+        min_length=1, max_length=settings.WALLET_LOOKUP_MAX_IDS
+    )
+
+
+class WalletLookupStatusSchema(str, Enum):
+    FOUND = "FOUND"
+    NOT_FOUND = "NOT_FOUND"
+    DELETED = "DELETED"
+
+
+class WalletLookupResultSchema(BaseModel):
+    id: UUID
+    result: WalletLookupStatusSchema
+    wallet: WalletResponseSchema | None = None
+
+
+class WalletLookupResponseSchema(BaseModel):
+    results: list[WalletLookupResultSchema]
+
+
+class WalletBalanceSchema(BaseModel):
+    wallet_id: UUID
+    at: datetime
+    balance: int
+
+
 class WalletUpdateSchema(WalletBase):
     model_config = ConfigDict(
         json_schema_extra={
@@ -72,3 +117,129 @@ class WalletOperationSchema(BaseModel):
             }
         }
     )
+
+
+class BatchOperationModeSchema(str, Enum):
+    ALL_OR_NOTHING = "ALL_OR_NOTHING"
+    BEST_EFFORT = "BEST_EFFORT"
+
+
+class BatchOperationItemSchema(WalletOperationSchema):
+    wallet_id: UUID
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "wallet_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "operation_type": "DEPOSIT",
+                "amount": 100
+            }
+        }
+    )
+
+
+class BatchOperationRequestSchema(BaseModel):
+    mode: BatchOperationModeSchema = BatchOperationModeSchema.ALL_OR_NOTHING
+    items: list[BatchOperationItemSchema] = Field(
+        min_length=1, max_length=settings.BATCH_OPERATIONS_MAX_ITEMS
+    )
+
+
+class BatchOperationResultSchema(BaseModel):
+    wallet_id: UUID
+    status_code: int
+    detail: str | None = None
+    new_balance: int | None = None
+
+
+class BatchOperationResponseSchema(BaseModel):
+    mode: BatchOperationModeSchema
+    applied: bool
+    results: list[BatchOperationResultSchema]
+
+
+class TransferRequestSchema(BaseModel):
+    from_wallet_id: UUID
+    to_wallet_id: UUID
+    amount: int = Field(gt=0, description="Must be positive number")
+
+    @model_validator(mode="after")
+    def validate_wallets(self):
+        if self.from_wallet_id == self.to_wallet_id:
+            raise ValueError("Cannot transfer to the same wallet")
+        return self
+
+    model_config = ConfigDict(
+        json_schema_extra={
+            "example": {
+                "from_wallet_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+                "to_wallet_id": "0192b0b6-5f3e-7c4a-9d2e-8a1f4c3b2d10",
+                "amount": 100
+            }
+        }
+    )
+
+
+class TransferResponseSchema(BaseModel):
+    transfer_id: UUID
+    from_wallet_id: UUID
+    to_wallet_id: UUID
+    amount: int
+    from_balance: int
+    to_balance: int
+
+
+class TransactionTypeSchema(str, Enum):
+    DEPOSIT = "DEPOSIT"
+    WITHDRAW = "WITHDRAW"
+    TRANSFER_IN = "TRANSFER_IN"
+    TRANSFER_OUT = "TRANSFER_OUT"
+
+
+class TransactionStatusSchema(str, Enum):
+    PENDING = "PENDING"
+    SUCCESS = "SUCCESS"
+    FAILED = "FAILED"
+
+
+class TransactionResponseSchema(BaseModel):
+    id: UUID
+    wallet_id: UUID
+    type: TransactionTypeSchema
+    amount: int
+    status: TransactionStatusSchema
+    balance_after: int | None
+    transfer_id: UUID | None = None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuditLogResponseSchema(BaseModel):
+    id: UUID
+    wallet_id: UUID
+    action: str
+    old_balance: int | None
+    new_balance: int | None
+    created_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class AuditLogPageSchema(BaseModel):
+    items: list[AuditLogResponseSchema]
+    next_cursor: str | None = Field(
+        description="Pass as ?cursor= to fetch the next page"
+    )
+
+
+class ExportFormatSchema(str, Enum):
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
+class TransactionPageSchema(BaseModel):
+    items: list[TransactionResponseSchema]
+    next_cursor: str | None = Field(
+        description="Pass as ?cursor= to fetch the next page"
+    )
@@ -0,0 +1,226 @@
+"""
+Снимки балансов кошельков и баланс на произвольный момент времени.
+
+Снимок фиксирует баланс с учетом всех успешных транзакций с
+created_at <= as_of. Баланс на момент T - ближайший снимок не позже T
+плюс транзакции после него, поэтому стоимость запроса ограничена
+периодом снимков, а не возрастом кошелька.
+"""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    any_,
+    bindparam,
+    cast,
+    delete,
+    func,
+    insert,
+    select
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID as PG_UUID,
+    aggregate_order_by,
+    array_agg
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models import Transaction, WalletBalanceSnapshot
+from app.services.ledger import is_applied, signed_amount
+
+# Ключ pg_try_advisory_xact_lock: снимок пишет только одна реплика
+SNAPSHOT_LOCK_KEY = 0x5EA1_BA1A
+
+
+def _last_tx_id():
+    """id последней транзакции кошелька в группе (по created_at, id)"""
+    return array_agg(aggregate_order_by(
+        Transaction.id,
+        Transaction.created_at.desc(),
+        Transaction.id.desc()
+    ))[1].label("last_tx_id")
+
+
+def _build_snapshot_statement():
+    """
+    Один INSERT ... SELECT: для каждого кошелька с транзакциями в окне
+    (:previous_cutoff, :cutoff] пишется снимок на :cutoff - баланс его
+    последнего снимка плюс сумма транзакций окна.
+
+    Каждый запуск снимает все кошельки с транзакциями до своего среза,
+    поэтому после последнего снимка кошелька и до :previous_cutoff
+    транзакций у него нет. Запрос читает только секции transactions
+    за окно, а не всю историю.
+    """
+    snapshots = WalletBalanceSnapshot.__table__
+    cutoff = bindparam("cutoff", type_=snapshots.c.as_of.type)
+    previous_cutoff = bindparam(
+        "previous_cutoff", type_=snapshots.c.as_of.type
+    )
+
+    delta = (
+        select(
+            Transaction.wallet_id,
+            func.sum(signed_amount()).label("amount"),
+            _last_tx_id(),
+        )
+        .where(
+            is_applied(),
+            Transaction.wallet_id.is_not(None),
+            Transaction.created_at > previous_cutoff,
+            Transaction.created_at <= cutoff,
+        )
+        .group_by(Transaction.wallet_id)
+        .cte("delta")
+    )
+    # Последний снимок кошелька - по первичному ключу (wallet_id, as_of)
+    previous_balance = (
+        select(snapshots.c.balance)
+        .where(snapshots.c.wallet_id == delta.c.wallet_id)
+        .order_by(snapshots.c.as_of.desc())
+        .limit(1)
+        .scalar_subquery()
+    )
+    return insert(snapshots).from_select(
+        ["wallet_id", "as_of", "balance", "last_tx_id"],
+        select(
+            delta.c.wallet_id,
+            cutoff,
+            func.coalesce(previous_balance, 0) + delta.c.amount,
+            delta.c.last_tx_id,
+        )
+    )
+
+
+SNAPSHOT_STATEMENT = _build_snapshot_statement()
+
+# Нижняя граница окна, пока снимков нет
+NO_PREVIOUS_CUTOFF = datetime.min.replace(tzinfo=timezone.utc)
+
+
+async def take_snapshots(
+    db: AsyncSession,
+    cutoff: datetime | None = None
+) -> int | None:
+    """
+    Пишет снимки на cutoff (по умолчанию now - BALANCE_SNAPSHOT_LAG).
+    Возвращает число снимков или None, если снимок уже пишет другой
+    процесс.
+    """
+    if cutoff is None:
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.BALANCE_SNAPSHOT_LAG_SECONDS
+        )
+
+    async with db.begin():
+        locked = await db.scalar(
+            select(func.pg_try_advisory_xact_lock(SNAPSHOT_LOCK_KEY))
+        )
+        if not locked:
+            return None
+        # Срез предыдущего запуска (индекс по as_of)
+        previous_cutoff = await db.scalar(
+            select(func.max(WalletBalanceSnapshot.as_of))
+        )
+        result = await db.execute(
+            SNAPSHOT_STATEMENT,
+            {
+                "cutoff": cutoff,
+                "previous_cutoff": previous_cutoff or NO_PREVIOUS_CUTOFF
+            }
+        )
+
+    logger.info(
+        "Wrote %s balance snapshots as of %s",
+        result.rowcount,
+        cutoff.isoformat()
+    )
+    return result.rowcount
+
+
+async def rebase_snapshots(
+    conn: AsyncConnection,
+    wallet_ids: list[UUID],
+    cutoff: datetime | None
+):
+    """
+    Приводит снимки кошельков, перенесенных на шард, к срезу шарда
+    cutoff (max(as_of) до переноса, None - снимков на шарде нет).
+
+    Окно следующего снимка шарда начинается с его среза, поэтому
+    снимки кошельков не позже среза должны учитывать все их
+    транзакции до него, а снимков позже среза быть не должно: иначе
+    они сдвинут срез для остальных кошельков шарда. Снимки кошельков
+    с as_of >= cutoff заменяются снимком на cutoff, посчитанным по
+    всей истории; на шарде без снимков снимки кошельков удаляются.
+    Вызывается в транзакции переноса под SNAPSHOT_LOCK_KEY.
+    """
+    snapshots = WalletBalanceSnapshot.__table__
+    ids = bindparam(
+        "wallet_ids", value=wallet_ids, type_=ARRAY(PG_UUID(as_uuid=True))
+    )
+    stale = delete(snapshots).where(snapshots.c.wallet_id == any_(ids))
+    if cutoff is None:
+        await conn.execute(stale)
+        return
+    await conn.execute(stale.where(snapshots.c.as_of >= cutoff))
+    await conn.execute(
+        insert(snapshots).from_select(
+            ["wallet_id", "as_of", "balance", "last_tx_id"],
+            select(
+                Transaction.wallet_id,
+                bindparam("cutoff", cutoff, type_=snapshots.c.as_of.type),
+                func.sum(signed_amount()),
+                _last_tx_id(),
+            )
+            .where(
+                is_applied(),
+                Transaction.wallet_id == any_(ids),
+                Transaction.created_at <= cutoff,
+            )
+            .group_by(Transaction.wallet_id)
+        )
+    )
+
+
+async def balance_at(db: AsyncSession, wallet_uuid: UUID, at: datetime) -> int:
+    """Баланс кошелька с учетом транзакций с created_at <= at"""
+    snapshot = (await db.execute(
+        select(WalletBalanceSnapshot.as_of, WalletBalanceSnapshot.balance)
+        .where(
+            WalletBalanceSnapshot.wallet_id == wallet_uuid,
+            WalletBalanceSnapshot.as_of <= at
+        )
+        .order_by(WalletBalanceSnapshot.as_of.desc())
+        .limit(1)
+    )).one_or_none()
+
+    # sum(bigint) в PostgreSQL - numeric
+    total = cast(func.coalesce(func.sum(signed_amount()), 0), BigInteger)
+    query = select(total).where(
+        Transaction.wallet_id == wallet_uuid,
+        is_applied(),
+        Transaction.created_at <= at
+    )
+    if snapshot is None:
+        return await db.scalar(query)
+    return snapshot.balance + await db.scalar(
+        query.where(Transaction.created_at > snapshot.as_of)
+    )
+
+
+async def run_snapshot_loop(session_factory: Callable[[], AsyncSession]):
+    """Фоновая задача приложения: снимки раз в интервал"""
+    while True:
+        await asyncio.sleep(settings.BALANCE_SNAPSHOT_INTERVAL_SECONDS)
+        try:
+            async with session_factory() as session:
+                await take_snapshots(session)
+        except Exception as e:
+            logger.error("Balance snapshot failed: %s", e)
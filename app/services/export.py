@@ -0,0 +1,99 @@
+"""
+Потоковая выгрузка истории транзакций кошелька.
+
+Строки читаются серверным курсором asyncpg (stream + yield_per) и
+отдаются чанками по EXPORT_CHUNK_SIZE строк, так что память не зависит
+от длины истории. Выгрузка идет одним запросом, то есть из одного
+снимка данных.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator, Callable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models import Transaction
+from app.schemas import ExportFormatSchema
+
+EXPORT_COLUMNS = (
+    Transaction.id,
+    Transaction.wallet_id,
+    Transaction.type,
+    Transaction.amount,
+    Transaction.status,
+    Transaction.balance_after,
+    Transaction.transfer_id,
+    Transaction.created_at,
+)
+EXPORT_FIELDS = tuple(column.key for column in EXPORT_COLUMNS)
+
+MEDIA_TYPES = {
+    ExportFormatSchema.NDJSON: "application/x-ndjson",
+    ExportFormatSchema.CSV: "text/csv",
+}
+
+
+def _plain(value):
+    if hasattr(value, "value"):  # enum
+        return value.value
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _ndjson_chunk(rows) -> bytes:
+    return "".join(
+        json.dumps(dict(zip(EXPORT_FIELDS, map(_plain, row)))) + "\n"
+        for row in rows
+    ).encode()
+
+
+def _csv_chunk(rows) -> bytes:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        ["" if value is None else _plain(value) for value in row]
+        for row in rows
+    )
+    return buffer.getvalue().encode()
+
+
+async def stream_transactions(
+    session_factory: Callable[[], AsyncSession],
+    wallet_uuid: UUID,
+    export_format: ExportFormatSchema
+) -> AsyncIterator[bytes]:
+    """История кошелька в хронологическом порядке чанками байтов"""
+    if export_format == ExportFormatSchema.CSV:
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_FIELDS)
+        yield buffer.getvalue().encode()
+        to_chunk = _csv_chunk
+    else:
+        to_chunk = _ndjson_chunk
+
+    exported = 0
+    async with session_factory() as session:
+        result = await session.stream(
+            select(*EXPORT_COLUMNS)
+            .where(Transaction.wallet_id == wallet_uuid)
+            .order_by(Transaction.created_at, Transaction.id)
+            .execution_options(yield_per=settings.EXPORT_CHUNK_SIZE)
+        )
+        async for rows in result.partitions():
+            exported += len(rows)
+            yield to_chunk(rows)
+
+    logger.info(
+        "Exported %s transactions of wallet %s as %s",
+        exported,
+        wallet_uuid,
+        export_format.value,
+        extra={"wallet_id": str(wallet_uuid)}
+    )
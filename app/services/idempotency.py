@@ -0,0 +1,154 @@
+"""
+Идемпотентность операций по заголовку Idempotency-Key.
+
+Ключ хранится в таблице idempotency_keys (первичный ключ) вместе с
+результатом операции, а недавно виденные ключи дополнительно держатся
+в LRU-кэше процесса:
+повтор запроса возвращает исходный new_balance без блокировки кошелька.
+И в кэше, и в БД ключ действует IDEMPOTENCY_KEY_TTL_SECONDS от его
+created_at: ключ старше TTL не воспроизводится, а освобождается для
+новой операции. Запись кэша, загруженная из БД, живет только до
+истечения ключа, а не полный TTL.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from fastapi import HTTPException, status
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from uuid import UUID
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.logger import logger
+from app.models import IdempotencyKey
+from app.schemas import WalletOperationSchema
+
+
+@dataclass(frozen=True)
+class OperationResult:
+    wallet_id: UUID
+    operation_type: str
+    amount: int
+    new_balance: int
+    # Время создания ключа: от него отсчитывается TTL
+    created_at: datetime
+
+
+idempotency_cache = TTLCache(
+    max_size=settings.IDEMPOTENCY_CACHE_SIZE,
+    ttl=settings.IDEMPOTENCY_KEY_TTL_SECONDS
+)
+
+
+def _cache_result(idempotency_key: str, result: OperationResult):
+    """Кэширует результат до истечения ключа: created_at + TTL"""
+    expires_in = (
+        result.created_at
+        + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+        - datetime.now(timezone.utc)
+    ).total_seconds()
+    if expires_in > 0:
+        idempotency_cache.set(idempotency_key, result, ttl=expires_in)
+
+
+def remember_operation_result(
+    idempotency_key: str,
+    wallet_uuid: UUID,
+    operation: WalletOperationSchema,
+    new_balance: int,
+    created_at: datetime
+):
+    """
+    created_at - время не позже вставки ключа в БД (начало операции),
+    чтобы запись кэша не пережила ключ.
+    """
+    _cache_result(idempotency_key, OperationResult(
+        wallet_id=wallet_uuid,
+        operation_type=operation.operation_type.value,
+        amount=int(operation.amount),
+        new_balance=new_balance,
+        created_at=created_at
+    ))
+
+
+async def find_operation_result(
+    db: AsyncSession,
+    idempotency_key: str
+) -> OperationResult | None:
+    """Ищет результат операции с этим ключом: сначала в кэше, затем в БД."""
+    result = idempotency_cache.get(idempotency_key)
+    if result is not None:
+        return result
+
+    expires_before = func.now() - timedelta(
+        seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS
+    )
+    async with db.begin():
+        row = (await db.execute(
+            select(
+                IdempotencyKey.wallet_id,
+                IdempotencyKey.type,
+                IdempotencyKey.amount,
+                IdempotencyKey.new_balance,
+                IdempotencyKey.created_at
+            )
+            .where(
+                IdempotencyKey.key == idempotency_key,
+                IdempotencyKey.created_at >= expires_before
+            )
+        )).one_or_none()
+        if row is None:
+            # Просроченный, но еще не удаленный ключ не должен
+            # помешать вставке ключа новой операции
+            await db.execute(
+                delete(IdempotencyKey)
+                .where(
+                    IdempotencyKey.key == idempotency_key,
+                    IdempotencyKey.created_at < expires_before
+                )
+            )
+
+    if row is None:
+        return None
+
+    result = OperationResult(
+        wallet_id=row.wallet_id,
+        operation_type=row.type.value,
+        amount=row.amount,
+        new_balance=row.new_balance,
+        created_at=row.created_at
+    )
+    _cache_result(idempotency_key, result)
+    return result
+
+
+def replay_operation_result(
+    result: OperationResult,
+    idempotency_key: str,
+    wallet_uuid: UUID,
+    operation: WalletOperationSchema
+) -> int:
+    """
+    Возвращает сохраненный new_balance, если повтор совпадает
+    с исходным запросом.
+    """
+    if (
+        result.wallet_id != wallet_uuid or
+        result.operation_type != operation.operation_type.value or
+        result.amount != int(operation.amount)
+    ):
+        logger.warning(
+            "Idempotency key %s reused with different request",
+            idempotency_key
+        )
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail="Idempotency key reused with different request"
+        )
+
+    logger.info(
+        "Replayed operation for idempotency key %s on wallet %s",
+        idempotency_key,
+        wallet_uuid
+    )
+    return result.new_balance
@@ -0,0 +1,22 @@
+"""
+Общие выражения для расчета баланса по журналу транзакций.
+"""
+from sqlalchemy import case
+
+from app.models import Transaction, TransactionStatus, TransactionType
+
+# Типы транзакций, уменьшающие баланс
+DEBIT_TYPES = (TransactionType.WITHDRAW, TransactionType.TRANSFER_OUT)
+
+
+def signed_amount():
+    """Сумма транзакции со знаком, как она меняет баланс кошелька"""
+    return case(
+        (Transaction.type.in_(DEBIT_TYPES), -Transaction.amount),
+        else_=Transaction.amount
+    )
+
+
+def is_applied():
+    """Условие: транзакция изменила баланс"""
+    return Transaction.status == TransactionStatus.SUCCESS
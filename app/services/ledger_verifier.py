@@ -0,0 +1,276 @@
+"""
+Сверка wallets.balance с суммой успешных транзакций.
+
+Для каждого кошелька хранится чекпоинт: сумма транзакций с
+created_at <= verified_through. Проход читает только транзакции после
+чекпоинта, поэтому стоимость зависит от объема новых операций, а не от
+размера таблицы.
+
+Кошельки обрабатываются чанками по диапазону id: один агрегирующий
+запрос на чанк, чанки параллельно на LEDGER_VERIFY_WORKERS соединениях.
+Чанк читается в REPEATABLE READ, так что баланс и транзакции видны из
+одного снимка. Чекпоинт сдвигается только до now - LAG: транзакция с
+более ранним created_at к этому времени уже закоммичена.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from sqlalchemy import (
+    BigInteger,
+    and_,
+    bindparam,
+    cast,
+    func,
+    or_,
+    select,
+    type_coerce
+)
+from sqlalchemy.dialects.postgresql import (
+    ARRAY,
+    UUID as PG_UUID,
+    aggregate_order_by,
+    array_agg,
+    insert as pg_insert
+)
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import registry
+from app.models import LedgerCheckpoint, Transaction, Wallet
+from app.services.ledger import is_applied, signed_amount
+
+ledger_wallets_verified_total = registry.counter(
+    "ledger_wallets_verified_total",
+    "Wallets checked by the ledger verifier",
+)
+ledger_chunks_verified_total = registry.counter(
+    "ledger_chunks_verified_total",
+    "Wallet chunks checked by the ledger verifier",
+)
+ledger_verification_duration_seconds = registry.histogram(
+    "ledger_verification_duration_seconds",
+    "Duration of a full ledger verification pass",
+    buckets=(1, 5, 15, 60, 300, 900, 3600),
+)
+
+
+@dataclass
+class LedgerDrift:
+    wallet_id: UUID
+    balance: int
+    ledger_balance: int
+
+
+@dataclass
+class VerificationReport:
+    wallets: int = 0
+    chunks: int = 0
+    drift: list[LedgerDrift] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+
+@dataclass
+class _VerifierState:
+    drift_wallets: int = 0
+    last_success: float = 0.0
+
+
+verifier_state = _VerifierState()
+
+registry.gauge(
+    "ledger_drift_wallets",
+    "Wallets whose balance differed from the ledger in the last pass",
+    lambda: verifier_state.drift_wallets,
+)
+registry.gauge(
+    "ledger_verification_last_success_timestamp_seconds",
+    "Unix time of the last completed ledger verification pass",
+    lambda: verifier_state.last_success,
+)
+
+
+def _build_chunk_statement():
+    """Сумма по журналу для кошельков чанка от их чекпоинтов"""
+    checkpoints = LedgerCheckpoint.__table__
+    settled = Transaction.created_at <= bindparam("cutoff")
+
+    return (
+        select(
+            Wallet.id.label("wallet_id"),
+            func.coalesce(Wallet.balance, 0).label("balance"),
+            func.coalesce(checkpoints.c.verified_balance, 0).label("base"),
+            cast(
+                func.coalesce(func.sum(signed_amount()), 0), BigInteger
+            ).label("total"),
+            cast(
+                func.coalesce(func.sum(signed_amount()).filter(settled), 0),
+                BigInteger
+            ).label("settled"),
+            func.count(Transaction.id).filter(settled).label("settled_count"),
+            type_coerce(
+                array_agg(aggregate_order_by(
+                    Transaction.id,
+                    Transaction.created_at.desc(),
+                    Transaction.id.desc()
+                )).filter(settled),
+                ARRAY(PG_UUID(as_uuid=True))
+            )[1].label("settled_last_tx_id"),
+        )
+        .select_from(Wallet)
+        .outerjoin(checkpoints, checkpoints.c.wallet_id == Wallet.id)
+        .outerjoin(Transaction, and_(
+            Transaction.wallet_id == Wallet.id,
+            is_applied(),
+            or_(
+                checkpoints.c.verified_through.is_(None),
+                Transaction.created_at > checkpoints.c.verified_through
+            )
+        ))
+        .where(Wallet.id.between(
+            bindparam("first_id"), bindparam("last_id")
+        ))
+        .group_by(Wallet.id, checkpoints.c.verified_balance)
+    )
+
+
+CHUNK_STATEMENT = _build_chunk_statement()
+
+
+async def _verify_chunk(
+    conn: AsyncConnection,
+    first_id: UUID,
+    last_id: UUID,
+    cutoff: datetime
+) -> tuple[int, list[LedgerDrift]]:
+    rows = (await conn.execute(
+        CHUNK_STATEMENT,
+        {"first_id": first_id, "last_id": last_id, "cutoff": cutoff}
+    )).all()
+
+    drift = []
+    checkpoints = []
+    for row in rows:
+        ledger_balance = row.base + row.total
+        if ledger_balance != row.balance:
+            drift.append(
+                LedgerDrift(row.wallet_id, row.balance, ledger_balance)
+            )
+            continue
+        if row.settled_count:
+            checkpoints.append({
+                "wallet_id": row.wallet_id,
+                "verified_balance": row.base + row.settled,
+                "verified_through": cutoff,
+                "last_tx_id": row.settled_last_tx_id,
+            })
+
+    if checkpoints:
+        insert = pg_insert(LedgerCheckpoint.__table__).values(checkpoints)
+        await conn.execute(insert.on_conflict_do_update(
+            index_elements=["wallet_id"],
+            set_={
+                "verified_balance": insert.excluded.verified_balance,
+                "verified_through": insert.excluded.verified_through,
+                "last_tx_id": insert.excluded.last_tx_id,
+                "verified_at": func.now(),
+            }
+        ))
+    return len(rows), drift
+
+
+async def verify_ledger(
+    engine: AsyncEngine,
+    workers: int | None = None,
+    chunk_size: int | None = None,
+    cutoff: datetime | None = None
+) -> VerificationReport:
+    """Один проход по всем кошелькам"""
+    workers = workers or settings.LEDGER_VERIFY_WORKERS
+    chunk_size = chunk_size or settings.LEDGER_VERIFY_CHUNK_SIZE
+    if cutoff is None:
+        cutoff = datetime.now(timezone.utc) - timedelta(
+            seconds=settings.LEDGER_VERIFY_LAG_SECONDS
+        )
+
+    report = VerificationReport()
+    started = time.perf_counter()
+    chunks: asyncio.Queue = asyncio.Queue(maxsize=workers * 2)
+
+    async def produce():
+        """Границы чанков по индексу wallets_pkey"""
+        after = None
+        async with engine.connect() as conn:
+            while True:
+                query = select(Wallet.id).order_by(Wallet.id).limit(chunk_size)
+                if after is not None:
+                    query = query.where(Wallet.id > after)
+                ids = (await conn.scalars(query)).all()
+                await conn.commit()
+                if not ids:
+                    break
+                await chunks.put((ids[0], ids[-1]))
+                after = ids[-1]
+        for _ in range(workers):
+            await chunks.put(None)
+
+    async def consume():
+        async with engine.connect() as conn:
+            conn = await conn.execution_options(
+                isolation_level="REPEATABLE READ"
+            )
+            while (chunk := await chunks.get()) is not None:
+                async with conn.begin():
+                    wallets, drift = await _verify_chunk(conn, *chunk, cutoff)
+                report.wallets += wallets
+                report.chunks += 1
+                report.drift.extend(drift)
+                ledger_wallets_verified_total.inc(wallets)
+                ledger_chunks_verified_total.inc()
+                logger.debug(
+                    "Ledger chunk %s..%s verified: %s wallets",
+                    chunk[0],
+                    chunk[1],
+                    wallets
+                )
+
+    # TaskGroup отменяет остальные задачи, если одна из них упала
+    async with asyncio.TaskGroup() as tasks:
+        tasks.create_task(produce())
+        for _ in range(workers):
+            tasks.create_task(consume())
+
+    report.elapsed_seconds = time.perf_counter() - started
+    ledger_verification_duration_seconds.observe(report.elapsed_seconds)
+    verifier_state.drift_wallets = len(report.drift)
+    verifier_state.last_success = time.time()
+
+    for drift in report.drift:
+        logger.error(
+            "Ledger drift on wallet %s: balance %s, ledger %s",
+            drift.wallet_id,
+            drift.balance,
+            drift.ledger_balance,
+            extra={"wallet_id": str(drift.wallet_id)}
+        )
+    logger.info(
+        "Ledger verified: %s wallets in %s chunks, %s with drift, %.1fs",
+        report.wallets,
+        report.chunks,
+        len(report.drift),
+        report.elapsed_seconds
+    )
+    return report
+
+
+async def run_verification_loop(engine: AsyncEngine):
+    """Фоновая задача приложения: сверка раз в интервал"""
+    while True:
+        await asyncio.sleep(settings.LEDGER_VERIFY_INTERVAL_SECONDS)
+        try:
+            await verify_ledger(engine)
+        except Exception as e:
+            logger.error("Ledger verification failed: %s", e)
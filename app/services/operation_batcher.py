@@ -0,0 +1,150 @@
+"""
+Группировка (group commit) операций над одним кошельком.
+
+Первый запрос к кошельку становится лидером пакета: он ждёт короткое окно
+(или пока пакет не заполнится), затем в своей сессии применяет все
+накопленные операции под одной блокировкой и одним коммитом и раздаёт
+каждому ожидающему его собственный результат. Отмена лидера (клиент
+отключился) после начала применения не прерывает ни коммит, ни раздачу
+результатов: иначе остальные получили бы ошибку по уже закоммиченным
+операциям.
+"""
+import asyncio
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+from uuid import UUID
+
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.logger import logger
+from app.schemas import WalletOperationSchema
+
+ApplyBatch = Callable[
+    [AsyncSession, UUID, list[WalletOperationSchema]],
+    Awaitable[list[int | HTTPException]]
+]
+
+
+async def _run_to_completion(task: asyncio.Task):
+    """
+    Дожидается task, даже если ожидающего отменили; отмену пробрасывает
+    после завершения task. Сессия лидера нужна task до конца.
+    """
+    cancelled = False
+    while not task.done():
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            cancelled = True
+    if cancelled:
+        raise asyncio.CancelledError
+    task.result()
+
+
+@dataclass
+class _PendingOperation:
+    operation: WalletOperationSchema
+    future: asyncio.Future
+
+
+@dataclass
+class _Batch:
+    items: list[_PendingOperation] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class OperationBatcher:
+    """Накопитель операций по кошелькам внутри одного процесса."""
+
+    def __init__(
+        self,
+        apply_batch: ApplyBatch,
+        window_ms: float,
+        max_size: int
+    ):
+        self.apply_batch = apply_batch
+        self.window = window_ms / 1000
+        self.max_size = max_size
+        self._batches: dict[UUID, _Batch] = {}
+
+    async def submit(
+        self,
+        db: AsyncSession,
+        wallet_uuid: UUID,
+        operation: WalletOperationSchema
+    ) -> int:
+        """Ставит операцию в пакет кошелька и ждёт её результата."""
+        future = asyncio.get_running_loop().create_future()
+
+        batch = self._batches.get(wallet_uuid)
+        if batch is not None:
+            self._add(wallet_uuid, batch, operation, future)
+            return await future
+
+        batch = self._batches[wallet_uuid] = _Batch()
+        self._add(wallet_uuid, batch, operation, future)
+        try:
+            try:
+                await asyncio.wait_for(batch.full.wait(), self.window)
+            except asyncio.TimeoutError:
+                pass
+            self._close(wallet_uuid, batch)
+            await _run_to_completion(asyncio.create_task(
+                self._apply(db, wallet_uuid, batch.items)
+            ))
+        finally:
+            # Лидер мог быть отменён до применения пакета: ничего не
+            # закоммичено, не оставляем остальных ждать вечно
+            self._close(wallet_uuid, batch)
+            for item in batch.items:
+                if not item.future.done():
+                    item.future.set_exception(HTTPException(
+                        status.HTTP_500_INTERNAL_SERVER_ERROR,
+                        detail="Operation failed"
+                    ))
+
+        return await future
+
+    def _add(
+        self,
+        wallet_uuid: UUID,
+        batch: _Batch,
+        operation: WalletOperationSchema,
+        future: asyncio.Future
+    ):
+        batch.items.append(_PendingOperation(operation, future))
+        if len(batch.items) >= self.max_size:
+            # Пакет заполнен: следующие запросы начнут новый
+            self._close(wallet_uuid, batch)
+            batch.full.set()
+
+    def _close(self, wallet_uuid: UUID, batch: _Batch):
+        if self._batches.get(wallet_uuid) is batch:
+            del self._batches[wallet_uuid]
+
+    async def _apply(
+        self,
+        db: AsyncSession,
+        wallet_uuid: UUID,
+        items: list[_PendingOperation]
+    ):
+        logger.debug(
+            "Applying batch of %s operations on wallet %s",
+            len(items),
+            wallet_uuid
+        )
+        try:
+            results = await self.apply_batch(
+                db, wallet_uuid, [item.operation for item in items]
+            )
+        except Exception as e:
+            for item in items:
+                item.future.set_exception(e)
+            return
+
+        for item, result in zip(items, results):
+            if isinstance(result, HTTPException):
+                item.future.set_exception(result)
+            else:
+                item.future.set_result(result)
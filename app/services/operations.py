@@ -0,0 +1,602 @@
+"""
+Бизнес-логика DEPOSIT/WITHDRAW операций над кошельком.
+"""
+from datetime import datetime, timezone
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    BigInteger,
+    String,
+    any_,
+    bindparam,
+    cast,
+    insert,
+    literal,
+    select,
+    update
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.types import Enum
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+from uuid import UUID
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.metrics import (
+    db_locking_statement_seconds,
+    wallet_operation_rejections_total,
+    wallet_operations_total
+)
+from app.core.uuid7 import uuid7
+from app.models import (
+    IdempotencyKey,
+    Wallet,
+    Transaction,
+    TransactionType,
+    WalletAuditLog,
+    WalletStatus,
+    TransactionStatus
+)
+from app.repository import (
+    GET_WALLET_STATEMENT,
+    core_enabled,
+    query_executor
+)
+from app.schemas import (
+    BatchOperationItemSchema,
+    BatchOperationResultSchema,
+    OperationTypeSchema,
+    WalletOperationSchema
+)
+from app.services.idempotency import (
+    find_operation_result,
+    remember_operation_result,
+    replay_operation_result
+)
+from app.services.operation_batcher import OperationBatcher
+from app.services.wallet_cache import wallet_cache
+
+
+def _unnest(name: str, items: list, type_):
+    """Столбец из массива-параметра: один bind на весь пакет"""
+    return func.unnest(bindparam(name, value=items, type_=ARRAY(type_)))
+
+
+def _insert_rows(model, rows: list[dict]):
+    """
+    Многострочный INSERT ... SELECT unnest(...) вместо VALUES: число
+    bind-параметров не зависит от числа строк (у asyncpg лимит 32767).
+    id генерируются приложением, как при обычной вставке.
+    """
+    table = model.__table__
+    names = list(rows[0])
+    columns = [_unnest("id", [uuid7() for _ in rows], table.c.id.type)]
+    for name in names:
+        column_type = table.c[name].type
+        items = [row[name] for row in rows]
+        if isinstance(column_type, Enum):
+            # Массивы enum-типов передаются строками и приводятся в SQL
+            columns.append(cast(
+                _unnest(name, [item.name for item in items], String),
+                column_type
+            ))
+        else:
+            columns.append(_unnest(name, items, column_type))
+    return insert(table).from_select(["id", *names], select(*columns))
+
+
+def _build_atomic_operation_statement():
+    """
+    Один CTE-запрос: условный UPDATE баланса + INSERT в transactions,
+    wallet_audit_log и (если передан ключ) idempotency_keys. Если условие
+    UPDATE не выполнено, вставки не происходят и запрос возвращает
+    пустой результат.
+    """
+    wallets = Wallet.__table__
+    transactions = Transaction.__table__
+    audit_log = WalletAuditLog.__table__
+    idempotency_keys = IdempotencyKey.__table__
+
+    delta = bindparam("delta", type_=BigInteger)
+    transaction_type = bindparam("type", type_=transactions.c.type.type)
+    amount = bindparam("amount", type_=BigInteger)
+    idempotency_key = bindparam("idempotency_key", type_=String)
+
+    updated = (
+        update(wallets)
+        .where(
+            wallets.c.id == bindparam("wallet_id"),
+            wallets.c.status == WalletStatus.ACTIVE,
+            wallets.c.balance + delta >= 0,
+        )
+        .values(balance=wallets.c.balance + delta, updated_at=func.now())
+        .returning(wallets.c.id, wallets.c.balance)
+        .cte("updated_wallet")
+    )
+
+    inserted_transaction = (
+        insert(transactions)
+        .from_select(
+            [
+                "id",
+                "wallet_id",
+                "type",
+                "amount",
+                "status",
+                "balance_after",
+            ],
+            select(
+                bindparam("transaction_id", type_=transactions.c.id.type),
+                updated.c.id,
+                transaction_type,
+                amount,
+                literal(
+                    TransactionStatus.SUCCESS, transactions.c.status.type
+                ),
+                updated.c.balance,
+            ),
+        )
+        .returning(transactions.c.id)
+        .cte("inserted_transaction")
+    )
+
+    inserted_audit_log = (
+        insert(audit_log)
+        .from_select(
+            ["id", "wallet_id", "action", "old_balance", "new_balance"],
+            select(
+                bindparam("audit_log_id", type_=audit_log.c.id.type),
+                updated.c.id,
+                bindparam("action", type_=String),
+                updated.c.balance - delta,
+                updated.c.balance,
+            ),
+        )
+        .returning(audit_log.c.id)
+        .cte("inserted_audit_log")
+    )
+
+    inserted_idempotency_key = (
+        insert(idempotency_keys)
+        .from_select(
+            ["key", "wallet_id", "type", "amount", "new_balance"],
+            select(
+                idempotency_key,
+                updated.c.id,
+                transaction_type,
+                amount,
+                updated.c.balance,
+            ).where(idempotency_key.is_not(None)),
+        )
+        .returning(idempotency_keys.c.key)
+        .cte("inserted_idempotency_key")
+    )
+
+    return (
+        select(updated.c.balance)
+        .add_cte(
+            inserted_transaction,
+            inserted_audit_log,
+            inserted_idempotency_key
+        )
+    )
+
+
+ATOMIC_OPERATION_STATEMENT = _build_atomic_operation_statement()
+
+
+def validate_operation(
+    wallet_uuid: UUID,
+    wallet_status: WalletStatus | None,
+    balance: int | None,
+    operation: WalletOperationSchema
+) -> int:
+    """
+    Проверяет возможность операции и возвращает новый баланс.
+    wallet_status=None означает, что кошелек не найден.
+    """
+    if wallet_status is None:
+        wallet_operation_rejections_total.inc(reason="not_found")
+        logger.warning("Wallet not found: %s", wallet_uuid)
+        raise HTTPException(
+            status.HTTP_404_NOT_FOUND, detail="Wallet not found"
+        )
+
+    if wallet_status != WalletStatus.ACTIVE:
+        wallet_operation_rejections_total.inc(reason="non_active")
+        logger.warning(
+            "Attempt to operate on non-active wallet %s", wallet_uuid
+        )
+        raise HTTPException(
+            status.HTTP_403_FORBIDDEN,
+            detail="Can only operate on ACTIVE wallets"
+        )
+
+    if (
+        operation.operation_type == OperationTypeSchema.WITHDRAW and
+        balance < int(operation.amount)
+    ):
+        wallet_operation_rejections_total.inc(reason="insufficient_funds")
+        logger.warning("Insufficient funds in wallet %s", wallet_uuid)
+        raise HTTPException(
+            status.HTTP_400_BAD_REQUEST,
+            detail="Insufficient funds"
+        )
+
+    return (
+        balance + int(operation.amount)
+        if operation.operation_type == OperationTypeSchema.DEPOSIT
+        else balance - int(operation.amount)
+    )
+
+
+async def apply_operation_atomic(
+    db: AsyncSession,
+    wallet_uuid: UUID,
+    operation: WalletOperationSchema,
+    idempotency_key: str | None = None
+) -> int:
+    """
+    Быстрый путь: блокировка строки держится ровно один запрос,
+    успешная операция стоит одного обращения к БД.
+    """
+    amount = int(operation.amount)
+    params = {
+        "wallet_id": wallet_uuid,
+        "delta": (
+            amount
+            if operation.operation_type == OperationTypeSchema.DEPOSIT
+            else -amount
+        ),
+        "type": TransactionType(operation.operation_type.value),
+        "amount": amount,
+        "action": f"BALANCE_{operation.operation_type.value}",
+        "idempotency_key": idempotency_key,
+        # UUIDv7 из приложения: from_select не подставляет default колонки
+        "transaction_id": uuid7(),
+        "audit_log_id": uuid7(),
+    }
+
+    try:
+        async with db.begin():
+            executor = await query_executor(db)
+            while True:
+                # Условный UPDATE сам берет блокировку строки
+                with db_locking_statement_seconds.time(
+                    operation="single_statement"
+                ):
+                    result = await executor.execute(
+                        ATOMIC_OPERATION_STATEMENT, params
+                    )
+                new_balance = result.scalar_one_or_none()
+                if new_balance is not None:
+                    break
+
+                # Условие UPDATE не выполнено: выясняем причину, чтобы
+                # вернуть тот же код ответа, что и при SELECT ... FOR UPDATE
+                wallet = (await executor.execute(
+                    GET_WALLET_STATEMENT, {"wallet_id": wallet_uuid}
+                )).one_or_none()
+                validate_operation(
+                    wallet_uuid,
+                    wallet.status if wallet else None,
+                    wallet.balance if wallet else None,
+                    operation
+                )
+                # Кошелек изменился между запросами - повторяем операцию
+    except (HTTPException, IntegrityError):
+        raise
+    except Exception as e:
+        logger.error("Database commit failed: %s", e)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Operation failed"
+        )
+
+    return new_balance
+
+
+async def apply_operations_locked(
+    db: AsyncSession,
+    wallet_uuid: UUID,
+    operations: list[WalletOperationSchema],
+    idempotency_key: str | None = None
+) -> list[int | HTTPException]:
+    """
+    Классический путь через ORM: SELECT ... FOR UPDATE и unit of work.
+    Операции применяются по порядку под одной блокировкой и одним коммитом;
+    для каждой возвращается новый баланс или HTTPException с причиной отказа.
+    idempotency_key допустим только для пакета из одной операции.
+    """
+    async with db.begin():
+        # 1. Получаем и блокируем кошелек
+        with db_locking_statement_seconds.time(operation="select_for_update"):
+            wallet = await db.execute(
+                select(Wallet)
+                .where(Wallet.id == wallet_uuid)
+                .with_for_update()
+            )
+        wallet = wallet.scalar_one_or_none()
+
+        results: list[int | HTTPException] = []
+        records: list[Transaction | WalletAuditLog | IdempotencyKey] = []
+        for operation in operations:
+            # 2. Валидации (без side effects) и новый баланс
+            try:
+                new_balance = validate_operation(
+                    wallet_uuid,
+                    wallet.status if wallet else None,
+                    wallet.balance if wallet else None,
+                    operation
+                )
+            except HTTPException as e:
+                results.append(e)
+                continue
+
+            # 3. Подготовка данных для сохранения
+            records.append(Transaction(
+                wallet_id=wallet_uuid,
+                type=operation.operation_type,
+                amount=int(operation.amount),
+                status=TransactionStatus.SUCCESS,
+                balance_after=new_balance,
+            ))
+            if idempotency_key is not None:
+                records.append(IdempotencyKey(
+                    key=idempotency_key,
+                    wallet_id=wallet_uuid,
+                    type=operation.operation_type,
+                    amount=int(operation.amount),
+                    new_balance=new_balance
+                ))
+            records.append(WalletAuditLog(
+                wallet_id=wallet_uuid,
+                action=f"BALANCE_{operation.operation_type.value}",
+                old_balance=wallet.balance,
+                new_balance=new_balance
+            ))
+
+            wallet.balance = new_balance  # type: ignore
+            results.append(new_balance)
+
+        # 4. Сохранение (единственный рискованный участок)
+        if records:
+            try:
+                db.add_all(records)
+                await db.commit()
+            except IntegrityError:
+                await db.rollback()
+                raise
+            except Exception as e:
+                logger.error("Database commit failed: %s", e)
+                await db.rollback()
+                raise HTTPException(
+                    status.HTTP_500_INTERNAL_SERVER_ERROR,
+                    detail="Operation failed"
+                )
+
+    return results
+
+
+async def apply_operation_locked(
+    db: AsyncSession,
+    wallet_uuid: UUID,
+    operation: WalletOperationSchema,
+    idempotency_key: str | None = None
+) -> int:
+    """Одна операция через SELECT ... FOR UPDATE."""
+    [result] = await apply_operations_locked(
+        db, wallet_uuid, [operation], idempotency_key
+    )
+    if isinstance(result, HTTPException):
+        raise result
+    return result
+
+
+async def apply_bulk_operations(
+    db: AsyncSession,
+    items: list[BatchOperationItemSchema],
+    all_or_nothing: bool
+) -> tuple[bool, list[BatchOperationResultSchema]]:
+    """
+    Операции над многими кошельками в одной транзакции.
+
+    Кошельки блокируются одним запросом в порядке id (без взаимных
+    блокировок между пакетами), балансы считаются в памяти по порядку
+    элементов, а изменения записываются set-based запросами:
+    UPDATE ... FROM (VALUES ...) и многострочные INSERT.
+    Возвращает признак применения пакета и результаты по элементам.
+    """
+    wallets = Wallet.__table__
+    wallet_ids = sorted({item.wallet_id for item in items})
+
+    try:
+        async with db.begin():
+            # 1. Блокируем все кошельки пакета в детерминированном порядке
+            with db_locking_statement_seconds.time(operation="batch"):
+                rows = (await db.execute(
+                    select(wallets.c.id, wallets.c.status, wallets.c.balance)
+                    .where(wallets.c.id == any_(bindparam(
+                        "wallet_ids",
+                        value=wallet_ids,
+                        type_=ARRAY(PG_UUID(as_uuid=True))
+                    )))
+                    .order_by(wallets.c.id)
+                    .with_for_update()
+                )).all()
+            state = {row.id: [row.status, row.balance] for row in rows}
+
+            # 2. Валидации и новые балансы по порядку элементов
+            results = []
+            transaction_rows = []
+            audit_log_rows = []
+            for item in items:
+                wallet = state.get(item.wallet_id)
+                try:
+                    new_balance = validate_operation(
+                        item.wallet_id,
+                        wallet[0] if wallet else None,
+                        wallet[1] if wallet else None,
+                        item
+                    )
+                except HTTPException as e:
+                    results.append(BatchOperationResultSchema(
+                        wallet_id=item.wallet_id,
+                        status_code=e.status_code,
+                        detail=e.detail
+                    ))
+                    continue
+
+                transaction_rows.append({
+                    "wallet_id": item.wallet_id,
+                    "type": TransactionType(item.operation_type.value),
+                    "amount": int(item.amount),
+                    "status": TransactionStatus.SUCCESS,
+                    "balance_after": new_balance,
+                })
+                audit_log_rows.append({
+                    "wallet_id": item.wallet_id,
+                    "action": f"BALANCE_{item.operation_type.value}",
+                    "old_balance": wallet[1],
+                    "new_balance": new_balance,
+                })
+                wallet[1] = new_balance
+                results.append(BatchOperationResultSchema(
+                    wallet_id=item.wallet_id,
+                    status_code=status.HTTP_200_OK,
+                    new_balance=new_balance
+                ))
+
+            failed = any(
+                result.status_code != status.HTTP_200_OK
+                for result in results
+            )
+            if all_or_nothing and failed:
+                # Ничего не записано: выход из транзакции снимет блокировки
+                for result in results:
+                    if result.status_code == status.HTTP_200_OK:
+                        result.status_code = status.HTTP_409_CONFLICT
+                        result.detail = "Batch rolled back"
+                        result.new_balance = None
+                return False, results
+
+            if not transaction_rows:
+                return True, results
+
+            # 3. Set-based запись изменений
+            touched = sorted({row["wallet_id"] for row in transaction_rows})
+            new_balances = select(
+                _unnest("wallet_ids", touched, PG_UUID(as_uuid=True))
+                .label("id"),
+                _unnest(
+                    "balances",
+                    [state[wallet_id][1] for wallet_id in touched],
+                    BigInteger
+                ).label("balance")
+            ).subquery("new_balances")
+            await db.execute(
+                update(wallets)
+                .where(wallets.c.id == new_balances.c.id)
+                .values(balance=new_balances.c.balance, updated_at=func.now())
+            )
+            await db.execute(_insert_rows(Transaction, transaction_rows))
+            await db.execute(_insert_rows(WalletAuditLog, audit_log_rows))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Database commit failed: %s", e)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Operation failed"
+        )
+
+    for row in transaction_rows:
+        wallet_operations_total.inc(operation_type=row["type"].value)
+    for wallet_id in touched:
+        await wallet_cache.invalidate(wallet_id)
+    return True, results
+
+
+operation_batcher = OperationBatcher(
+    apply_batch=apply_operations_locked,
+    window_ms=settings.OPERATION_BATCH_WINDOW_MS,
+    max_size=settings.OPERATION_BATCH_MAX_SIZE
+)
+
+
+async def _apply_operation(
+    db: AsyncSession,
+    wallet_uuid: UUID,
+    operation: WalletOperationSchema,
+    idempotency_key: str | None
+) -> int:
+    # Операции с ключом идемпотентности не группируются: дубликат ключа
+    # не должен ронять весь пакет
+    if settings.OPERATION_BATCHING_ENABLED and idempotency_key is None:
+        return await operation_batcher.submit(db, wallet_uuid, operation)
+    # Core-слой выполняет операции только одним запросом
+    if settings.OPERATION_SINGLE_STATEMENT or core_enabled():
+        return await apply_operation_atomic(
+            db, wallet_uuid, operation, idempotency_key
+        )
+    return await apply_operation_locked(
+        db, wallet_uuid, operation, idempotency_key
+    )
+
+
+async def apply_operation(
+    db: AsyncSession,
+    wallet_uuid: UUID,
+    operation: WalletOperationSchema,
+    idempotency_key: str | None = None
+) -> int:
+    """Выполняет операцию способом, выбранным в настройках."""
+    if idempotency_key is None:
+        try:
+            new_balance = await _apply_operation(
+                db, wallet_uuid, operation, None
+            )
+        except IntegrityError as e:
+            logger.error("Database commit failed: %s", e)
+            raise HTTPException(
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Operation failed"
+            )
+        wallet_operations_total.inc(
+            operation_type=operation.operation_type.value
+        )
+        await wallet_cache.invalidate(wallet_uuid)
+        return new_balance
+
+    # Повтор уже выполненной операции отвечаем без блокировки кошелька
+    result = await find_operation_result(db, idempotency_key)
+    if result is not None:
+        return replay_operation_result(
+            result, idempotency_key, wallet_uuid, operation
+        )
+
+    started_at = datetime.now(timezone.utc)
+    try:
+        new_balance = await _apply_operation(
+            db, wallet_uuid, operation, idempotency_key
+        )
+    except IntegrityError as e:
+        # Конкурентный запрос с тем же ключом успел закоммитить раньше
+        result = await find_operation_result(db, idempotency_key)
+        if result is None:
+            logger.error("Database commit failed: %s", e)
+            raise HTTPException(
+                status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Operation failed"
+            )
+        return replay_operation_result(
+            result, idempotency_key, wallet_uuid, operation
+        )
+
+    wallet_operations_total.inc(operation_type=operation.operation_type.value)
+    await wallet_cache.invalidate(wallet_uuid)
+    remember_operation_result(
+        idempotency_key, wallet_uuid, operation, new_balance, started_at
+    )
+    return new_balance
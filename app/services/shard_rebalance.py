@@ -0,0 +1,182 @@
+"""
+Перенос кошельков на шарды, которым они принадлежат по кольцу хешей.
+
+Нужен после изменения SHARD_URLS: каждый шард просматривается чанками
+кошельков по id, и кошельки чужого шарда переносятся вместе со всеми
+строками своих таблиц (транзакции, аудит, ключи идемпотентности,
+снимки, чекпоинты сверки).
+
+Перенос чанка: строки кошельков на источнике блокируются FOR UPDATE,
+строки копируются на целевой шард (INSERT ... ON CONFLICT DO NOTHING)
+страницами по первичному ключу, чтобы история кошельков не читалась в
+память целиком, и его транзакция коммитится, затем строки удаляются на
+источнике. Если процесс прервется между коммитами, строки останутся на
+обоих шардах; повторный запуск докопирует недостающее и удалит источник.
+Снимки балансов перенесенных кошельков приводятся к срезу снимков
+целевого шарда (см. rebase_snapshots).
+
+Перенос выполняется в окно обслуживания: приложение с новым SHARD_URLS
+ищет еще не перенесенные кошельки на новом шарде и отвечает 404, а с
+прежним - не находит уже перенесенные. Запросы к кошелькам чанка ждут
+окончания его копирования.
+"""
+import time
+from dataclasses import dataclass, field
+from uuid import UUID
+
+from sqlalchemy import (
+    Table,
+    any_,
+    bindparam,
+    delete,
+    func,
+    literal,
+    select,
+    tuple_
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID, insert
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.sharding import ShardRouter
+from app.database import Base
+from app.models import Wallet, WalletBalanceSnapshot
+from app.services.balance_snapshots import SNAPSHOT_LOCK_KEY, rebase_snapshots
+
+
+@dataclass
+class RebalanceReport:
+    wallets: int = 0
+    # (исходный шард, целевой шард) -> перенесено кошельков
+    moved: dict[tuple[str, str], int] = field(default_factory=dict)
+    elapsed_seconds: float = 0.0
+
+
+def _wallet_tables() -> list[Table]:
+    """Таблица кошельков и таблицы со ссылкой на нее, в порядке FK"""
+    return [
+        table for table in Base.metadata.sorted_tables
+        if table is Wallet.__table__ or "wallet_id" in table.c
+    ]
+
+
+def _wallet_filter(table: Table, wallet_ids: list[UUID]):
+    column = table.c.id if table is Wallet.__table__ else table.c.wallet_id
+    return column == any_(bindparam(
+        "wallet_ids", value=wallet_ids, type_=ARRAY(PG_UUID(as_uuid=True))
+    ))
+
+
+async def _copy_rows(
+    source: AsyncConnection,
+    target: AsyncConnection,
+    wallet_ids: list[UUID],
+    batch_size: int
+):
+    """Копирует строки кошельков потаблично, keyset-страницами по PK"""
+    for table in _wallet_tables():
+        key = list(table.primary_key.columns)
+        query = (
+            select(table)
+            .where(_wallet_filter(table, wallet_ids))
+            .order_by(*key)
+            .limit(batch_size)
+        )
+        page = query
+        while True:
+            rows = (await source.execute(page)).mappings().all()
+            if rows:
+                await target.execute(
+                    insert(table).on_conflict_do_nothing(),
+                    [dict(row) for row in rows]
+                )
+            if len(rows) < batch_size:
+                break
+            page = query.where(tuple_(*key) > tuple_(*(
+                literal(rows[-1][column.name], column.type)
+                for column in key
+            )))
+
+
+async def move_wallets(
+    source_engine: AsyncEngine,
+    target_engine: AsyncEngine,
+    wallet_ids: list[UUID],
+    batch_size: int = settings.SHARD_REBALANCE_COPY_BATCH_SIZE
+):
+    """Переносит кошельки со всеми их строками на другой шард"""
+    wallets = Wallet.__table__
+    async with source_engine.begin() as source:
+        # Операции над кошельками на источнике ждут окончания переноса
+        await source.execute(
+            select(wallets.c.id)
+            .where(_wallet_filter(wallets, wallet_ids))
+            .order_by(wallets.c.id)
+            .with_for_update()
+        )
+        async with target_engine.begin() as target:
+            # Срез снимков целевого шарда не сдвинется до коммита
+            await target.execute(
+                select(func.pg_advisory_xact_lock(SNAPSHOT_LOCK_KEY))
+            )
+            snapshot_cutoff = await target.scalar(
+                select(func.max(WalletBalanceSnapshot.as_of))
+            )
+            await _copy_rows(source, target, wallet_ids, batch_size)
+            await rebase_snapshots(target, wallet_ids, snapshot_cutoff)
+
+        for table in reversed(_wallet_tables()):
+            await source.execute(
+                delete(table).where(_wallet_filter(table, wallet_ids))
+            )
+
+
+async def rebalance_shards(
+    router: ShardRouter,
+    chunk_size: int = settings.SHARD_REBALANCE_CHUNK_SIZE,
+    dry_run: bool = False,
+    copy_batch_size: int = settings.SHARD_REBALANCE_COPY_BATCH_SIZE
+) -> RebalanceReport:
+    """Переносит все кошельки, лежащие не на своем шарде"""
+    started = time.perf_counter()
+    report = RebalanceReport()
+    wallets = Wallet.__table__
+
+    for source, source_engine in router.engines.items():
+        after = None
+        while True:
+            query = select(wallets.c.id).order_by(wallets.c.id)
+            if after is not None:
+                query = query.where(wallets.c.id > after)
+            async with source_engine.connect() as conn:
+                wallet_ids = list(
+                    await conn.scalars(query.limit(chunk_size))
+                )
+            if not wallet_ids:
+                break
+            after = wallet_ids[-1]
+            report.wallets += len(wallet_ids)
+
+            for target, target_ids in router.group(wallet_ids).items():
+                if target == source:
+                    continue
+                if not dry_run:
+                    await move_wallets(
+                        source_engine,
+                        router.engines[target],
+                        target_ids,
+                        copy_batch_size
+                    )
+                logger.info(
+                    "%s %s wallets from shard %s to shard %s",
+                    "Would move" if dry_run else "Moved",
+                    len(target_ids),
+                    source,
+                    target
+                )
+                key = (source, target)
+                report.moved[key] = report.moved.get(key, 0) + len(target_ids)
+
+    report.elapsed_seconds = time.perf_counter() - started
+    return report
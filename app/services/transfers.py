@@ -0,0 +1,149 @@
+"""
+Переводы между кошельками.
+
+Перевод - одна транзакция БД: обе строки кошельков блокируются одним
+SELECT ... FOR UPDATE в порядке id, поэтому встречные переводы между
+одними и теми же кошельками ждут друг друга, а не взаимоблокируются.
+В журнал пишется пара записей TRANSFER_OUT/TRANSFER_IN с общим
+transfer_id, сумма которых со знаком равна нулю.
+"""
+from fastapi import HTTPException, status
+from sqlalchemy import (
+    BigInteger,
+    any_,
+    bindparam,
+    column,
+    insert,
+    select,
+    update,
+    values
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+
+from app.core.logger import logger
+from app.core.metrics import (
+    db_locking_statement_seconds,
+    wallet_operations_total
+)
+from app.core.uuid7 import uuid7
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet,
+    WalletAuditLog
+)
+from app.schemas import (
+    OperationTypeSchema,
+    TransferRequestSchema,
+    TransferResponseSchema,
+    WalletOperationSchema
+)
+from app.services.operations import validate_operation
+from app.services.wallet_cache import wallet_cache
+
+
+async def apply_transfer(
+    db: AsyncSession,
+    transfer: TransferRequestSchema
+) -> TransferResponseSchema:
+    """Списывает amount с from_wallet_id и зачисляет на to_wallet_id."""
+    wallets = Wallet.__table__
+    amount = int(transfer.amount)
+    transfer_id = uuid7()
+    legs = (
+        (
+            transfer.from_wallet_id,
+            OperationTypeSchema.WITHDRAW,
+            TransactionType.TRANSFER_OUT
+        ),
+        (
+            transfer.to_wallet_id,
+            OperationTypeSchema.DEPOSIT,
+            TransactionType.TRANSFER_IN
+        ),
+    )
+
+    try:
+        async with db.begin():
+            # 1. Блокируем оба кошелька в детерминированном порядке
+            with db_locking_statement_seconds.time(operation="transfer"):
+                rows = (await db.execute(
+                    select(wallets.c.id, wallets.c.status, wallets.c.balance)
+                    .where(wallets.c.id == any_(bindparam(
+                        "wallet_ids",
+                        value=sorted(leg[0] for leg in legs),
+                        type_=ARRAY(PG_UUID(as_uuid=True))
+                    )))
+                    .order_by(wallets.c.id)
+                    .with_for_update()
+                )).all()
+            state = {row.id: row for row in rows}
+
+            # 2. Валидации: списание, затем зачисление
+            new_balances = {}
+            for wallet_id, operation_type, _ in legs:
+                wallet = state.get(wallet_id)
+                new_balances[wallet_id] = validate_operation(
+                    wallet_id,
+                    wallet.status if wallet else None,
+                    wallet.balance if wallet else None,
+                    WalletOperationSchema(
+                        operation_type=operation_type, amount=amount
+                    )
+                )
+
+            # 3. Парные записи журнала и новые балансы
+            balances = values(
+                column("id", PG_UUID(as_uuid=True)),
+                column("balance", BigInteger),
+                name="new_balances"
+            ).data(sorted(new_balances.items()))
+            await db.execute(
+                update(wallets)
+                .where(wallets.c.id == balances.c.id)
+                .values(balance=balances.c.balance, updated_at=func.now())
+            )
+            await db.execute(insert(Transaction.__table__).values([
+                {
+                    "wallet_id": wallet_id,
+                    "type": transaction_type,
+                    "amount": amount,
+                    "status": TransactionStatus.SUCCESS,
+                    "balance_after": new_balances[wallet_id],
+                    "transfer_id": transfer_id,
+                }
+                for wallet_id, _, transaction_type in legs
+            ]))
+            await db.execute(insert(WalletAuditLog.__table__).values([
+                {
+                    "wallet_id": wallet_id,
+                    "action": f"BALANCE_{transaction_type.value}",
+                    "old_balance": state[wallet_id].balance,
+                    "new_balance": new_balances[wallet_id],
+                }
+                for wallet_id, _, transaction_type in legs
+            ]))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Database commit failed: %s", e)
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Operation failed"
+        )
+
+    for wallet_id, _, transaction_type in legs:
+        wallet_operations_total.inc(operation_type=transaction_type.value)
+        await wallet_cache.invalidate(wallet_id)
+
+    return TransferResponseSchema(
+        transfer_id=transfer_id,
+        from_wallet_id=transfer.from_wallet_id,
+        to_wallet_id=transfer.to_wallet_id,
+        amount=amount,
+        from_balance=new_balances[transfer.from_wallet_id],
+        to_balance=new_balances[transfer.to_wallet_id]
+    )
@@ -0,0 +1,127 @@
+"""
+Read-through кэш ответов GET /wallets/{id}.
+
+Хранит сериализованный WalletResponseSchema. Записи удаляются после
+коммита операций над кошельком и перезаписываются после смены статуса.
+
+Чтение берет version() до запроса к БД и передает его в set(): если
+между ними кошелек инвалидировали, устаревший ответ не сохраняется.
+Кэш в памяти процесса не видит инвалидаций других воркеров, поэтому
+при нескольких воркерах ответ может отставать до WALLET_CACHE_TTL_SECONDS.
+"""
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import TypeAdapter
+from sqlalchemy.engine import Row
+from typing_extensions import TypedDict
+
+from app.core.cache import CacheBackend, create_cache_backend
+from app.core.logger import logger
+from app.core.metrics import registry
+from app.models import WalletStatus
+from app.schemas import WalletResponseSchema
+
+
+class WalletRow(TypedDict):
+    """Строка wallets с полями в порядке WalletResponseSchema."""
+    status: WalletStatus
+    id: UUID
+    balance: int
+    created_at: datetime
+    updated_at: datetime | None
+
+
+# Сериализатор строится один раз; dump_json не валидирует данные
+wallet_row_adapter = TypeAdapter(WalletRow)
+
+
+def serialize_wallet(wallet) -> bytes:
+    """JSON-представление кошелька (ORM-объект, dict или строка запроса)."""
+    if isinstance(wallet, Row):
+        # Те же байты, что и через WalletResponseSchema, без валидации
+        return wallet_row_adapter.dump_json(wallet._asdict())
+    schema = WalletResponseSchema.model_validate(wallet)
+    return schema.model_dump_json().encode()
+
+
+class WalletCache:
+    """Кэш кошельков со счетчиками попаданий и промахов."""
+
+    def __init__(self, backend: CacheBackend | None):
+        self.backend = backend
+        self.hits = 0
+        self.misses = 0
+
+    async def get(self, wallet_id: UUID) -> bytes | None:
+        if self.backend is None:
+            return None
+
+        try:
+            payload = await self.backend.get(str(wallet_id))
+        except Exception as e:
+            # Недоступный кэш не должен ломать чтение из БД
+            logger.warning("Wallet cache get failed: %s", e)
+            payload = None
+
+        if payload is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return payload
+
+    async def version(self, wallet_id: UUID) -> int | None:
+        """Поколение записи; None - кэш выключен или недоступен"""
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.generation(str(wallet_id))
+        except Exception as e:
+            logger.warning("Wallet cache version failed: %s", e)
+            return None
+
+    async def set(
+        self, wallet_id: UUID, payload: bytes, version: int | None
+    ):
+        """Сохраняет ответ, если поколение записи все еще version"""
+        if self.backend is None or version is None:
+            return
+        try:
+            await self.backend.set(str(wallet_id), payload, version)
+        except Exception as e:
+            logger.warning("Wallet cache set failed: %s", e)
+
+    async def invalidate(self, wallet_id: UUID) -> int | None:
+        """Удаляет запись и возвращает ее новое поколение"""
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.delete(str(wallet_id))
+        except Exception as e:
+            logger.warning("Wallet cache invalidation failed: %s", e)
+            return None
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "backend": type(self.backend).__name__ if self.backend else None,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hits / total if total else 0.0,
+        }
+
+
+wallet_cache = WalletCache(create_cache_backend())
+
+registry.gauge(
+    "wallet_cache_hits_total",
+    "Wallet cache hits",
+    lambda: wallet_cache.hits,
+    type_="counter",
+)
+registry.gauge(
+    "wallet_cache_misses_total",
+    "Wallet cache misses",
+    lambda: wallet_cache.misses,
+    type_="counter",
+)
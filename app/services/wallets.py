@@ -0,0 +1,162 @@
+"""
+Создание и пакетное чтение кошельков в обход ORM-объектов.
+
+Создание обходится без повторного чтения строки после INSERT.
+Один кошелек - INSERT ... RETURNING. Пакет - один
+INSERT ... SELECT unnest(:ids) RETURNING, а начиная с
+WALLET_BATCH_COPY_THRESHOLD кошельков - COPY через asyncpg: значения
+по умолчанию подставляются приложением, created_at берется из now()
+той же транзакции, как и при обычной вставке.
+
+Пакетное чтение возвращает строки запроса: при
+WALLET_FAST_SERIALIZATION они сериализуются в JSON без валидации.
+"""
+from typing import Iterator
+from uuid import UUID
+
+from asyncpg.exceptions import UniqueViolationError
+from fastapi import HTTPException, status
+from pydantic import TypeAdapter
+from sqlalchemy import (
+    BigInteger,
+    any_,
+    bindparam,
+    insert,
+    literal,
+    select
+)
+from sqlalchemy.dialects.postgresql import ARRAY, UUID as PG_UUID
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql import func
+from typing_extensions import TypedDict
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.models import Wallet, WalletStatus
+from app.repository import WALLET_COLUMNS, query_executor
+from app.schemas import WalletLookupStatusSchema
+from app.services.wallet_cache import WalletRow, serialize_wallet
+
+
+class WalletLookupResult(TypedDict):
+    """Элемент ответа POST /wallets/lookup (WalletLookupResultSchema)."""
+    id: UUID
+    result: WalletLookupStatusSchema
+    wallet: WalletRow | None
+
+
+class WalletLookupResponse(TypedDict):
+    results: list[WalletLookupResult]
+
+
+lookup_response_adapter = TypeAdapter(WalletLookupResponse)
+
+CREATE_WALLET_STATEMENT = insert(Wallet.__table__).returning(*WALLET_COLUMNS)
+
+CREATE_WALLETS_STATEMENT = (
+    insert(Wallet.__table__)
+    .from_select(
+        ["id", "balance", "status"],
+        select(
+            func.unnest(bindparam("ids", type_=ARRAY(PG_UUID(as_uuid=True)))),
+            literal(0, BigInteger),
+            literal(WalletStatus.ACTIVE, Wallet.status.type)
+        )
+    )
+    .returning(*WALLET_COLUMNS)
+)
+
+
+async def insert_wallet(db: AsyncSession, wallet_id: UUID) -> dict:
+    """Новый кошелек за один запрос, без refresh после коммита"""
+    row = (await db.execute(CREATE_WALLET_STATEMENT, {"id": wallet_id})).one()
+    await db.commit()
+    return dict(row._mapping)
+
+
+async def _copy_wallets(db: AsyncSession, ids: list[UUID]) -> list[dict]:
+    created_at = await db.scalar(select(func.now()))
+    connection = await db.connection()
+    raw_connection = await connection.get_raw_connection()
+    await raw_connection.driver_connection.copy_records_to_table(
+        Wallet.__tablename__,
+        records=[
+            (wallet_id, 0, WalletStatus.ACTIVE.name, created_at)
+            for wallet_id in ids
+        ],
+        columns=("id", "balance", "status", "created_at")
+    )
+    return [
+        {
+            "id": wallet_id,
+            "balance": 0,
+            "status": WalletStatus.ACTIVE,
+            "created_at": created_at,
+            "updated_at": None,
+        }
+        for wallet_id in ids
+    ]
+
+
+async def insert_wallets(
+    db: AsyncSession,
+    ids: list[UUID],
+    commit: bool = True
+) -> list[dict]:
+    """
+    Создает кошельки с заданными id в одной транзакции. commit=False -
+    транзакцию коммитит вызывающий (пакет на нескольких шардах).
+    """
+    try:
+        if len(ids) >= settings.WALLET_BATCH_COPY_THRESHOLD:
+            wallets = await _copy_wallets(db, ids)
+        else:
+            wallets = [
+                dict(row._mapping)
+                for row in await db.execute(
+                    CREATE_WALLETS_STATEMENT, {"ids": ids}
+                )
+            ]
+        if commit:
+            await db.commit()
+    except (IntegrityError, UniqueViolationError):
+        await db.rollback()
+        logger.warning("Batch contains existing wallet IDs")
+        raise HTTPException(
+            status.HTTP_409_CONFLICT,
+            detail="Wallet already exists"
+        )
+    except Exception as e:
+        logger.error("Error creating wallets: %s", e)
+        await db.rollback()
+        raise HTTPException(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Could not create wallets"
+        )
+    return wallets
+
+
+async def fetch_wallets(
+    db: AsyncSession,
+    ids: list[UUID]
+) -> dict[UUID, dict]:
+    """Кошельки с данными id одним запросом WHERE id = ANY(:ids)"""
+    executor = await query_executor(db)
+    rows = await executor.execute(
+        select(*WALLET_COLUMNS)
+        .where(Wallet.__table__.c.id == any_(bindparam(
+            "ids", value=list(set(ids)), type_=ARRAY(PG_UUID(as_uuid=True))
+        )))
+    )
+    return {row.id: dict(row._mapping) for row in rows}
+
+
+def stream_wallets(wallets: list[dict]) -> Iterator[bytes]:
+    """NDJSON созданных кошельков чанками по WALLET_BATCH_CHUNK_SIZE"""
+    chunk_size = settings.WALLET_BATCH_CHUNK_SIZE
+    for start in range(0, len(wallets), chunk_size):
+        yield b"".join(
+            serialize_wallet(wallet) + b"\n"
+            for wallet in wallets[start:start + chunk_size]
+        )
@@ -0,0 +1,69 @@
+"""
+Сравнение двух JSON-результатов benchmarks.run.
+
+    python -m benchmarks.compare baseline.json current.json --threshold 0.1
+
+Код возврата 1, если rps упал или p95/p99 выросли больше порога.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+# (путь к значению, True если больше - лучше)
+COMPARED_FIELDS = (
+    (("rps",), True),
+    (("latency_ms", "p50"), False),
+    (("latency_ms", "p95"), False),
+    (("latency_ms", "p99"), False),
+    (("locking", "avg_ms"), False),
+)
+# Поля, регрессия которых роняет сравнение
+GATED_FIELDS = {"rps", "latency_ms.p95", "latency_ms.p99"}
+
+
+def _get(result: dict, path: tuple[str, ...]) -> float:
+    for key in path:
+        result = result[key]
+    return result
+
+
+def compare(baseline: dict, current: dict, threshold: float) -> list[str]:
+    """Печатает таблицу изменений и возвращает список регрессий"""
+    regressions = []
+    print(f"{'metric':<20}{'baseline':>12}{'current':>12}{'change':>10}")
+    for path, higher_is_better in COMPARED_FIELDS:
+        name = ".".join(path)
+        old, new = _get(baseline, path), _get(current, path)
+        change = (new - old) / old if old else 0.0
+        print(f"{name:<20}{old:>12.2f}{new:>12.2f}{change:>+10.1%}")
+
+        worse = -change if higher_is_better else change
+        if name in GATED_FIELDS and worse > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare benchmark runs")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=0.1)
+    args = parser.parse_args(argv)
+
+    baseline = json.loads(args.baseline.read_text())
+    current = json.loads(args.current.read_text())
+    if baseline["scenario"] != current["scenario"]:
+        print("Warning: comparing different scenarios")
+
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(
+            f"Regression over {args.threshold:.0%}: {', '.join(regressions)}"
+        )
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+"""
+Накладные расходы ORM и Core-слоя (app.repository) на один запрос.
+
+    python -m benchmarks.query_layer --iterations 2000 --create-schema
+
+Каждая итерация открывает новую сессию, как get_db на запрос, и
+выполняет путь эндпоинта без HTTP: чтение кошелька, смену статуса и
+DEPOSIT. Печатаются wall- и CPU-время процесса на запрос; время БД у
+путей одинаковое, разница в CPU - это стоимость слоя запросов.
+Использует DATABASE_URL: запускать против отдельной базы.
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable
+
+from app import repository
+from app.core.config import settings
+from app.database import SessionLocal, close_db
+from app.models import Wallet, WalletStatus
+from app.schemas import OperationTypeSchema, WalletOperationSchema
+from app.services.operations import (
+    apply_operation_atomic,
+    apply_operation_locked
+)
+from app.services.wallet_cache import serialize_wallet
+from benchmarks.runner import create_schema
+
+DEPOSIT = WalletOperationSchema(
+    operation_type=OperationTypeSchema.DEPOSIT, amount=1
+)
+STATUSES = (WalletStatus.FROZEN, WalletStatus.ACTIVE)
+
+
+async def orm_get(db, wallet_id, i):
+    serialize_wallet(await db.get(Wallet, wallet_id))
+
+
+async def core_get(db, wallet_id, i):
+    serialize_wallet(await repository.get_wallet(db, wallet_id))
+
+
+async def orm_set_status(db, wallet_id, i):
+    # Чередование статусов: ORM не пишет неизмененные атрибуты
+    wallet = await db.get(Wallet, wallet_id)
+    wallet.status = STATUSES[i % 2]
+    await db.commit()
+    serialize_wallet(wallet)
+
+
+async def core_set_status(db, wallet_id, i):
+    serialize_wallet(await repository.set_wallet_status(
+        db, wallet_id, STATUSES[i % 2]
+    ))
+
+
+async def locked_operation(db, wallet_id, i):
+    await apply_operation_locked(db, wallet_id, DEPOSIT)
+
+
+async def atomic_operation(db, wallet_id, i):
+    await apply_operation_atomic(db, wallet_id, DEPOSIT)
+
+
+# (операция, путь, слой запросов, функция)
+CASES: tuple[tuple[str, str, str, Callable[..., Awaitable]], ...] = (
+    ("get_wallet", "orm", "orm", orm_get),
+    ("get_wallet", "core", "core", core_get),
+    ("set_status", "orm", "orm", orm_set_status),
+    ("set_status", "core", "core", core_set_status),
+    ("operation", "orm_locked", "orm", locked_operation),
+    ("operation", "orm_statement", "orm", atomic_operation),
+    ("operation", "core", "core", atomic_operation),
+)
+
+
+async def measure(func, wallet_id, iterations: int) -> tuple[float, float]:
+    """Wall и CPU, микросекунды на запрос"""
+    wall, cpu = time.perf_counter(), time.process_time()
+    for i in range(iterations):
+        async with SessionLocal() as db:
+            await func(db, wallet_id, i)
+    return (
+        (time.perf_counter() - wall) / iterations * 1_000_000,
+        (time.process_time() - cpu) / iterations * 1_000_000,
+    )
+
+
+async def main(args: argparse.Namespace):
+    if args.create_schema:
+        await create_schema()
+
+    async with SessionLocal() as db:
+        wallet = Wallet()
+        db.add(wallet)
+        await db.commit()
+        wallet_id = wallet.id
+
+    print(f"{'operation':<12}{'path':<16}{'wall us':>10}{'cpu us':>10}")
+    try:
+        for operation, path, layer, func in CASES:
+            settings.DB_QUERY_LAYER = layer
+            # Прогрев: пул соединений и кэши компиляции/prepared statements
+            await measure(func, wallet_id, args.warmup)
+            wall, cpu = await measure(func, wallet_id, args.iterations)
+            print(f"{operation:<12}{path:<16}{wall:>10.1f}{cpu:>10.1f}")
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query layer benchmark")
+    parser.add_argument("--iterations", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="create tables via metadata.create_all before the run"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,123 @@
+"""
+Нагрузочный прогон Wallet API.
+
+    python -m benchmarks.run hot_wallet --concurrency 50 --requests 5000
+    python -m benchmarks.run mixed --target uvicorn --workers 4
+    python -m benchmarks.run uniform --target url --url http://localhost:8000
+
+Приложение использует DATABASE_URL (для asgi/uvicorn), поэтому прогон
+должен идти против отдельной базы, а не рабочей. Результат печатается
+и сохраняется в JSON (--output) для сравнения через benchmarks.compare.
+"""
+import argparse
+import asyncio
+import json
+from pathlib import Path
+
+from benchmarks.runner import (
+    asgi_client,
+    create_schema,
+    run_benchmark,
+    url_client,
+    uvicorn_client
+)
+from benchmarks.scenarios import SCENARIOS
+
+DEFAULT_OUTPUT_DIR = Path("benchmarks/results")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Wallet API load test")
+    parser.add_argument(
+        "scenario",
+        choices=sorted(SCENARIOS),
+        help="; ".join(
+            f"{name}: {scenario.description}"
+            for name, scenario in sorted(SCENARIOS.items())
+        )
+    )
+    parser.add_argument(
+        "--target", choices=("asgi", "uvicorn", "url"), default="asgi"
+    )
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=None,
+        help="stop after this many seconds even if requests remain"
+    )
+    parser.add_argument("--warmup", type=int, default=200)
+    parser.add_argument("--wallets", type=int, default=100)
+    parser.add_argument("--read-ratio", type=float, default=0.8)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="create tables via metadata.create_all before the run"
+    )
+    parser.add_argument(
+        "--output",
+        type=Path,
+        default=None,
+        help="JSON file (default: benchmarks/results/<scenario>-<commit>.json)"
+    )
+    return parser.parse_args(argv)
+
+
+def _client(args: argparse.Namespace):
+    if args.target == "uvicorn":
+        return uvicorn_client(args.port, args.workers)
+    if args.target == "url":
+        return url_client(args.url)
+    return asgi_client()
+
+
+async def main(args: argparse.Namespace) -> dict:
+    if args.create_schema:
+        await create_schema()
+
+    scenario = SCENARIOS[args.scenario](
+        wallets=args.wallets, read_ratio=args.read_ratio, seed=args.seed
+    )
+    async with _client(args) as client:
+        return await run_benchmark(
+            client,
+            scenario,
+            target=args.target,
+            concurrency=args.concurrency,
+            requests=args.requests,
+            duration=args.duration,
+            warmup=args.warmup
+        )
+
+
+def print_result(result: dict):
+    latency = result["latency_ms"]
+    locking = result["locking"]
+    print(
+        f"{result['scenario']} [{result['target']}] "
+        f"{result['requests']} requests, {result['errors']} errors\n"
+        f"  rps      {result['rps']:.1f}\n"
+        f"  latency  p50 {latency['p50']:.2f} ms  "
+        f"p95 {latency['p95']:.2f} ms  p99 {latency['p99']:.2f} ms\n"
+        f"  locking  {locking['count']} statements, "
+        f"avg {locking['avg_ms']:.2f} ms\n"
+        f"  statuses {result['status_codes']}"
+    )
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    result = asyncio.run(main(args))
+    print_result(result)
+
+    output = args.output or DEFAULT_OUTPUT_DIR / (
+        f"{result['scenario']}-{result['commit'] or 'local'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2))
+    print(f"Saved to {output}")
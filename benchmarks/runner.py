@@ -0,0 +1,237 @@
+"""
+Запуск нагрузки и сбор результатов.
+
+Цели:
+asgi    - приложение в том же процессе через httpx.ASGITransport;
+uvicorn - настоящий uvicorn в дочернем процессе;
+url     - уже запущенный сервер.
+
+Время ожидания блокировок и выдачи соединений берется из /metrics
+как разница до и после прогона. При нескольких воркерах uvicorn
+/metrics отражает только тот процесс, который ответил на запрос.
+"""
+import asyncio
+import subprocess
+import sys
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+
+import httpx
+
+from benchmarks.scenarios import Scenario
+
+SCRAPED_METRICS = (
+    "db_locking_statement_seconds_sum",
+    "db_locking_statement_seconds_count",
+    "db_pool_checkout_wait_seconds_sum",
+    "db_pool_checkout_wait_seconds_count",
+)
+STARTUP_TIMEOUT = 30.0
+
+
+def percentile(sorted_values: list[float], q: float) -> float:
+    """Percentile по методу nearest-rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(sorted_values))), 1)
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def parse_metrics(text: str) -> dict[str, float]:
+    """Суммирует значения нужных метрик по всем наборам меток"""
+    values = dict.fromkeys(SCRAPED_METRICS, 0.0)
+    for line in text.splitlines():
+        if not line or line.startswith("#"):
+            continue
+        name, _, value = line.rpartition(" ")
+        name = name.split("{", 1)[0]
+        if name in values:
+            values[name] += float(value)
+    return values
+
+
+async def scrape_metrics(client: httpx.AsyncClient) -> dict[str, float]:
+    try:
+        response = await client.get("/metrics")
+        response.raise_for_status()
+    except httpx.HTTPError:
+        return dict.fromkeys(SCRAPED_METRICS, 0.0)
+    return parse_metrics(response.text)
+
+
+def _wait_summary(before: dict, after: dict, prefix: str) -> dict:
+    count = after[f"{prefix}_count"] - before[f"{prefix}_count"]
+    total = after[f"{prefix}_sum"] - before[f"{prefix}_sum"]
+    return {
+        "count": int(count),
+        "total_seconds": total,
+        "avg_ms": total / count * 1000 if count else 0.0,
+    }
+
+
+async def create_schema():
+    """Создает таблицы в базе из DATABASE_URL (как в tests/conftest.py)"""
+    from app.database import Base, engine
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@asynccontextmanager
+async def asgi_client():
+    from app.main import app
+
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=app),
+        base_url="http://benchmark"
+    ) as client:
+        yield client
+
+
+@asynccontextmanager
+async def url_client(url: str):
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=None)
+    async with httpx.AsyncClient(base_url=url, limits=limits) as client:
+        yield client
+
+
+async def _wait_for_server(url: str, process: subprocess.Popen):
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    async with httpx.AsyncClient(base_url=url) as client:
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise RuntimeError("uvicorn exited during startup")
+            try:
+                await client.get("/")
+                return
+            except httpx.TransportError:
+                await asyncio.sleep(0.2)
+    raise RuntimeError(f"uvicorn did not start within {STARTUP_TIMEOUT}s")
+
+
+@asynccontextmanager
+async def uvicorn_client(port: int, workers: int):
+    process = subprocess.Popen([
+        sys.executable, "-m", "uvicorn", "app.main:app",
+        "--host", "127.0.0.1",
+        "--port", str(port),
+        "--workers", str(workers),
+        "--log-level", "warning",
+    ])
+    url = f"http://127.0.0.1:{port}"
+    try:
+        await _wait_for_server(url, process)
+        async with url_client(url) as client:
+            yield client
+    finally:
+        process.terminate()
+        process.wait()
+
+
+async def run_load(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    concurrency: int,
+    requests: int,
+    duration: float | None
+) -> tuple[list[float], Counter, float]:
+    """
+    Гоняет concurrency виртуальных пользователей, пока не будет выполнено
+    requests запросов или не истечет duration секунд.
+    """
+    latencies: list[float] = []
+    statuses: Counter = Counter()
+    remaining = requests
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+
+    async def worker():
+        nonlocal remaining
+        while remaining > 0:
+            if deadline is not None and time.perf_counter() >= deadline:
+                return
+            remaining -= 1
+            request_started = time.perf_counter()
+            try:
+                response = await scenario.request(client)
+                statuses[str(response.status_code)] += 1
+            except httpx.HTTPError as e:
+                statuses[type(e).__name__] += 1
+            latencies.append(time.perf_counter() - request_started)
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, statuses, time.perf_counter() - started
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run_benchmark(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    target: str,
+    concurrency: int,
+    requests: int,
+    duration: float | None,
+    warmup: int
+) -> dict:
+    await scenario.setup(client)
+    if warmup:
+        await run_load(client, scenario, concurrency, warmup, None)
+
+    before = await scrape_metrics(client)
+    latencies, statuses, elapsed = await run_load(
+        client, scenario, concurrency, requests, duration
+    )
+    after = await scrape_metrics(client)
+
+    latencies.sort()
+    errors = sum(
+        count for code, count in statuses.items()
+        if not code.startswith("2")
+    )
+    to_ms = 1000
+    return {
+        "scenario": scenario.name,
+        "target": target,
+        "commit": _git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "config": {
+            "concurrency": concurrency,
+            "requests": requests,
+            "duration": duration,
+            "warmup": warmup,
+            "wallets": scenario.wallets,
+            "read_ratio": scenario.read_ratio,
+        },
+        "requests": len(latencies),
+        "errors": errors,
+        "status_codes": dict(statuses),
+        "elapsed_seconds": elapsed,
+        "rps": len(latencies) / elapsed if elapsed else 0.0,
+        "latency_ms": {
+            "p50": percentile(latencies, 50) * to_ms,
+            "p95": percentile(latencies, 95) * to_ms,
+            "p99": percentile(latencies, 99) * to_ms,
+            "max": latencies[-1] * to_ms if latencies else 0.0,
+            "mean": (
+                sum(latencies) / len(latencies) * to_ms
+                if latencies else 0.0
+            ),
+        },
+        "locking": _wait_summary(
+            before, after, "db_locking_statement_seconds"
+        ),
+        "pool_checkout_wait": _wait_summary(
+            before, after, "db_pool_checkout_wait_seconds"
+        ),
+    }
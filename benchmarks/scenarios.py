@@ -0,0 +1,143 @@
+"""
+Сценарии нагрузки.
+
+Сценарий готовит данные через публичный API (setup) и выдает очередной
+запрос виртуального пользователя (request). Данные создаются заново на
+каждый прогон, поэтому база может быть непустой.
+"""
+import random
+
+from httpx import AsyncClient, Response
+
+WALLETS_URL = "/api/v1/wallets/"
+TRANSFERS_URL = "/api/v1/transfers/"
+# Стартовый баланс, чтобы WITHDRAW не упирался в нехватку средств
+INITIAL_BALANCE = 10 ** 12
+MAX_AMOUNT = 1_000
+
+
+def operation_url(wallet_id: str) -> str:
+    return f"/api/v1/wallets/{wallet_id}/operations/"
+
+
+async def create_wallets(client: AsyncClient, count: int) -> list[str]:
+    """Создает кошельки и пополняет их стартовым балансом"""
+    wallet_ids = []
+    for _ in range(count):
+        response = await client.post(WALLETS_URL)
+        response.raise_for_status()
+        wallet_id = response.json()["id"]
+        response = await client.post(
+            operation_url(wallet_id),
+            json={"operation_type": "DEPOSIT", "amount": INITIAL_BALANCE}
+        )
+        response.raise_for_status()
+        wallet_ids.append(wallet_id)
+    return wallet_ids
+
+
+class Scenario:
+    name = ""
+    description = ""
+
+    def __init__(self, wallets: int, read_ratio: float, seed: int | None):
+        self.wallets = wallets
+        self.read_ratio = read_ratio
+        self.random = random.Random(seed)
+        self.wallet_ids: list[str] = []
+
+    async def setup(self, client: AsyncClient):
+        self.wallet_ids = await create_wallets(client, self.wallets)
+
+    async def request(self, client: AsyncClient) -> Response:
+        raise NotImplementedError
+
+    async def _operation(
+        self, client: AsyncClient, wallet_id: str
+    ) -> Response:
+        return await client.post(
+            operation_url(wallet_id),
+            json={
+                "operation_type": self.random.choice(("DEPOSIT", "WITHDRAW")),
+                "amount": self.random.randint(1, MAX_AMOUNT),
+            }
+        )
+
+
+class UniformWallets(Scenario):
+    name = "uniform"
+    description = "DEPOSIT/WITHDRAW spread evenly over --wallets wallets"
+
+    async def request(self, client: AsyncClient) -> Response:
+        return await self._operation(
+            client, self.random.choice(self.wallet_ids)
+        )
+
+
+class HotWallet(Scenario):
+    name = "hot_wallet"
+    description = "every request targets the same wallet"
+
+    async def setup(self, client: AsyncClient):
+        self.wallet_ids = await create_wallets(client, 1)
+
+    async def request(self, client: AsyncClient) -> Response:
+        return await self._operation(client, self.wallet_ids[0])
+
+
+class MixedReadWrite(Scenario):
+    name = "mixed"
+    description = (
+        "GET /wallets/{id} with probability --read-ratio, operations otherwise"
+    )
+
+    async def request(self, client: AsyncClient) -> Response:
+        wallet_id = self.random.choice(self.wallet_ids)
+        if self.random.random() < self.read_ratio:
+            return await client.get(f"{WALLETS_URL}{wallet_id}")
+        return await self._operation(client, wallet_id)
+
+
+class CreateStorm(Scenario):
+    name = "create_storm"
+    description = "POST /wallets/ only"
+
+    async def setup(self, client: AsyncClient):
+        pass
+
+    async def request(self, client: AsyncClient) -> Response:
+        return await client.post(WALLETS_URL)
+
+
+class OpposingTransfers(Scenario):
+    name = "opposing_transfers"
+    description = (
+        "transfers in both directions between two hot wallets; "
+        "a deadlock would show up as 500"
+    )
+
+    async def setup(self, client: AsyncClient):
+        self.wallet_ids = await create_wallets(client, 2)
+
+    async def request(self, client: AsyncClient) -> Response:
+        source, target = self.random.sample(self.wallet_ids, 2)
+        return await client.post(
+            TRANSFERS_URL,
+            json={
+                "from_wallet_id": source,
+                "to_wallet_id": target,
+                "amount": self.random.randint(1, MAX_AMOUNT),
+            }
+        )
+
+
+SCENARIOS: dict[str, type[Scenario]] = {
+    scenario.name: scenario
+    for scenario in (
+        UniformWallets,
+        HotWallet,
+        MixedReadWrite,
+        CreateStorm,
+        OpposingTransfers
+    )
+}
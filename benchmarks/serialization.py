@@ -0,0 +1,114 @@
+"""
+Микробенчмарк сериализации ответов /wallets без базы данных.
+
+    python -m benchmarks.serialization --iterations 20000
+
+Сравнивает CPU-время на один ответ:
+response_model - ORM-объект через response_model и jsonable_encoder
+                 (как FastAPI отдает возвращенный из эндпоинта объект);
+schema         - WalletResponseSchema.model_validate + model_dump_json
+                 (serialize_wallet для ORM-объекта, путь по умолчанию);
+row_adapter    - строка запроса через TypeAdapter без валидации
+                 (WALLET_FAST_SERIALIZATION).
+Для POST /wallets/lookup то же сравнение на странице из --page кошельков.
+"""
+import argparse
+import time
+from datetime import datetime, timezone
+from typing import Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy.engine.result import result_tuple
+
+from app.core.uuid7 import uuid7
+from app.models import Wallet, WalletStatus
+from app.repository import WALLET_COLUMNS
+from app.schemas import (
+    WalletLookupResponseSchema,
+    WalletLookupStatusSchema,
+    WalletResponseSchema
+)
+from app.services.wallet_cache import serialize_wallet
+from app.services.wallets import lookup_response_adapter
+
+
+def cpu_time_per_call(func: Callable, iterations: int, repeat: int) -> float:
+    """Лучшее из repeat прогонов, микросекунды CPU на вызов"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.process_time()
+        for _ in range(iterations):
+            func()
+        best = min(best, time.process_time() - started)
+    return best / iterations * 1_000_000
+
+
+def _wallet_values() -> dict:
+    return {
+        "id": uuid7(),
+        "balance": 123_456,
+        "status": WalletStatus.ACTIVE,
+        "created_at": datetime.now(timezone.utc),
+        "updated_at": datetime.now(timezone.utc),
+    }
+
+
+def build_cases(page: int) -> list[tuple[str, int, dict[str, Callable]]]:
+    """(название, кошельков в ответе, варианты сериализации)"""
+    make_row = result_tuple([column.key for column in WALLET_COLUMNS])
+    values = _wallet_values()
+    wallet = Wallet(**values)
+    row = make_row([values[column.key] for column in WALLET_COLUMNS])
+
+    lookup = {"results": [
+        {
+            "id": item["id"],
+            "result": WalletLookupStatusSchema.FOUND,
+            "wallet": item,
+        }
+        for item in (_wallet_values() for _ in range(page))
+    ]}
+
+    return [
+        ("wallet", 1, {
+            "response_model": lambda: JSONResponse(jsonable_encoder(
+                WalletResponseSchema.model_validate(wallet)
+            )).body,
+            "schema": lambda: serialize_wallet(wallet),
+            "row_adapter": lambda: serialize_wallet(row),
+        }),
+        (f"lookup[{page}]", page, {
+            "response_model": lambda: JSONResponse(jsonable_encoder(
+                WalletLookupResponseSchema.model_validate(lookup)
+            )).body,
+            "row_adapter": lambda: lookup_response_adapter.dump_json(lookup),
+        }),
+    ]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serialization benchmark")
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--page", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    print(f"{'case':<16}{'path':<16}{'us/call':>10}{'speedup':>10}")
+    for case, size, paths in build_cases(args.page):
+        # Итераций меньше для больших ответов, чтобы прогон шел секунды
+        iterations = max(args.iterations // size, 1)
+        timings = {
+            path: cpu_time_per_call(func, iterations, args.repeat)
+            for path, func in paths.items()
+        }
+        baseline = timings["response_model"]
+        for path, timing in timings.items():
+            print(
+                f"{case:<16}{path:<16}{timing:>10.2f}"
+                f"{baseline / timing:>9.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Стоимость зависимостей сессии по типам запросов.
+
+    python -m benchmarks.sessions --iterations 1000 --create-schema
+
+Запросы идут в приложение в том же процессе (httpx.ASGITransport).
+Для читающих эндпоинтов сравниваются get_read_db (AUTOCOMMIT, без
+BEGIN/ROLLBACK) и прежняя транзакционная сессия get_db; для PATCH
+печатается число SQL-запросов на запрос (без refresh после коммита).
+Использует DATABASE_URL: запускать против отдельной базы.
+"""
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import event
+
+from app.database import close_db, engine, get_db, get_read_db
+from app.services.wallet_cache import wallet_cache
+from benchmarks.runner import asgi_client, create_schema
+from benchmarks.scenarios import create_wallets
+
+HISTORY_SIZE = 20
+
+
+class StatementCounter:
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, *args):
+        self.count += 1
+
+
+def read_requests(wallet_id: str) -> dict[str, tuple[str, str]]:
+    wallet_url = f"/api/v1/wallets/{wallet_id}"
+    return {
+        "get_wallet": ("GET", wallet_url),
+        "balance": ("GET", f"{wallet_url}/balance"),
+        "transactions": ("GET", f"{wallet_url}/transactions/"),
+        "audit": ("GET", f"{wallet_url}/audit/"),
+    }
+
+
+async def measure(client, method, url, iterations, counter, json=None):
+    """Wall и CPU в микросекундах и SQL-запросов на один HTTP-запрос"""
+    counter.count = 0
+    wall, cpu = time.perf_counter(), time.process_time()
+    for i in range(iterations):
+        body = json(i) if json else None
+        response = await client.request(method, url, json=body)
+        response.raise_for_status()
+    return (
+        (time.perf_counter() - wall) / iterations * 1_000_000,
+        (time.process_time() - cpu) / iterations * 1_000_000,
+        counter.count / iterations,
+    )
+
+
+async def main(args: argparse.Namespace):
+    from app.main import app
+
+    if args.create_schema:
+        await create_schema()
+    # Ответы из кэша не доходят до БД
+    wallet_cache.backend = None
+    counter = StatementCounter()
+    event.listen(engine.sync_engine, "before_cursor_execute", counter)
+
+    header = f"{'request':<14}{'session':<10}{'wall us':>10}{'cpu us':>10}"
+    try:
+        async with asgi_client() as client:
+            [wallet_id] = await create_wallets(client, 1)
+            for _ in range(HISTORY_SIZE):
+                await client.post(
+                    f"/api/v1/wallets/{wallet_id}/operations/",
+                    json={"operation_type": "DEPOSIT", "amount": 1}
+                )
+
+            print(f"{header}{'queries':>9}")
+            for name, (method, url) in read_requests(wallet_id).items():
+                for session in ("read_db", "get_db"):
+                    if session == "get_db":
+                        app.dependency_overrides[get_read_db] = get_db
+                    await measure(
+                        client, method, url, args.warmup, counter
+                    )
+                    wall, cpu, queries = await measure(
+                        client, method, url, args.iterations, counter
+                    )
+                    app.dependency_overrides.pop(get_read_db, None)
+                    print(
+                        f"{name:<14}{session:<10}{wall:>10.1f}{cpu:>10.1f}"
+                        f"{queries:>9.1f}"
+                    )
+
+            wall, cpu, queries = await measure(
+                client,
+                "PATCH",
+                f"/api/v1/wallets/{wallet_id}",
+                args.iterations,
+                counter,
+                json=lambda i: {"status": ("FROZEN", "ACTIVE")[i % 2]}
+            )
+            print(
+                f"{'update_status':<14}{'get_db':<10}{wall:>10.1f}"
+                f"{cpu:>10.1f}{queries:>9.1f}"
+            )
+    finally:
+        await close_db()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Session dependency cost")
+    parser.add_argument("--iterations", type=int, default=1000)
+    parser.add_argument("--warmup", type=int, default=100)
+    parser.add_argument(
+        "--create-schema",
+        action="store_true",
+        help="create tables via metadata.create_all before the run"
+    )
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,110 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.models import Wallet, WalletAuditLog
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def create_audit_log(db_session, actions: list[str]) -> Wallet:
+    """Кошелек с записями аудита, по одной в минуту начиная с START"""
+    wallet = Wallet(balance=0)
+    db_session.add(wallet)
+    await db_session.flush()
+    db_session.add_all(
+        WalletAuditLog(
+            wallet_id=wallet.id,
+            action=action,
+            old_balance=i,
+            new_balance=i + 1,
+            created_at=START + timedelta(minutes=i)
+        )
+        for i, action in enumerate(actions)
+    )
+    await db_session.commit()
+    return wallet
+
+
+class TestAuditLog:
+    async def test_pages_cover_log_without_overlap(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование обхода журнала страницами по курсору
+        """
+        wallet = await create_audit_log(db_session, ["BALANCE_DEPOSIT"] * 5)
+        url = f"/api/v1/wallets/{wallet.id}/audit/"
+
+        first = (await async_client.get(url, params={"limit": 3})).json()
+        second = (await async_client.get(
+            url, params={"limit": 3, "cursor": first["next_cursor"]}
+        )).json()
+
+        assert [item["new_balance"] for item in first["items"]] == [5, 4, 3]
+        assert [item["new_balance"] for item in second["items"]] == [2, 1]
+        assert second["next_cursor"] is None
+
+    async def test_filters(self, async_client: AsyncClient, db_session):
+        """
+        Тестирование фильтров по action и интервалу времени
+        """
+        wallet = await create_audit_log(
+            db_session,
+            [
+                "BALANCE_DEPOSIT",
+                "BALANCE_WITHDRAW",
+                "BALANCE_DEPOSIT",
+                "BALANCE_DEPOSIT",
+            ]
+        )
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/audit/",
+            params={
+                "action": "BALANCE_DEPOSIT",
+                "created_from": (START + timedelta(minutes=1)).isoformat(),
+            }
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert [
+            item["new_balance"] for item in response.json()["items"]
+        ] == [4, 3]
+
+    async def test_operation_is_audited(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование записи аудита при операции над кошельком
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.commit()
+        await async_client.post(
+            f"/api/v1/wallets/{wallet.id}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 10}
+        )
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/audit/"
+        )
+
+        items = response.json()["items"]
+        assert len(items) == 1
+        assert items[0]["action"] == "BALANCE_DEPOSIT"
+        assert items[0]["new_balance"] == 10
+
+    async def test_wallet_not_found(self, async_client: AsyncClient):
+        """
+        Тестирование журнала несуществующего кошелька
+        """
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/audit/"
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
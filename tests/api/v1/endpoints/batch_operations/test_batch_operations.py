@@ -0,0 +1,179 @@
+import pytest
+import uuid
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.models import Transaction, Wallet, WalletAuditLog, WalletStatus
+from app.schemas import BatchOperationItemSchema
+from app.services.operations import apply_bulk_operations
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestBatchOperations:
+    async def test_batch_success(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование успешного пакета операций по нескольким кошелькам
+        """
+        first = Wallet(balance=100)
+        second = Wallet(balance=0)
+        db_session.add_all([first, second])
+        await db_session.commit()
+
+        response = await async_client.post(
+            "/api/v1/operations/batch",
+            json={
+                "items": [
+                    {"wallet_id": str(first.id),
+                     "operation_type": "WITHDRAW", "amount": 30},
+                    {"wallet_id": str(second.id),
+                     "operation_type": "DEPOSIT", "amount": 30},
+                    {"wallet_id": str(first.id),
+                     "operation_type": "WITHDRAW", "amount": 70},
+                ]
+            },
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["applied"] is True
+        assert [r["new_balance"] for r in data["results"]] == [70, 30, 0]
+
+        first_response = await async_client.get(f"/api/v1/wallets/{first.id}")
+        assert first_response.json()["balance"] == 0
+        second_response = await async_client.get(
+            f"/api/v1/wallets/{second.id}"
+        )
+        assert second_response.json()["balance"] == 30
+
+        for model, expected in ((Transaction, 3), (WalletAuditLog, 3)):
+            count = await db_session.scalar(
+                select(func.count()).select_from(model)
+            )
+            assert count == expected
+
+    async def test_all_or_nothing_rolls_back(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование отката всего пакета при ошибке одного элемента
+        """
+        wallet = Wallet(balance=50)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        response = await async_client.post(
+            "/api/v1/operations/batch",
+            json={
+                "mode": "ALL_OR_NOTHING",
+                "items": [
+                    {"wallet_id": str(wallet.id),
+                     "operation_type": "DEPOSIT", "amount": 10},
+                    {"wallet_id": str(wallet.id),
+                     "operation_type": "WITHDRAW", "amount": 100},
+                ]
+            },
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["applied"] is False
+        assert data["results"][0]["status_code"] == HTTPStatus.CONFLICT
+        assert data["results"][1]["status_code"] == HTTPStatus.BAD_REQUEST
+        assert data["results"][1]["detail"] == "Insufficient funds"
+
+        check_response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        assert check_response.json()["balance"] == 50
+
+    async def test_best_effort_applies_valid_items(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование частичного применения пакета
+        """
+        wallet = Wallet(balance=50)
+        frozen_wallet = Wallet(status=WalletStatus.FROZEN)
+        db_session.add_all([wallet, frozen_wallet])
+        await db_session.commit()
+
+        response = await async_client.post(
+            "/api/v1/operations/batch",
+            json={
+                "mode": "BEST_EFFORT",
+                "items": [
+                    {"wallet_id": str(wallet.id),
+                     "operation_type": "DEPOSIT", "amount": 10},
+                    {"wallet_id": str(frozen_wallet.id),
+                     "operation_type": "DEPOSIT", "amount": 10},
+                    {"wallet_id": str(uuid.uuid4()),
+                     "operation_type": "DEPOSIT", "amount": 10},
+                ]
+            },
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["applied"] is True
+        assert [r["status_code"] for r in data["results"]] == [
+            HTTPStatus.OK, HTTPStatus.FORBIDDEN, HTTPStatus.NOT_FOUND
+        ]
+
+        check_response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        assert check_response.json()["balance"] == 60
+
+    @pytest.mark.parametrize(
+        "invalid_data",
+        [
+            {"items": []},
+            {"items": [{"operation_type": "DEPOSIT", "amount": 10}]},
+            {"mode": "INVALID", "items": [
+                {"wallet_id": str(uuid.uuid4()),
+                 "operation_type": "DEPOSIT", "amount": 10}
+            ]},
+        ],
+    )
+    async def test_invalid_input(
+        self, invalid_data, async_client: AsyncClient
+    ):
+        """
+        Тестирование невалидных входных данных
+        """
+        response = await async_client.post(
+            "/api/v1/operations/batch", json=invalid_data
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    async def test_batch_above_bind_parameter_limit(self, db_session):
+        """
+        Тестирование пакета, строки которого не уместились бы в 32767
+        bind-параметров многострочного VALUES
+        """
+        wallets = [Wallet(balance=0) for _ in range(10)]
+        db_session.add_all(wallets)
+        await db_session.commit()
+        items = [
+            BatchOperationItemSchema(
+                wallet_id=wallets[number % 10].id,
+                operation_type="DEPOSIT",
+                amount=1
+            )
+            for number in range(8000)
+        ]
+
+        applied, results = await apply_bulk_operations(
+            db_session, items, all_or_nothing=True
+        )
+
+        assert applied is True
+        assert {result.status_code for result in results} == {HTTPStatus.OK}
+        count = await db_session.scalar(
+            select(func.count()).select_from(Transaction)
+        )
+        assert count == 8000
+        db_session.expire_all()
+        balances = await db_session.scalars(select(Wallet.balance))
+        assert set(balances) == {800}
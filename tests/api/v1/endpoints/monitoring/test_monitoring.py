@@ -0,0 +1,72 @@
+import pytest
+from http import HTTPStatus
+from httpx import AsyncClient
+
+import app.database
+from app.core.metrics import db_pool_checkout_wait_seconds
+from app.database import PoolMetrics
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestMonitoring:
+    async def test_pool_stats(self, async_client: AsyncClient):
+        """
+        Тестирование структуры статистики пула соединений
+        """
+        response = await async_client.get("/api/v1/monitoring/pool")
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()["shard:0"]
+        for field in (
+            "size",
+            "checked_out",
+            "idle",
+            "overflow",
+            "checkouts",
+            "checkout_wait_seconds_total",
+            "checkout_wait_seconds_max",
+        ):
+            assert field in data
+        assert data["overflow"] >= 0
+
+    async def test_pool_metrics_record_checkout(self):
+        """
+        Тестирование накопления времени ожидания checkout
+        """
+        metrics = PoolMetrics("shard:test")
+        metrics.record_checkout(0.5)
+        metrics.record_checkout(0.1)
+
+        assert metrics.checkouts == 2
+        assert metrics.wait_seconds_total == pytest.approx(0.6)
+        assert metrics.wait_seconds_max == 0.5
+        assert db_pool_checkout_wait_seconds.count(target="shard:test") == 2
+
+    async def test_pool_stats_per_shard(
+        self, async_client: AsyncClient, shards, monkeypatch
+    ):
+        """
+        Тестирование статистики и метрик пулов по каждому шарду
+        """
+        monkeypatch.setattr(app.database, "shard_router", shards)
+        async with shards.engines["1"].connect():
+            response = await async_client.get("/api/v1/monitoring/pool")
+            metrics = await async_client.get("/metrics")
+
+        data = response.json()
+        assert data.keys() == {"shard:0", "shard:1"}
+        assert data["shard:1"]["checked_out"] == 1
+        assert (
+            'db_pool_checked_out_connections{target="shard:1"} 1'
+            in metrics.text
+        )
+
+    async def test_cache_stats(self, async_client: AsyncClient):
+        """
+        Тестирование структуры статистики кэша
+        """
+        response = await async_client.get("/api/v1/monitoring/cache")
+
+        assert response.status_code == HTTPStatus.OK
+        assert {"hits", "misses", "hit_ratio"} <= response.json().keys()
@@ -0,0 +1,195 @@
+import asyncio
+import pytest
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import func, select, update
+from types import SimpleNamespace
+
+import app.core.cache
+from app.core.config import settings
+from app.models import IdempotencyKey, Transaction, Wallet
+from app.services.idempotency import idempotency_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+async def count_transactions(db_session, wallet_id) -> int:
+    return await db_session.scalar(
+        select(func.count())
+        .select_from(Transaction)
+        .where(Transaction.wallet_id == wallet_id)
+    )
+
+
+class TestIdempotentOperations:
+    async def test_retry_returns_original_result(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование повтора запроса с тем же Idempotency-Key
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        responses = [
+            await async_client.post(
+                f"/api/v1/wallets/{wallet.id}/operations/",
+                json={"operation_type": "WITHDRAW", "amount": 40},
+                headers=headers,
+            )
+            for _ in range(3)
+        ]
+
+        for response in responses:
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()["new_balance"] == 60
+        assert await count_transactions(db_session, wallet.id) == 1
+
+    async def test_retry_after_cache_eviction(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование повтора, когда ключ остался только в БД
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.commit()
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        url = f"/api/v1/wallets/{wallet.id}/operations/"
+        payload = {"operation_type": "DEPOSIT", "amount": 25}
+
+        await async_client.post(url, json=payload, headers=headers)
+        idempotency_cache.clear()
+        response = await async_client.post(url, json=payload, headers=headers)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["new_balance"] == 25
+        assert await count_transactions(db_session, wallet.id) == 1
+
+    async def test_expired_key_is_not_replayed(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование: ключ старше IDEMPOTENCY_KEY_TTL_SECONDS в БД
+        не воспроизводится, а используется новой операцией
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.commit()
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        url = f"/api/v1/wallets/{wallet.id}/operations/"
+        payload = {"operation_type": "DEPOSIT", "amount": 25}
+
+        await async_client.post(url, json=payload, headers=headers)
+        await db_session.execute(
+            update(IdempotencyKey).values(
+                created_at=datetime.now(timezone.utc) - timedelta(
+                    seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS + 60
+                )
+            )
+        )
+        await db_session.commit()
+        idempotency_cache.clear()
+        response = await async_client.post(url, json=payload, headers=headers)
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["new_balance"] == 50
+        assert await count_transactions(db_session, wallet.id) == 2
+
+    async def test_key_loaded_from_db_expires_with_key(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование: ключ, загруженный из БД незадолго до истечения,
+        держится в кэше только до истечения ключа
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.commit()
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        url = f"/api/v1/wallets/{wallet.id}/operations/"
+        payload = {"operation_type": "DEPOSIT", "amount": 25}
+        ttl = timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL_SECONDS)
+
+        await async_client.post(url, json=payload, headers=headers)
+        await db_session.execute(update(IdempotencyKey).values(
+            created_at=datetime.now(timezone.utc) - ttl + timedelta(minutes=1)
+        ))
+        await db_session.commit()
+        idempotency_cache.clear()
+        replayed = await async_client.post(url, json=payload, headers=headers)
+
+        # Прошло две минуты: ключ истек и в БД, и в кэше
+        await db_session.execute(update(IdempotencyKey).values(
+            created_at=IdempotencyKey.created_at - timedelta(minutes=2)
+        ))
+        await db_session.commit()
+        monkeypatch.setattr(app.core.cache, "time", SimpleNamespace(
+            monotonic=lambda: time.monotonic() + 120
+        ))
+        response = await async_client.post(url, json=payload, headers=headers)
+
+        assert replayed.json()["new_balance"] == 25
+        assert response.json()["new_balance"] == 50
+        assert await count_transactions(db_session, wallet.id) == 2
+
+    async def test_key_reused_with_different_request(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование повторного использования ключа для другой операции
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+        url = f"/api/v1/wallets/{wallet.id}/operations/"
+
+        await async_client.post(
+            url,
+            json={"operation_type": "DEPOSIT", "amount": 10},
+            headers=headers,
+        )
+        response = await async_client.post(
+            url,
+            json={"operation_type": "DEPOSIT", "amount": 20},
+            headers=headers,
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+        assert response.json()["detail"] == (
+            "Idempotency key reused with different request"
+        )
+
+    async def test_concurrent_retries(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование конкурентных запросов с одним ключом
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.commit()
+        headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+        responses = await asyncio.gather(*[
+            async_client.post(
+                f"/api/v1/wallets/{wallet.id}/operations/",
+                json={"operation_type": "DEPOSIT", "amount": 10},
+                headers=headers,
+            )
+            for _ in range(5)
+        ])
+
+        for response in responses:
+            assert response.status_code == HTTPStatus.OK
+            assert response.json()["new_balance"] == 10
+        assert await count_transactions(db_session, wallet.id) == 1
+
+        check_response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        assert check_response.json()["balance"] == 10
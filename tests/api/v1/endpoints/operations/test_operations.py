@@ -3,8 +3,17 @@ import pytest
 import uuid
 from http import HTTPStatus
 from httpx import AsyncClient
-
-from app.models import Wallet, WalletStatus
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet,
+    WalletAuditLog,
+    WalletStatus
+)
 
 pytestmark = pytest.mark.asyncio
 
@@ -49,6 +58,77 @@ class TestWalletOperations:
         check_response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
         assert check_response.json()["balance"] == expected_balance
 
+    async def test_operation_writes_transaction_and_audit_log(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование записи транзакции и аудита одним запросом
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        response = await async_client.post(
+            f"/api/v1/wallets/{wallet.id}/operations/",
+            json={
+                "operation_type": "WITHDRAW",
+                "amount": 30,
+            },
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["new_balance"] == 70
+
+        transactions = (await db_session.execute(
+            select(Transaction).where(Transaction.wallet_id == wallet.id)
+        )).scalars().all()
+        assert len(transactions) == 1
+        assert transactions[0].type == TransactionType.WITHDRAW
+        assert transactions[0].amount == 30
+        assert transactions[0].status == TransactionStatus.SUCCESS
+
+        audit_logs = (await db_session.execute(
+            select(WalletAuditLog).where(WalletAuditLog.wallet_id == wallet.id)
+        )).scalars().all()
+        assert len(audit_logs) == 1
+        assert audit_logs[0].action == "BALANCE_WITHDRAW"
+        assert audit_logs[0].old_balance == 100
+        assert audit_logs[0].new_balance == 70
+
+    @pytest.mark.parametrize("single_statement", [True, False])
+    async def test_operation_paths_are_equivalent(
+        self,
+        single_statement,
+        async_client: AsyncClient,
+        db_session,
+        monkeypatch
+    ):
+        """
+        Тестирование одинаковых ответов быстрого и ORM-пути
+        """
+        monkeypatch.setattr(
+            settings, "OPERATION_SINGLE_STATEMENT", single_statement
+        )
+        wallet = Wallet(balance=50)
+        frozen_wallet = Wallet(status=WalletStatus.FROZEN)
+        db_session.add_all([wallet, frozen_wallet])
+        await db_session.commit()
+
+        cases = [
+            (wallet.id, "DEPOSIT", 25, HTTPStatus.OK),
+            (wallet.id, "WITHDRAW", 100, HTTPStatus.BAD_REQUEST),
+            (frozen_wallet.id, "DEPOSIT", 10, HTTPStatus.FORBIDDEN),
+            (uuid.uuid4(), "DEPOSIT", 10, HTTPStatus.NOT_FOUND),
+        ]
+        for wallet_id, operation_type, amount, expected_status in cases:
+            response = await async_client.post(
+                f"/api/v1/wallets/{wallet_id}/operations/",
+                json={"operation_type": operation_type, "amount": amount},
+            )
+            assert response.status_code == expected_status
+
+        check_response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        assert check_response.json()["balance"] == 75
+
     async def test_insufficient_funds(
         self, async_client: AsyncClient, db_session
     ):
@@ -0,0 +1,87 @@
+import csv
+import io
+import json
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet
+)
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def create_history(db_session, count: int) -> Wallet:
+    wallet = Wallet(balance=0)
+    db_session.add(wallet)
+    await db_session.flush()
+    db_session.add_all(
+        Transaction(
+            wallet_id=wallet.id,
+            type=TransactionType.DEPOSIT,
+            amount=i + 1,
+            status=TransactionStatus.SUCCESS,
+            created_at=START + timedelta(seconds=i)
+        )
+        for i in range(count)
+    )
+    await db_session.commit()
+    return wallet
+
+
+class TestExportTransactions:
+    async def test_ndjson_export_in_chunks(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование NDJSON-выгрузки длиннее одного чанка
+        """
+        monkeypatch.setattr(settings, "EXPORT_CHUNK_SIZE", 3)
+        wallet = await create_history(db_session, 10)
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/transactions/export"
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"] == "application/x-ndjson"
+        rows = [json.loads(line) for line in response.text.splitlines()]
+        assert [row["amount"] for row in rows] == list(range(1, 11))
+        assert rows[0]["type"] == "DEPOSIT"
+        assert rows[0]["wallet_id"] == str(wallet.id)
+
+    async def test_csv_export(self, async_client: AsyncClient, db_session):
+        """
+        Тестирование CSV-выгрузки с заголовком
+        """
+        wallet = await create_history(db_session, 2)
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/transactions/export",
+            params={"format": "csv"}
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"].startswith("text/csv")
+        rows = list(csv.DictReader(io.StringIO(response.text)))
+        assert [row["amount"] for row in rows] == ["1", "2"]
+        assert rows[0]["balance_after"] == ""
+
+    async def test_export_wallet_not_found(self, async_client: AsyncClient):
+        """
+        Тестирование выгрузки несуществующего кошелька
+        """
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/transactions/export"
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
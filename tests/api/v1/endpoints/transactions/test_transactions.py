@@ -0,0 +1,154 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet
+)
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+async def create_history(db_session, count: int) -> Wallet:
+    """Кошелек с count транзакциями, по одной в минуту начиная с START"""
+    wallet = Wallet(balance=0)
+    db_session.add(wallet)
+    await db_session.flush()
+    db_session.add_all(
+        Transaction(
+            wallet_id=wallet.id,
+            type=(
+                TransactionType.DEPOSIT if i % 2 == 0
+                else TransactionType.WITHDRAW
+            ),
+            amount=i + 1,
+            status=TransactionStatus.SUCCESS,
+            created_at=START + timedelta(minutes=i)
+        )
+        for i in range(count)
+    )
+    await db_session.commit()
+    return wallet
+
+
+class TestListTransactions:
+    async def test_pages_cover_history_without_overlap(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование обхода истории страницами по курсору
+        """
+        wallet = await create_history(db_session, 7)
+        url = f"/api/v1/wallets/{wallet.id}/transactions/"
+
+        amounts, cursor = [], None
+        while True:
+            params = {"limit": 3}
+            if cursor:
+                params["cursor"] = cursor
+            response = await async_client.get(url, params=params)
+            assert response.status_code == HTTPStatus.OK
+            data = response.json()
+            amounts.extend(item["amount"] for item in data["items"])
+            cursor = data["next_cursor"]
+            if cursor is None:
+                break
+
+        assert amounts == [7, 6, 5, 4, 3, 2, 1]
+
+    async def test_filters(self, async_client: AsyncClient, db_session):
+        """
+        Тестирование фильтров по типу и интервалу времени
+        """
+        wallet = await create_history(db_session, 6)
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/transactions/",
+            params={
+                "type": "DEPOSIT",
+                "created_from": (START + timedelta(minutes=1)).isoformat(),
+                "created_to": (START + timedelta(minutes=4)).isoformat(),
+            }
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert [item["amount"] for item in response.json()["items"]] == [3]
+
+    async def test_limit_above_maximum(self, async_client: AsyncClient):
+        """
+        Тестирование ограничения размера страницы
+        """
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/transactions/",
+            params={"limit": 10_000}
+        )
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
+
+    async def test_invalid_cursor(self, async_client: AsyncClient):
+        """
+        Тестирование некорректного курсора
+        """
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/transactions/",
+            params={"cursor": "not-a-cursor"}
+        )
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()["detail"] == "Invalid cursor"
+
+    async def test_wallet_not_found(self, async_client: AsyncClient):
+        """
+        Тестирование истории несуществующего кошелька
+        """
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/transactions/"
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+
+
+class TestGetTransaction:
+    async def test_get_transaction(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование получения транзакции по id
+        """
+        wallet = await create_history(db_session, 1)
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/transactions/"
+        )
+        transaction_id = response.json()["items"][0]["id"]
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/transactions/{transaction_id}"
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["type"] == "DEPOSIT"
+
+    async def test_transaction_of_other_wallet(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование запроса чужой транзакции
+        """
+        wallet = await create_history(db_session, 1)
+        response = await async_client.get(
+            f"/api/v1/wallets/{wallet.id}/transactions/"
+        )
+        transaction_id = response.json()["items"][0]["id"]
+
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/transactions/{transaction_id}"
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,166 @@
+import asyncio
+import pytest
+import uuid
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import select
+
+from app.models import (
+    Transaction,
+    TransactionType,
+    Wallet,
+    WalletStatus
+)
+
+pytestmark = pytest.mark.asyncio
+
+TRANSFERS_URL = "/api/v1/transfers/"
+
+
+async def get_balance(async_client: AsyncClient, wallet_id) -> int:
+    response = await async_client.get(f"/api/v1/wallets/{wallet_id}")
+    return response.json()["balance"]
+
+
+class TestTransfers:
+    async def test_transfer_success(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование успешного перевода и парных записей журнала
+        """
+        source = Wallet(balance=100)
+        target = Wallet(balance=10)
+        db_session.add_all([source, target])
+        await db_session.commit()
+
+        response = await async_client.post(TRANSFERS_URL, json={
+            "from_wallet_id": str(source.id),
+            "to_wallet_id": str(target.id),
+            "amount": 30,
+        })
+
+        assert response.status_code == HTTPStatus.OK
+        data = response.json()
+        assert data["from_balance"] == 70
+        assert data["to_balance"] == 40
+        assert await get_balance(async_client, source.id) == 70
+        assert await get_balance(async_client, target.id) == 40
+
+        entries = (await db_session.execute(
+            select(Transaction.wallet_id, Transaction.type, Transaction.amount)
+            .where(Transaction.transfer_id == uuid.UUID(data["transfer_id"]))
+        )).all()
+        assert sorted(entries, key=lambda entry: entry.type.value) == [
+            (target.id, TransactionType.TRANSFER_IN, 30),
+            (source.id, TransactionType.TRANSFER_OUT, 30),
+        ]
+
+    async def test_insufficient_funds(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование перевода при нехватке средств
+        """
+        source = Wallet(balance=10)
+        target = Wallet(balance=0)
+        db_session.add_all([source, target])
+        await db_session.commit()
+
+        response = await async_client.post(TRANSFERS_URL, json={
+            "from_wallet_id": str(source.id),
+            "to_wallet_id": str(target.id),
+            "amount": 30,
+        })
+
+        assert response.status_code == HTTPStatus.BAD_REQUEST
+        assert response.json()["detail"] == "Insufficient funds"
+        assert await get_balance(async_client, source.id) == 10
+        assert await get_balance(async_client, target.id) == 0
+
+    async def test_target_not_active(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование перевода на замороженный кошелек
+        """
+        source = Wallet(balance=100)
+        target = Wallet(status=WalletStatus.FROZEN)
+        db_session.add_all([source, target])
+        await db_session.commit()
+
+        response = await async_client.post(TRANSFERS_URL, json={
+            "from_wallet_id": str(source.id),
+            "to_wallet_id": str(target.id),
+            "amount": 30,
+        })
+
+        assert response.status_code == HTTPStatus.FORBIDDEN
+        assert await get_balance(async_client, source.id) == 100
+
+    async def test_wallet_not_found(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование перевода на несуществующий кошелек
+        """
+        source = Wallet(balance=100)
+        db_session.add(source)
+        await db_session.commit()
+
+        response = await async_client.post(TRANSFERS_URL, json={
+            "from_wallet_id": str(source.id),
+            "to_wallet_id": str(uuid.uuid4()),
+            "amount": 30,
+        })
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert await get_balance(async_client, source.id) == 100
+
+    async def test_opposing_transfers_do_not_deadlock(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование конкурентных встречных переводов
+        """
+        first = Wallet(balance=1000)
+        second = Wallet(balance=1000)
+        db_session.add_all([first, second])
+        await db_session.commit()
+
+        def transfer(source, target):
+            return async_client.post(TRANSFERS_URL, json={
+                "from_wallet_id": str(source.id),
+                "to_wallet_id": str(target.id),
+                "amount": 10,
+            })
+
+        responses = await asyncio.gather(*(
+            transfer(first, second) if i % 2 else transfer(second, first)
+            for i in range(20)
+        ))
+
+        assert all(r.status_code == HTTPStatus.OK for r in responses)
+        assert await get_balance(async_client, first.id) == 1000
+        assert await get_balance(async_client, second.id) == 1000
+
+    @pytest.mark.parametrize(
+        "invalid_data",
+        [
+            {"to_wallet_id": str(uuid.uuid4()), "amount": 10},
+            {"from_wallet_id": str(uuid.uuid4()),
+             "to_wallet_id": str(uuid.uuid4()), "amount": 0},
+            {"from_wallet_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+             "to_wallet_id": "3fa85f64-5717-4562-b3fc-2c963f66afa6",
+             "amount": 10},
+        ],
+    )
+    async def test_invalid_input(
+        self, invalid_data, async_client: AsyncClient
+    ):
+        """
+        Тестирование невалидных входных данных
+        """
+        response = await async_client.post(TRANSFERS_URL, json=invalid_data)
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
@@ -0,0 +1,116 @@
+import json
+import pytest
+import uuid
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models import Wallet, WalletStatus
+
+pytestmark = pytest.mark.asyncio
+
+BATCH_URL = "/api/v1/wallets/batch"
+
+
+def parse_ndjson(text: str) -> list[dict]:
+    return [json.loads(line) for line in text.splitlines()]
+
+
+class TestCreateWalletsBatch:
+    async def test_create_by_count(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование создания пакета кошельков по количеству
+        """
+        response = await async_client.post(BATCH_URL, params={"count": 3})
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert response.headers["content-type"] == "application/x-ndjson"
+        wallets = parse_ndjson(response.text)
+        assert len(wallets) == 3
+        assert all(w["balance"] == 0 for w in wallets)
+        assert all(w["status"] == "ACTIVE" for w in wallets)
+        assert all(w["created_at"] for w in wallets)
+
+        count = await db_session.scalar(
+            select(func.count()).select_from(Wallet)
+        )
+        assert count == 3
+
+    async def test_create_with_ids(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование создания кошельков с заданными id
+        """
+        ids = [str(uuid.uuid4()) for _ in range(2)]
+
+        response = await async_client.post(BATCH_URL, json={"ids": ids})
+
+        assert response.status_code == HTTPStatus.CREATED
+        assert sorted(w["id"] for w in parse_ndjson(response.text)) == (
+            sorted(ids)
+        )
+        wallet = await db_session.get(Wallet, uuid.UUID(ids[0]))
+        assert wallet.status == WalletStatus.ACTIVE
+
+    async def test_create_with_copy(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование создания большого пакета через COPY
+        """
+        monkeypatch.setattr(settings, "WALLET_BATCH_COPY_THRESHOLD", 2)
+        monkeypatch.setattr(settings, "WALLET_BATCH_CHUNK_SIZE", 2)
+
+        response = await async_client.post(BATCH_URL, params={"count": 5})
+
+        assert response.status_code == HTTPStatus.CREATED
+        wallets = parse_ndjson(response.text)
+        assert len(wallets) == 5
+        wallet = await db_session.get(Wallet, uuid.UUID(wallets[0]["id"]))
+        assert wallet.balance == 0
+        assert wallet.status == WalletStatus.ACTIVE
+
+    async def test_existing_id_conflict(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование пакета с уже существующим кошельком
+        """
+        wallet = Wallet()
+        db_session.add(wallet)
+        await db_session.commit()
+
+        response = await async_client.post(
+            BATCH_URL, json={"ids": [str(uuid.uuid4()), str(wallet.id)]}
+        )
+
+        assert response.status_code == HTTPStatus.CONFLICT
+        count = await db_session.scalar(
+            select(func.count()).select_from(Wallet)
+        )
+        assert count == 1
+
+    @pytest.mark.parametrize(
+        "params, body",
+        [
+            ({}, None),
+            ({"count": 0}, None),
+            ({"count": settings.WALLET_BATCH_MAX_SIZE + 1}, None),
+            ({"count": 2}, {"ids": [str(uuid.uuid4())]}),
+            ({}, {"ids": ["3fa85f64-5717-4562-b3fc-2c963f66afa6"] * 2}),
+            ({}, {"ids": []}),
+        ],
+    )
+    async def test_invalid_input(
+        self, params, body, async_client: AsyncClient
+    ):
+        """
+        Тестирование невалидных входных данных
+        """
+        response = await async_client.post(BATCH_URL, params=params, json=body)
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
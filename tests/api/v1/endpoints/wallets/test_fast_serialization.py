@@ -0,0 +1,85 @@
+import pytest
+import uuid
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models import Wallet, WalletStatus
+from app.repository import get_wallet
+from app.services.wallet_cache import serialize_wallet, wallet_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def no_wallet_cache(monkeypatch):
+    # Ответ из кэша не проверяет путь сериализации
+    monkeypatch.setattr(wallet_cache, "backend", None)
+
+
+class TestFastSerialization:
+    async def test_row_serializes_like_orm_object(self, db_session):
+        """
+        Тестирование совпадения байтов быстрого и обычного пути
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        row = await get_wallet(db_session, wallet.id)
+
+        assert serialize_wallet(row) == serialize_wallet(wallet)
+
+    async def test_responses_match_default_path(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование одинаковых ответов GET, PATCH и lookup
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+        url = f"/api/v1/wallets/{wallet.id}"
+        lookup = {"ids": [str(wallet.id), str(uuid.uuid4())]}
+
+        default_get = await async_client.get(url)
+        default_lookup = await async_client.post(
+            "/api/v1/wallets/lookup", json=lookup
+        )
+        monkeypatch.setattr(settings, "WALLET_FAST_SERIALIZATION", True)
+        fast_get = await async_client.get(url)
+        fast_lookup = await async_client.post(
+            "/api/v1/wallets/lookup", json=lookup
+        )
+
+        assert fast_get.status_code == HTTPStatus.OK
+        assert fast_get.json() == default_get.json()
+        assert fast_lookup.json() == default_lookup.json()
+
+        response = await async_client.patch(url, json={"status": "FROZEN"})
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["status"] == "FROZEN"
+        assert response.json()["updated_at"] is not None
+        await db_session.refresh(wallet)
+        assert wallet.status == WalletStatus.FROZEN
+
+    async def test_patch_errors(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование 404 и 410 при смене статуса на быстром пути
+        """
+        monkeypatch.setattr(settings, "WALLET_FAST_SERIALIZATION", True)
+        wallet = Wallet(status=WalletStatus.DELETED)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        deleted = await async_client.patch(
+            f"/api/v1/wallets/{wallet.id}", json={"status": "ACTIVE"}
+        )
+        missing = await async_client.patch(
+            f"/api/v1/wallets/{uuid.uuid4()}", json={"status": "ACTIVE"}
+        )
+
+        assert deleted.status_code == HTTPStatus.GONE
+        assert missing.status_code == HTTPStatus.NOT_FOUND
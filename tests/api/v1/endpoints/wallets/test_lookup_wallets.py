@@ -0,0 +1,75 @@
+import pytest
+import uuid
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.core.config import settings
+from app.models import Wallet, WalletStatus
+
+pytestmark = pytest.mark.asyncio
+
+LOOKUP_URL = "/api/v1/wallets/lookup"
+
+
+class TestLookupWallets:
+    async def test_lookup_in_input_order(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование порядка результатов и отметок NOT_FOUND/DELETED
+        """
+        active = Wallet(balance=100)
+        deleted = Wallet(balance=5, status=WalletStatus.DELETED)
+        db_session.add_all([active, deleted])
+        await db_session.commit()
+        missing = uuid.uuid4()
+
+        ids = [str(deleted.id), str(missing), str(active.id), str(active.id)]
+        response = await async_client.post(LOOKUP_URL, json={"ids": ids})
+
+        assert response.status_code == HTTPStatus.OK
+        results = response.json()["results"]
+        assert [r["id"] for r in results] == ids
+        assert [r["result"] for r in results] == [
+            "DELETED", "NOT_FOUND", "FOUND", "FOUND"
+        ]
+        assert results[0]["wallet"]["status"] == "DELETED"
+        assert results[1]["wallet"] is None
+        assert results[2]["wallet"]["balance"] == 100
+        assert results[2]["wallet"] == results[3]["wallet"]
+
+    async def test_lookup_matches_get_wallet(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование совпадения ответа с GET /wallets/{id}
+        """
+        wallet = Wallet(balance=42)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        lookup = await async_client.post(
+            LOOKUP_URL, json={"ids": [str(wallet.id)]}
+        )
+        single = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert lookup.json()["results"][0]["wallet"] == single.json()
+
+    @pytest.mark.parametrize(
+        "invalid_data",
+        [
+            {"ids": []},
+            {"ids": ["not-a-uuid"]},
+            {"ids": [str(uuid.uuid4())]
+             * (settings.WALLET_LOOKUP_MAX_IDS + 1)},
+        ],
+    )
+    async def test_invalid_input(
+        self, invalid_data, async_client: AsyncClient
+    ):
+        """
+        Тестирование невалидных входных данных
+        """
+        response = await async_client.post(LOOKUP_URL, json=invalid_data)
+
+        assert response.status_code == HTTPStatus.UNPROCESSABLE_ENTITY
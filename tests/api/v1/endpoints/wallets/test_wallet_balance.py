@@ -0,0 +1,43 @@
+import pytest
+import uuid
+from datetime import datetime, timedelta, timezone
+from http import HTTPStatus
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestWalletBalance:
+    async def test_balance_before_and_after_operation(
+        self, async_client: AsyncClient
+    ):
+        """
+        Тестирование баланса до и после операции
+        """
+        response = await async_client.post("/api/v1/wallets/")
+        wallet_id = response.json()["id"]
+        before = datetime.now(timezone.utc) - timedelta(seconds=1)
+        await async_client.post(
+            f"/api/v1/wallets/{wallet_id}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 40}
+        )
+
+        past = await async_client.get(
+            f"/api/v1/wallets/{wallet_id}/balance",
+            params={"at": before.isoformat()}
+        )
+        now = await async_client.get(f"/api/v1/wallets/{wallet_id}/balance")
+
+        assert past.status_code == HTTPStatus.OK
+        assert past.json()["balance"] == 0
+        assert now.json()["balance"] == 40
+
+    async def test_balance_wallet_not_found(self, async_client: AsyncClient):
+        """
+        Тестирование баланса несуществующего кошелька
+        """
+        response = await async_client.get(
+            f"/api/v1/wallets/{uuid.uuid4()}/balance"
+        )
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
@@ -0,0 +1,112 @@
+import pytest
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.core.cache import MemoryCacheBackend
+from app.models import Wallet
+from app.services.wallet_cache import wallet_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def fresh_wallet_cache(monkeypatch):
+    monkeypatch.setattr(
+        wallet_cache, "backend", MemoryCacheBackend(max_size=100, ttl=60)
+    )
+    monkeypatch.setattr(wallet_cache, "hits", 0)
+    monkeypatch.setattr(wallet_cache, "misses", 0)
+
+
+class TestWalletCache:
+    async def test_repeated_get_is_served_from_cache(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование попадания в кэш при повторном чтении
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        first = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        second = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert first.status_code == second.status_code == HTTPStatus.OK
+        assert first.json() == second.json()
+
+        stats = (await async_client.get("/api/v1/monitoring/cache")).json()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    async def test_operation_invalidates_cache(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование инвалидации кэша после операции
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        await async_client.post(
+            f"/api/v1/wallets/{wallet.id}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 50},
+        )
+        response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.json()["balance"] == 150
+
+    async def test_status_update_refreshes_cache(
+        self, async_client: AsyncClient, db_session
+    ):
+        """
+        Тестирование обновления кэша после смены статуса
+        """
+        wallet = Wallet()
+        db_session.add(wallet)
+        await db_session.commit()
+
+        await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        await async_client.patch(
+            f"/api/v1/wallets/{wallet.id}", json={"status": "FROZEN"}
+        )
+        response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.json()["status"] == "FROZEN"
+        assert wallet_cache.hits == 1
+
+    async def test_not_found_is_not_cached(self, async_client: AsyncClient):
+        """
+        Тестирование того, что 404 не кэшируется
+        """
+        wallet_id = "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+
+        await async_client.get(f"/api/v1/wallets/{wallet_id}")
+        response = await async_client.get(f"/api/v1/wallets/{wallet_id}")
+
+        assert response.status_code == HTTPStatus.NOT_FOUND
+        assert wallet_cache.hits == 0
+
+    async def test_read_before_invalidation_is_not_cached(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование гонки чтения с инвалидацией: старый ответ не кэшируется
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+        set_cache = wallet_cache.set
+
+        async def set_after_operation(wallet_id, payload, version):
+            # Операция коммитится между чтением из БД и записью в кэш
+            await wallet_cache.invalidate(wallet_id)
+            await set_cache(wallet_id, payload, version)
+
+        monkeypatch.setattr(wallet_cache, "set", set_after_operation)
+        response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.status_code == HTTPStatus.OK
+        assert await wallet_cache.get(wallet.id) is None
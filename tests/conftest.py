@@ -1,11 +1,20 @@
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import make_url, text
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 from app.core.config import settings
+from app.core.sharding import ShardRouter
 from app.main import app
-from app.database import Base, get_db
+from app.database import (
+    Base,
+    WalletSessions,
+    get_db,
+    get_read_db,
+    get_session_factory,
+    get_wallet_sessions
+)
 
 
 @pytest_asyncio.fixture
@@ -22,6 +31,16 @@ async def async_client():
 
     # Подменяем зависимость на фабрику сессий
     app.dependency_overrides[get_db] = get_fresh_db
+    app.dependency_overrides[get_read_db] = get_fresh_db
+    app.dependency_overrides[get_session_factory] = (
+        lambda: async_session_factory
+    )
+
+    class TestWalletSessions(WalletSessions):
+        def __call__(self, wallet_id, read_only=False):
+            return async_session_factory()
+
+    app.dependency_overrides[get_wallet_sessions] = TestWalletSessions
 
     async with AsyncClient(
         transport=ASGITransport(app=app),
@@ -53,3 +72,51 @@ async def db_session() -> AsyncSession:  # type: ignore
     )
     async with async_session() as session:
         yield session  # type: ignore
+
+
+@pytest_asyncio.fixture
+async def make_test_database():
+    """
+    Фабрика дополнительных локальных БД рядом с тестовой (стенд-ины
+    реплик и шардов): создает БД <test_db>_<suffix> и таблицы в ней.
+    """
+    url = make_url(settings.test_db_url)
+    engines = []
+
+    async def make(suffix: str):
+        database_url = url.set(database=f"{url.database}_{suffix}")
+        admin_engine = create_async_engine(url, isolation_level="AUTOCOMMIT")
+        async with admin_engine.connect() as conn:
+            exists = await conn.scalar(
+                text("SELECT 1 FROM pg_database WHERE datname = :name"),
+                {"name": database_url.database}
+            )
+            if not exists:
+                await conn.execute(
+                    text(f'CREATE DATABASE "{database_url.database}"')
+                )
+        await admin_engine.dispose()
+
+        engine = create_async_engine(database_url)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        engines.append(engine)
+        return engine
+
+    yield make
+
+    for engine in engines:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.drop_all)
+        await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def shards(make_test_database):
+    """Тестовая БД - шард 0, вторая локальная БД - шард 1"""
+    primary_engine = create_async_engine(settings.test_db_url)
+    yield ShardRouter({
+        "0": primary_engine,
+        "1": await make_test_database("shard1"),
+    })
+    await primary_engine.dispose()
@@ -0,0 +1,134 @@
+import pytest
+
+from app.core.cache import MemoryCacheBackend, RedisCacheBackend, TTLCache
+
+pytestmark = pytest.mark.asyncio
+
+
+class FakeRedis:
+    """Минимальная замена redis.asyncio.Redis для тестов"""
+
+    def __init__(self):
+        self.data = {}
+        self.expirations = {}
+
+    async def get(self, key):
+        return self.data.get(key)
+
+    async def set(self, key, value, px=None):
+        self.data[key] = value
+        self.expirations[key] = px
+
+    async def delete(self, key):
+        self.data.pop(key, None)
+
+    async def incr(self, key):
+        self.data[key] = str(int(self.data.get(key, 0)) + 1).encode()
+        return int(self.data[key])
+
+    async def pexpire(self, key, px):
+        self.expirations[key] = px
+
+    async def eval(self, script, numkeys, key, generation_key, *args):
+        # Единственный скрипт бэкенда - SET_IF_GENERATION_SCRIPT
+        value, generation, px = args
+        if (self.data.get(generation_key) or b"0").decode() == generation:
+            await self.set(key, value, px=px)
+
+
+class TestTTLCache:
+    async def test_lru_eviction(self):
+        """
+        Тестирование вытеснения самой старой записи
+        """
+        cache = TTLCache(max_size=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    async def test_ttl_expiration(self, monkeypatch):
+        """
+        Тестирование истечения времени жизни записи
+        """
+        now = 1000.0
+        monkeypatch.setattr("app.core.cache.time.monotonic", lambda: now)
+        cache = TTLCache(max_size=10, ttl=5)
+        cache.set("a", 1)
+
+        now += 10
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+
+class TestCacheBackends:
+    @pytest.mark.parametrize("backend_name", ["memory", "redis"])
+    async def test_get_set_delete(self, backend_name):
+        """
+        Тестирование одинакового поведения хранилищ кэша
+        """
+        backend = (
+            MemoryCacheBackend(max_size=10, ttl=5)
+            if backend_name == "memory"
+            else RedisCacheBackend(FakeRedis(), ttl=5)
+        )
+
+        assert await backend.get("key") is None
+        await backend.set("key", b"value")
+        assert await backend.get("key") == b"value"
+        await backend.delete("key")
+        assert await backend.get("key") is None
+
+    @pytest.mark.parametrize("backend_name", ["memory", "redis"])
+    async def test_set_after_delete_is_dropped(self, backend_name):
+        """
+        Тестирование: значение, прочитанное до инвалидации, не сохраняется
+        """
+        backend = (
+            MemoryCacheBackend(max_size=10, ttl=5)
+            if backend_name == "memory"
+            else RedisCacheBackend(FakeRedis(), ttl=5)
+        )
+
+        generation = await backend.generation("key")
+        await backend.delete("key")
+        await backend.set("key", b"stale", generation)
+        assert await backend.get("key") is None
+
+        generation = await backend.generation("key")
+        await backend.set("key", b"fresh", generation)
+        assert await backend.get("key") == b"fresh"
+
+    async def test_set_after_generation_eviction_is_dropped(self):
+        """
+        Тестирование: вытеснение поколения ключа не пропускает значение,
+        прочитанное до инвалидации
+        """
+        backend = MemoryCacheBackend(max_size=1, ttl=5)
+
+        generation = await backend.generation("key")
+        await backend.delete("key")
+        # Поколение "key" вытесняется поколением другого ключа
+        await backend.delete("other")
+        await backend.set("key", b"stale", generation)
+        assert await backend.get("key") is None
+
+        generation = await backend.generation("key")
+        await backend.set("key", b"fresh", generation)
+        assert await backend.get("key") == b"fresh"
+
+    async def test_redis_backend_uses_prefix_and_ttl(self):
+        """
+        Тестирование префикса ключей и TTL в Redis
+        """
+        client = FakeRedis()
+        backend = RedisCacheBackend(client, ttl=2.5, prefix="test:")
+
+        await backend.set("key", b"value")
+
+        assert client.data == {"test:key": b"value"}
+        assert client.expirations == {"test:key": 2500}
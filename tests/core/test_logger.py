@@ -0,0 +1,132 @@
+import json
+import logging
+import pytest
+import queue
+import sys
+
+from app.core.logger import (
+    BoundedQueueHandler,
+    JsonFormatter,
+    RequestIdFilter,
+    request_id_var
+)
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_record(level: int = logging.INFO) -> logging.LogRecord:
+    return logging.LogRecord(
+        "wallet_api", level, __file__, 0, "message %s", ("arg",), None
+    )
+
+
+class TestBoundedQueueHandler:
+    async def test_drop_policy(self):
+        """
+        Тестирование отбрасывания записей при полной очереди
+        """
+        log_queue = queue.Queue(maxsize=2)
+        handler = BoundedQueueHandler(log_queue, overflow_policy="drop")
+
+        for _ in range(5):
+            handler.handle(make_record())
+
+        assert log_queue.qsize() == 2
+        assert handler.dropped == 3
+
+    async def test_sample_policy(self):
+        """
+        Тестирование сэмплирования записей под нагрузкой
+        """
+        log_queue = queue.Queue(maxsize=100)
+        handler = BoundedQueueHandler(
+            log_queue, overflow_policy="sample", sample_rate=10
+        )
+
+        for _ in range(50):
+            handler.handle(make_record())
+        for _ in range(100):
+            handler.handle(make_record())
+
+        # Первые 50 записей проходят, затем только каждая десятая
+        assert log_queue.qsize() == 60
+        assert handler.dropped == 90
+
+    async def test_sample_policy_keeps_warnings(self):
+        """
+        Тестирование того, что предупреждения не сэмплируются
+        """
+        log_queue = queue.Queue(maxsize=10)
+        handler = BoundedQueueHandler(
+            log_queue, overflow_policy="sample", sample_rate=100
+        )
+
+        for _ in range(8):
+            handler.handle(make_record(logging.WARNING))
+
+        assert log_queue.qsize() == 8
+        assert handler.dropped == 0
+
+    async def test_message_is_formatted_lazily(self):
+        """
+        Тестирование подстановки аргументов при постановке в очередь
+        """
+        log_queue = queue.Queue(maxsize=10)
+        handler = BoundedQueueHandler(log_queue)
+
+        handler.handle(make_record())
+
+        assert log_queue.get_nowait().getMessage() == "message arg"
+
+
+class TestJsonFormatter:
+    async def test_fixed_fields_and_request_id(self):
+        """
+        Тестирование JSON-записи с фиксированными полями
+        """
+        record = make_record()
+        record.request_id = "req-1"
+        record.wallet_id = "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+        record.new_balance = 100
+        record.latency_ms = 1.5
+
+        data = json.loads(JsonFormatter().format(record))
+
+        assert data["message"] == "message arg"
+        assert data["level"] == "INFO"
+        assert data["request_id"] == "req-1"
+        assert data["wallet_id"] == "3fa85f64-5717-4562-b3fc-2c963f66afa6"
+        assert data["new_balance"] == 100
+        assert data["latency_ms"] == 1.5
+        assert "amount" not in data
+
+    async def test_traceback_reaches_message_through_queue(self):
+        """
+        Тестирование трейсбека в message записи, прошедшей через очередь
+        """
+        log_queue = queue.Queue(maxsize=10)
+        handler = BoundedQueueHandler(log_queue)
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            record = make_record(logging.ERROR)
+            record.exc_info = sys.exc_info()
+        handler.handle(record)
+
+        data = json.loads(JsonFormatter().format(log_queue.get_nowait()))
+
+        assert "ValueError: boom" in data["message"]
+        assert "exc_info" not in data
+
+    async def test_request_id_filter(self):
+        """
+        Тестирование подстановки request_id из contextvars
+        """
+        token = request_id_var.set("req-2")
+        try:
+            record = make_record()
+            RequestIdFilter().filter(record)
+        finally:
+            request_id_var.reset(token)
+
+        assert record.request_id == "req-2"
@@ -0,0 +1,82 @@
+import pytest
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app.core.metrics import MetricsRegistry
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestMetricsRegistry:
+    async def test_counter_with_labels(self):
+        """
+        Тестирование счетчика с метками
+        """
+        registry = MetricsRegistry()
+        counter = registry.counter("ops_total", "Ops", ("type",))
+        counter.inc(type="DEPOSIT")
+        counter.inc(2, type="DEPOSIT")
+        counter.inc(type="WITHDRAW")
+
+        assert counter.value(type="DEPOSIT") == 3
+        assert 'ops_total{type="WITHDRAW"} 1' in registry.render()
+
+    async def test_histogram_buckets_are_cumulative(self):
+        """
+        Тестирование кумулятивных бакетов гистограммы
+        """
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency", "Latency", buckets=(1, 2))
+        for value in (0.5, 1, 1.5, 3):
+            histogram.observe(value)
+
+        output = registry.render()
+        assert 'latency_bucket{le="1"} 2' in output
+        assert 'latency_bucket{le="2"} 3' in output
+        assert 'latency_bucket{le="+Inf"} 4' in output
+        assert "latency_count 4" in output
+        assert histogram.sum() == 6.0
+
+    async def test_callback_gauge(self):
+        """
+        Тестирование вычисления gauge в момент сбора
+        """
+        registry = MetricsRegistry()
+        values = [1]
+        registry.gauge("queue_size", "Queue size", lambda: values[-1])
+        values.append(7)
+
+        assert "queue_size 7" in registry.render()
+
+    async def test_callback_gauge_with_labels(self):
+        """
+        Тестирование gauge с метками: ряд на каждый ключ callback
+        """
+        registry = MetricsRegistry()
+        registry.gauge(
+            "pool_size",
+            "Pool size",
+            lambda: {("shard:0",): 5, ("shard:1",): 2},
+            labelnames=("target",)
+        )
+
+        output = registry.render()
+        assert 'pool_size{target="shard:0"} 5' in output
+        assert 'pool_size{target="shard:1"} 2' in output
+
+
+class TestMetricsEndpoint:
+    async def test_metrics_endpoint(self, async_client: AsyncClient):
+        """
+        Тестирование экспорта метрик с шаблоном маршрута в метке route
+        """
+        await async_client.get("/")
+        response = await async_client.get("/metrics")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "# TYPE http_request_duration_seconds histogram" in (
+            response.text
+        )
+        assert 'route="/"' in response.text
+        assert "db_pool_checked_out_connections" in response.text
@@ -0,0 +1,24 @@
+import pytest
+from httpx import AsyncClient
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestRequestIdMiddleware:
+    async def test_request_id_is_generated(self, async_client: AsyncClient):
+        """
+        Тестирование генерации X-Request-ID
+        """
+        response = await async_client.get("/")
+
+        assert len(response.headers["X-Request-ID"]) == 32
+
+    async def test_request_id_is_propagated(self, async_client: AsyncClient):
+        """
+        Тестирование возврата переданного клиентом X-Request-ID
+        """
+        response = await async_client.get(
+            "/", headers={"X-Request-ID": "client-request-1"}
+        )
+
+        assert response.headers["X-Request-ID"] == "client-request-1"
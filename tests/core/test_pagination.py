@@ -0,0 +1,30 @@
+import pytest
+import uuid
+from datetime import datetime, timezone
+from fastapi import HTTPException
+
+from app.core.pagination import decode_cursor, encode_cursor
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestCursor:
+    async def test_round_trip(self):
+        """
+        Тестирование кодирования и декодирования курсора
+        """
+        created_at = datetime(2026, 1, 1, 12, 0, 0, 123456, timezone.utc)
+        row_id = uuid.uuid4()
+
+        assert decode_cursor(encode_cursor(created_at, row_id)) == (
+            created_at, row_id
+        )
+
+    async def test_invalid_cursor(self):
+        """
+        Тестирование отказа на поврежденном курсоре
+        """
+        with pytest.raises(HTTPException) as exc_info:
+            decode_cursor("bm90IGpzb24")
+
+        assert exc_info.value.status_code == 400
@@ -0,0 +1,234 @@
+import json
+import pytest
+import pytest_asyncio
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+import app.database
+from app.core.cache import MemoryCacheBackend
+from app.core.config import settings
+from app.core.replicas import Replica, ReplicaRouter
+from app.database import get_read_db
+from app.main import app as fastapi_app
+from app.models import Wallet
+from app.services.wallet_cache import wallet_cache
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture(autouse=True)
+def no_wallet_cache(monkeypatch):
+    monkeypatch.setattr(wallet_cache, "backend", None)
+
+
+@pytest_asyncio.fixture
+async def replica_engine(make_test_database):
+    """Вторая локальная БД рядом с тестовой - стенд-ин реплики"""
+    return await make_test_database("replica")
+
+
+@pytest_asyncio.fixture
+async def primary_engine():
+    engine = create_async_engine(settings.test_db_url)
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def router(primary_engine, replica_engine):
+    router = ReplicaRouter(
+        primary_engine.execution_options(isolation_level="AUTOCOMMIT"),
+        [Replica(
+            "replica",
+            replica_engine.execution_options(isolation_level="AUTOCOMMIT")
+        )]
+    )
+    await router.check_lag()
+    return router
+
+
+@pytest_asyncio.fixture
+async def routed_client(async_client: AsyncClient, router, monkeypatch):
+    """Клиент, чтения которого идут через router, а записи - на primary"""
+    monkeypatch.setattr(app.database, "replica_router", router)
+    monkeypatch.setattr(settings, "READ_REPLICA_URLS", ["replica"])
+    fastapi_app.dependency_overrides.pop(get_read_db)
+    return async_client
+
+
+@pytest_asyncio.fixture
+async def wallet(db_session, replica_engine):
+    """Кошелек с разными балансами на primary (100) и реплике (1)"""
+    wallet = Wallet(balance=100)
+    db_session.add(wallet)
+    await db_session.commit()
+
+    async with AsyncSession(replica_engine) as session:
+        session.add(Wallet(id=wallet.id, balance=1))
+        await session.commit()
+    return wallet
+
+
+class TestReadRouting:
+    async def test_get_is_served_by_replica(
+        self, routed_client: AsyncClient, wallet
+    ):
+        """
+        Тестирование чтения кошелька с реплики
+        """
+        response = await routed_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["balance"] == 1
+
+    async def test_reads_after_write_go_to_primary(
+        self, routed_client: AsyncClient, wallet
+    ):
+        """
+        Тестирование read-your-writes: после операции чтение с primary
+        """
+        response = await routed_client.post(
+            f"/api/v1/wallets/{wallet.id}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 50},
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert "read_primary_until" in response.cookies
+
+        response = await routed_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.json()["balance"] == 150
+
+    async def test_read_only_post_does_not_pin_primary(
+        self, routed_client: AsyncClient, wallet
+    ):
+        """
+        Тестирование: POST /lookup только читает и не закрепляет primary
+        """
+        response = await routed_client.post(
+            "/api/v1/wallets/lookup", json={"ids": [str(wallet.id)]}
+        )
+        assert response.status_code == HTTPStatus.OK
+        assert "read_primary_until" not in response.cookies
+
+        response = await routed_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.json()["balance"] == 1
+
+    async def test_consistency_header_pins_primary(
+        self, routed_client: AsyncClient, wallet
+    ):
+        """
+        Тестирование заголовка X-Read-Consistency: primary
+        """
+        response = await routed_client.get(
+            f"/api/v1/wallets/{wallet.id}",
+            headers={"X-Read-Consistency": "primary"}
+        )
+
+        assert response.json()["balance"] == 100
+
+    async def test_lagging_replica_is_skipped(
+        self, routed_client: AsyncClient, wallet, monkeypatch
+    ):
+        """
+        Тестирование возврата на primary при отставании реплики
+        """
+        monkeypatch.setattr(settings, "READ_REPLICA_MAX_LAG_SECONDS", -1)
+
+        response = await routed_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.json()["balance"] == 100
+
+    async def test_not_streaming_replica_is_skipped(
+        self, router, monkeypatch
+    ):
+        """
+        Тестирование: реплика без потоковой репликации не выбирается
+        """
+        # Так отвечает REPLICA_LAG_STATEMENT при отключенном WAL receiver
+        monkeypatch.setattr(
+            "app.core.replicas.REPLICA_LAG_STATEMENT", text("SELECT NULL")
+        )
+
+        await router.check_lag()
+
+        assert router.replicas[0].lag_seconds is None
+        assert router.read_engine() is router.primary
+
+    async def test_unchecked_replica_is_skipped(self, router):
+        """
+        Тестирование: реплика без измеренного отставания не выбирается
+        """
+        router.replicas[0].lag_seconds = None
+
+        assert router.read_engine() is router.primary
+
+
+class TestReplicaCache:
+    @pytest.fixture(autouse=True)
+    def memory_wallet_cache(self, monkeypatch):
+        monkeypatch.setattr(
+            wallet_cache, "backend", MemoryCacheBackend(max_size=100, ttl=60)
+        )
+
+    async def test_replica_read_is_not_cached(
+        self, routed_client: AsyncClient, wallet
+    ):
+        """
+        Тестирование: ответ реплики не попадает в общий кэш
+        """
+        response = await routed_client.get(f"/api/v1/wallets/{wallet.id}")
+
+        assert response.json()["balance"] == 1
+        assert await wallet_cache.get(wallet.id) is None
+
+    async def test_pinned_read_skips_cache(
+        self, routed_client: AsyncClient, wallet
+    ):
+        """
+        Тестирование: чтение, закрепленное за primary, не берется из кэша
+        """
+        # Запись, которую не инвалидировал воркер, принявший операцию
+        await wallet_cache.backend.set(str(wallet.id), b'{"balance": 1}')
+
+        response = await routed_client.get(
+            f"/api/v1/wallets/{wallet.id}",
+            headers={"X-Read-Consistency": "primary"}
+        )
+
+        assert response.json()["balance"] == 100
+        # Чтение с primary обновило запись
+        cached = json.loads(await wallet_cache.get(wallet.id))
+        assert cached["balance"] == 100
+
+
+class TestReplicaPolicy:
+    @pytest_asyncio.fixture
+    async def two_replicas(self, primary_engine, replica_engine):
+        router = ReplicaRouter(primary_engine, [
+            Replica("first", primary_engine),
+            Replica("second", replica_engine),
+        ])
+        await router.check_lag()
+        return router
+
+    async def test_round_robin(self, two_replicas, monkeypatch):
+        """
+        Тестирование выбора реплик по кругу
+        """
+        monkeypatch.setattr(settings, "READ_REPLICA_POLICY", "round_robin")
+
+        names = [two_replicas.choose().name for _ in range(4)]
+
+        assert names == ["first", "second", "first", "second"]
+
+    async def test_least_loaded(self, two_replicas, monkeypatch):
+        """
+        Тестирование выбора реплики с наименьшим числом соединений
+        """
+        monkeypatch.setattr(settings, "READ_REPLICA_POLICY", "least_loaded")
+
+        async with two_replicas.replicas[0].engine.connect():
+            assert two_replicas.choose().name == "second"
@@ -0,0 +1,267 @@
+import pytest
+import pytest_asyncio
+from http import HTTPStatus
+from httpx import AsyncClient
+from uuid import UUID
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.database
+from app.core.replicas import ReplicaRouter
+from app.core.sharding import HashRing, ShardRouter
+from app.core.uuid7 import uuid7
+from app.database import get_db, get_read_db, get_wallet_sessions
+from app.main import app as fastapi_app
+from app.models import Wallet
+from app.services.wallet_cache import wallet_cache
+
+
+@pytest.fixture(autouse=True)
+def no_wallet_cache(monkeypatch):
+    monkeypatch.setattr(wallet_cache, "backend", None)
+
+
+@pytest_asyncio.fixture
+async def sharded_client(async_client: AsyncClient, shards, monkeypatch):
+    """Клиент, сессии которого открываются на шардах shards"""
+    monkeypatch.setattr(app.database, "shard_router", shards)
+    monkeypatch.setattr(
+        app.database, "replica_router", ReplicaRouter(shards.engines["0"], [])
+    )
+    for dependency in (get_db, get_read_db, get_wallet_sessions):
+        fastapi_app.dependency_overrides.pop(dependency)
+    return async_client
+
+
+def wallet_id_on(shards: ShardRouter, shard: str):
+    while True:
+        wallet_id = uuid7()
+        if shards.shard_for(wallet_id) == shard:
+            return wallet_id
+
+
+async def create_wallet(shards: ShardRouter, shard: str, balance: int):
+    wallet_id = wallet_id_on(shards, shard)
+    async with AsyncSession(shards.engines[shard]) as session:
+        session.add(Wallet(id=wallet_id, balance=balance))
+        await session.commit()
+    return wallet_id
+
+
+class TestHashRing:
+    def test_ring_is_deterministic(self):
+        """
+        Тестирование: кольцо с теми же узлами дает тот же узел
+        """
+        keys = [uuid7() for _ in range(100)]
+        first = HashRing(["0", "1", "2"])
+        second = HashRing(["2", "1", "0"])
+
+        assert [first.node_for(key) for key in keys] == [
+            second.node_for(key) for key in keys
+        ]
+
+    def test_keys_are_spread_across_nodes(self):
+        """
+        Тестирование распределения ключей по всем узлам
+        """
+        ring = HashRing(["0", "1", "2", "3"])
+        counts = {}
+        for _ in range(4000):
+            node = ring.node_for(uuid7())
+            counts[node] = counts.get(node, 0) + 1
+
+        assert set(counts) == {"0", "1", "2", "3"}
+        assert min(counts.values()) > 500
+
+    def test_new_node_takes_keys_only_for_itself(self):
+        """
+        Тестирование: новый узел забирает ключи, остальные не двигаются
+        """
+        keys = [uuid7() for _ in range(4000)]
+        before = HashRing(["0", "1", "2"])
+        after = HashRing(["0", "1", "2", "3"])
+
+        moved = [
+            key for key in keys
+            if before.node_for(key) != after.node_for(key)
+        ]
+
+        assert all(after.node_for(key) == "3" for key in moved)
+        assert len(moved) < len(keys) / 2
+
+
+@pytest.mark.asyncio
+class TestShardRouting:
+    async def test_created_wallets_are_stored_on_their_shard(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование создания кошельков на шарде по кольцу хешей
+        """
+        ids = []
+        for _ in range(20):
+            response = await sharded_client.post("/api/v1/wallets/")
+            assert response.status_code == HTTPStatus.CREATED
+            ids.append(UUID(response.json()["id"]))
+
+        stored = {}
+        for name, shard_engine in shards.engines.items():
+            async with AsyncSession(shard_engine) as session:
+                for wallet_id in ids:
+                    if await session.get(Wallet, wallet_id):
+                        stored.setdefault(wallet_id, []).append(name)
+
+        assert all(
+            names == [shards.shard_for(wallet_id)]
+            for wallet_id, names in stored.items()
+        )
+        assert len(stored) == len(ids)
+        assert set().union(*stored.values()) == {"0", "1"}
+
+    async def test_operation_and_history_on_second_shard(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование операции и истории кошелька на шарде 1
+        """
+        wallet_id = await create_wallet(shards, "1", 100)
+
+        response = await sharded_client.post(
+            f"/api/v1/wallets/{wallet_id}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 50},
+        )
+        assert response.status_code == HTTPStatus.OK
+
+        wallet = await sharded_client.get(f"/api/v1/wallets/{wallet_id}")
+        history = await sharded_client.get(
+            f"/api/v1/wallets/{wallet_id}/transactions/"
+        )
+
+        assert wallet.json()["balance"] == 150
+        assert len(history.json()["items"]) == 1
+
+    async def test_lookup_across_shards(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование пакетного чтения кошельков с разных шардов
+        """
+        ids = [
+            str(await create_wallet(shards, shard, 10))
+            for shard in ("0", "1")
+        ]
+
+        response = await sharded_client.post(
+            "/api/v1/wallets/lookup", json={"ids": ids}
+        )
+
+        results = response.json()["results"]
+        assert [result["id"] for result in results] == ids
+        assert {result["result"] for result in results} == {"FOUND"}
+
+    async def test_batch_create_is_not_committed_on_conflict(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование пакета кошельков с существующим id на другом шарде
+        """
+        new_id = wallet_id_on(shards, "0")
+        existing_id = await create_wallet(shards, "1", 0)
+
+        response = await sharded_client.post(
+            "/api/v1/wallets/batch",
+            json={"ids": [str(new_id), str(existing_id)]}
+        )
+
+        assert response.status_code == HTTPStatus.CONFLICT
+        async with AsyncSession(shards.engines["0"]) as session:
+            assert await session.get(Wallet, new_id) is None
+
+    async def test_cross_shard_transfer_is_rejected(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование отказа в переводе между шардами
+        """
+        from_wallet = await create_wallet(shards, "0", 100)
+        to_wallet = await create_wallet(shards, "1", 0)
+
+        response = await sharded_client.post(
+            "/api/v1/transfers/",
+            json={
+                "from_wallet_id": str(from_wallet),
+                "to_wallet_id": str(to_wallet),
+                "amount": 10
+            },
+        )
+
+        assert response.status_code == HTTPStatus.CONFLICT
+
+    async def test_batch_across_shards(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование пакета операций по кошелькам разных шардов
+        """
+        ids = [
+            str(await create_wallet(shards, shard, 100))
+            for shard in ("0", "1")
+        ]
+        items = [
+            {"wallet_id": wallet_id, "operation_type": "DEPOSIT", "amount": 5}
+            for wallet_id in ids
+        ]
+
+        rejected = await sharded_client.post(
+            "/api/v1/operations/batch",
+            json={"mode": "ALL_OR_NOTHING", "items": items},
+        )
+        applied = await sharded_client.post(
+            "/api/v1/operations/batch",
+            json={"mode": "BEST_EFFORT", "items": items},
+        )
+
+        assert rejected.status_code == HTTPStatus.CONFLICT
+        assert applied.status_code == HTTPStatus.OK
+        assert [
+            (result["wallet_id"], result["new_balance"])
+            for result in applied.json()["results"]
+        ] == [(wallet_id, 105) for wallet_id in ids]
+
+    async def test_best_effort_keeps_committed_shards(
+        self, sharded_client: AsyncClient, shards
+    ):
+        """
+        Тестирование BEST_EFFORT пакета, транзакция одного шарда которого
+        завершилась ошибкой
+        """
+        ids = [
+            str(await create_wallet(shards, shard, 100))
+            for shard in ("0", "1")
+        ]
+        # Любое изменение баланса на шарде 1 нарушит ограничение
+        async with shards.engines["1"].begin() as conn:
+            await conn.execute(text(
+                "ALTER TABLE wallets ADD CONSTRAINT test_frozen "
+                "CHECK (balance = 100) NOT VALID"
+            ))
+
+        response = await sharded_client.post(
+            "/api/v1/operations/batch",
+            json={"mode": "BEST_EFFORT", "items": [
+                {"wallet_id": wallet_id, "operation_type": "DEPOSIT",
+                 "amount": 5}
+                for wallet_id in ids
+            ]},
+        )
+
+        assert response.status_code == HTTPStatus.OK
+        assert response.json()["applied"] is False
+        assert [
+            (result["status_code"], result["new_balance"])
+            for result in response.json()["results"]
+        ] == [
+            (HTTPStatus.OK, 105),
+            (HTTPStatus.INTERNAL_SERVER_ERROR, None),
+        ]
@@ -0,0 +1,35 @@
+import pytest
+import time
+
+from app.core.uuid7 import uuid7
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestUuid7:
+    async def test_version_and_variant(self):
+        """
+        Тестирование версии и варианта UUID
+        """
+        value = uuid7()
+
+        assert value.version == 7
+        assert value.variant == "specified in RFC 4122"
+
+    async def test_timestamp_prefix(self):
+        """
+        Тестирование метки времени в старших 48 битах
+        """
+        before = time.time_ns() // 1_000_000
+        value = uuid7()
+
+        assert abs((value.int >> 80) - before) <= 1000
+
+    async def test_monotonic_within_process(self):
+        """
+        Тестирование строгого возрастания в пределах процесса
+        """
+        values = [uuid7() for _ in range(10_000)]
+
+        assert values == sorted(values)
+        assert len(set(values)) == len(values)
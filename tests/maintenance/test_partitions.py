@@ -0,0 +1,171 @@
+import pytest
+from datetime import datetime, timezone
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+import app.database
+from app.core.config import settings
+from app.maintenance.partitions import (
+    add_months,
+    create_partitions,
+    detach_partitions,
+    list_partitions,
+    main,
+    month_start,
+    parse_args,
+    partition_name,
+    partition_range,
+    upper_bound
+)
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet
+)
+
+pytestmark = pytest.mark.asyncio
+
+MAY_2020 = datetime(2020, 5, 15, tzinfo=timezone.utc)
+
+
+class TestPartitionHelpers:
+    async def test_add_months_across_year(self):
+        """
+        Тестирование сдвига месяца через границу года
+        """
+        start = datetime(2026, 11, 1, tzinfo=timezone.utc)
+
+        assert add_months(start, 2) == datetime(
+            2027, 1, 1, tzinfo=timezone.utc
+        )
+        assert add_months(start, -11) == datetime(
+            2025, 12, 1, tzinfo=timezone.utc
+        )
+
+    async def test_upper_bound(self):
+        """
+        Тестирование разбора границ секции
+        """
+        bound = (
+            "FOR VALUES FROM ('2026-10-01 00:00:00+00') "
+            "TO ('2026-11-01 00:00:00+00')"
+        )
+
+        assert upper_bound(bound) == datetime(2026, 11, 1, tzinfo=timezone.utc)
+        assert upper_bound("DEFAULT") is None
+
+    async def test_partition_range_with_minvalue(self):
+        """
+        Тестирование разбора границ legacy-секции FROM (MINVALUE)
+        """
+        bound = "FOR VALUES FROM (MINVALUE) TO ('2026-11-01 00:00:00+00')"
+
+        assert partition_range(bound) == (
+            None, datetime(2026, 11, 1, tzinfo=timezone.utc)
+        )
+        assert partition_range("DEFAULT") is None
+
+
+class TestPartitionMaintenance:
+    async def test_create_moves_rows_from_default(self, db_session):
+        """
+        Тестирование создания секции поверх строк в DEFAULT
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.flush()
+        db_session.add(Transaction(
+            wallet_id=wallet.id,
+            type=TransactionType.DEPOSIT,
+            amount=10,
+            status=TransactionStatus.SUCCESS,
+            created_at=MAY_2020
+        ))
+        await db_session.commit()
+        engine = create_async_engine(settings.test_db_url)
+
+        created = await create_partitions(engine, 0, now=MAY_2020)
+
+        assert created == [
+            "transactions_p2020_05", "wallet_audit_log_p2020_05"
+        ]
+        async with engine.connect() as conn:
+            assert await conn.scalar(
+                text("SELECT count(*) FROM transactions_p2020_05")
+            ) == 1
+            assert await conn.scalar(
+                text("SELECT count(*) FROM transactions_default")
+            ) == 0
+        # Повторный запуск ничего не создает
+        assert await create_partitions(engine, 0, now=MAY_2020) == []
+        await engine.dispose()
+
+    async def test_create_skips_months_of_legacy_partition(self):
+        """
+        Тестирование: месяцы, покрытые секцией FROM (MINVALUE), пропускаются
+        """
+        engine = create_async_engine(settings.test_db_url)
+        async with engine.begin() as conn:
+            # Как в миграции секционирования: старая таблица - legacy
+            await conn.execute(text(
+                "CREATE TABLE transactions_legacy "
+                "(LIKE transactions INCLUDING DEFAULTS)"
+            ))
+            await conn.execute(text(
+                "ALTER TABLE transactions "
+                "ATTACH PARTITION transactions_legacy "
+                "FOR VALUES FROM (MINVALUE) TO ('2020-06-01 00:00:00+00')"
+            ))
+
+        created = await create_partitions(engine, 1, now=MAY_2020)
+
+        assert created == [
+            "transactions_p2020_06",
+            "wallet_audit_log_p2020_05",
+            "wallet_audit_log_p2020_06",
+        ]
+        await engine.dispose()
+
+    async def test_detach_old_partitions(self):
+        """
+        Тестирование отсоединения секций старше срока хранения
+        """
+        engine = create_async_engine(settings.test_db_url)
+        await create_partitions(engine, 1, now=MAY_2020)
+
+        detached = await detach_partitions(
+            engine,
+            retention_months=1,
+            drop=True,
+            now=datetime(2020, 7, 1, tzinfo=timezone.utc)
+        )
+
+        assert detached == [
+            "transactions_p2020_05", "wallet_audit_log_p2020_05"
+        ]
+        async with engine.connect() as conn:
+            names = [
+                name for name, _ in await list_partitions(conn, "transactions")
+            ]
+        assert names == ["transactions_default", "transactions_p2020_06"]
+        await engine.dispose()
+
+    async def test_command_runs_on_every_shard(self, shards, monkeypatch):
+        """
+        Тестирование команды create на всех шардах
+        """
+        monkeypatch.setattr(app.database, "shard_router", shards)
+
+        await main(parse_args(["create", "--months-ahead", "0"]))
+
+        name = partition_name(
+            "transactions", month_start(datetime.now(timezone.utc))
+        )
+        for shard_engine in shards.engines.values():
+            async with shard_engine.connect() as conn:
+                names = [
+                    partition for partition, _ in
+                    await list_partitions(conn, "transactions")
+                ]
+            assert name in names
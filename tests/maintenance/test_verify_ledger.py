@@ -0,0 +1,30 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import app.database
+from app.core.uuid7 import uuid7
+from app.maintenance.verify_ledger import main, parse_args
+from app.models import Wallet
+
+pytestmark = pytest.mark.asyncio
+
+
+class TestVerifyLedgerCommand:
+    async def test_drift_on_second_shard(self, shards, monkeypatch, capsys):
+        """
+        Тестирование сверки всех шардов: расхождение на шарде 1
+        """
+        monkeypatch.setattr(app.database, "shard_router", shards)
+        # Баланс без транзакций в журнале
+        wallet_id = uuid7()
+        async with AsyncSession(shards.engines["1"]) as session:
+            session.add(Wallet(id=wallet_id, balance=100))
+            await session.commit()
+
+        exit_code = await main(parse_args([]))
+
+        output = capsys.readouterr().out
+        assert exit_code == 1
+        assert f"{wallet_id}: balance 100, ledger 0" in output
+        assert "shard 0: 0 wallets" in output
+        assert "shard 1: 1 wallets" in output
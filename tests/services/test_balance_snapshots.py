@@ -0,0 +1,148 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select
+
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet,
+    WalletBalanceSnapshot
+)
+from app.services.balance_snapshots import balance_at, take_snapshots
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# (минута, тип, сумма, статус)
+HISTORY = [
+    (0, TransactionType.DEPOSIT, 100, TransactionStatus.SUCCESS),
+    (1, TransactionType.WITHDRAW, 30, TransactionStatus.SUCCESS),
+    (2, TransactionType.WITHDRAW, 500, TransactionStatus.FAILED),
+    (3, TransactionType.DEPOSIT, 50, TransactionStatus.SUCCESS),
+    (4, TransactionType.WITHDRAW, 20, TransactionStatus.SUCCESS),
+]
+
+
+async def create_history(db_session) -> Wallet:
+    wallet = Wallet(balance=100)
+    db_session.add(wallet)
+    await db_session.flush()
+    db_session.add_all(
+        Transaction(
+            wallet_id=wallet.id,
+            type=type_,
+            amount=amount,
+            status=status,
+            created_at=START + timedelta(minutes=minute)
+        )
+        for minute, type_, amount, status in HISTORY
+    )
+    await db_session.commit()
+    return wallet
+
+
+class TestBalanceSnapshots:
+    async def test_balance_at_without_snapshot(self, db_session):
+        """
+        Тестирование баланса на момент времени по журналу транзакций
+        """
+        wallet = await create_history(db_session)
+
+        assert await balance_at(
+            db_session, wallet.id, START - timedelta(minutes=1)
+        ) == 0
+        assert await balance_at(
+            db_session, wallet.id, START + timedelta(minutes=2)
+        ) == 70
+        assert await balance_at(
+            db_session, wallet.id, START + timedelta(hours=1)
+        ) == 100
+
+    async def test_snapshot_gives_same_balance(self, db_session):
+        """
+        Тестирование совпадения баланса со снимком и без него
+        """
+        wallet = await create_history(db_session)
+        expected = [
+            await balance_at(
+                db_session, wallet.id, START + timedelta(minutes=minute)
+            )
+            for minute in range(6)
+        ]
+        await db_session.commit()
+
+        written = await take_snapshots(
+            db_session, cutoff=START + timedelta(minutes=2, seconds=30)
+        )
+
+        assert written == 1
+        snapshot = await db_session.scalar(select(WalletBalanceSnapshot))
+        assert snapshot.balance == 70
+        assert [
+            await balance_at(
+                db_session, wallet.id, START + timedelta(minutes=minute)
+            )
+            for minute in range(6)
+        ] == expected
+
+    async def test_snapshots_are_incremental(self, db_session):
+        """
+        Тестирование повторного снимка: только кошельки с новыми транзакциями
+        """
+        await create_history(db_session)
+        cutoff = START + timedelta(minutes=2)
+
+        assert await take_snapshots(db_session, cutoff=cutoff) == 1
+        assert await take_snapshots(db_session, cutoff=cutoff) == 0
+        assert await take_snapshots(
+            db_session, cutoff=START + timedelta(minutes=10)
+        ) == 1
+        balances = (await db_session.scalars(
+            select(WalletBalanceSnapshot.balance)
+            .order_by(WalletBalanceSnapshot.as_of)
+        )).all()
+        assert balances == [70, 100]
+        assert await db_session.scalar(
+            select(func.count()).select_from(WalletBalanceSnapshot)
+        ) == 2
+
+    async def test_window_starts_at_previous_cutoff(self, db_session):
+        """
+        Тестирование снимка кошелька, чей последний снимок старше
+        среза предыдущего запуска
+        """
+        wallet = await create_history(db_session)
+        other = Wallet(balance=0)
+        db_session.add(other)
+        await db_session.flush()
+        db_session.add_all(
+            Transaction(
+                wallet_id=wallet_id,
+                type=TransactionType.DEPOSIT,
+                amount=5,
+                status=TransactionStatus.SUCCESS,
+                created_at=START + timedelta(minutes=minute)
+            )
+            for wallet_id, minute in ((other.id, 7), (wallet.id, 12))
+        )
+        await db_session.commit()
+
+        for minutes in (2, 10, 15):
+            await take_snapshots(
+                db_session, cutoff=START + timedelta(minutes=minutes)
+            )
+
+        snapshots = (await db_session.execute(
+            select(
+                WalletBalanceSnapshot.wallet_id,
+                WalletBalanceSnapshot.balance
+            )
+            .order_by(
+                WalletBalanceSnapshot.as_of, WalletBalanceSnapshot.balance
+            )
+        )).all()
+        assert snapshots == [
+            (wallet.id, 70), (other.id, 5), (wallet.id, 100), (wallet.id, 105)
+        ]
@@ -0,0 +1,128 @@
+import pytest
+import pytest_asyncio
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.core.config import settings
+from app.models import (
+    LedgerCheckpoint,
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet
+)
+from app.services.ledger_verifier import verify_ledger
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+CUTOFF = START + timedelta(hours=1)
+
+
+async def create_wallet(db_session, balance: int, history) -> Wallet:
+    """history: список (минута от START, тип, сумма)"""
+    wallet = Wallet(balance=balance)
+    db_session.add(wallet)
+    await db_session.flush()
+    db_session.add_all(
+        Transaction(
+            wallet_id=wallet.id,
+            type=type_,
+            amount=amount,
+            status=TransactionStatus.SUCCESS,
+            created_at=START + timedelta(minutes=minute)
+        )
+        for minute, type_, amount in history
+    )
+    await db_session.commit()
+    return wallet
+
+
+@pytest_asyncio.fixture
+async def engine():
+    test_engine = create_async_engine(settings.test_db_url)
+    yield test_engine
+    await test_engine.dispose()
+
+
+class TestLedgerVerifier:
+    async def test_consistent_wallet_gets_checkpoint(self, db_session, engine):
+        """
+        Тестирование сверки без расхождений и записи чекпоинта
+        """
+        wallet = await create_wallet(db_session, 70, [
+            (0, TransactionType.DEPOSIT, 100),
+            (1, TransactionType.WITHDRAW, 30),
+        ])
+
+        report = await verify_ledger(engine, cutoff=CUTOFF)
+
+        assert report.wallets == 1
+        assert report.drift == []
+        checkpoint = await db_session.get(LedgerCheckpoint, wallet.id)
+        assert checkpoint.verified_balance == 70
+        assert checkpoint.verified_through == CUTOFF
+
+    async def test_drift_is_reported(self, db_session, engine):
+        """
+        Тестирование обнаружения расхождения баланса и журнала
+        """
+        wallet = await create_wallet(db_session, 100, [
+            (0, TransactionType.DEPOSIT, 70),
+        ])
+
+        report = await verify_ledger(engine, cutoff=CUTOFF)
+
+        assert [(d.wallet_id, d.balance, d.ledger_balance)
+                for d in report.drift] == [(wallet.id, 100, 70)]
+        assert await db_session.get(LedgerCheckpoint, wallet.id) is None
+
+    async def test_incremental_pass(self, db_session, engine):
+        """
+        Тестирование прохода от чекпоинта с новыми транзакциями
+        """
+        wallet = await create_wallet(db_session, 100, [
+            (0, TransactionType.DEPOSIT, 100),
+        ])
+        await verify_ledger(engine, cutoff=CUTOFF)
+
+        db_session.add(Transaction(
+            wallet_id=wallet.id,
+            type=TransactionType.WITHDRAW,
+            amount=40,
+            status=TransactionStatus.SUCCESS,
+            created_at=CUTOFF + timedelta(minutes=1)
+        ))
+        wallet.balance = 60
+        await db_session.commit()
+
+        # Новая транзакция позже среза: проверяется, но в чекпоинт не входит
+        report = await verify_ledger(engine, cutoff=CUTOFF)
+        assert report.drift == []
+        checkpoint = await db_session.scalar(select(LedgerCheckpoint))
+        assert checkpoint.verified_balance == 100
+
+        later = CUTOFF + timedelta(hours=1)
+        report = await verify_ledger(engine, cutoff=later)
+        assert report.drift == []
+        await db_session.refresh(checkpoint)
+        assert checkpoint.verified_balance == 60
+        assert checkpoint.verified_through == later
+
+    async def test_parallel_chunks(self, db_session, engine):
+        """
+        Тестирование сверки несколькими чанками и воркерами
+        """
+        for _ in range(5):
+            await create_wallet(db_session, 10, [
+                (0, TransactionType.DEPOSIT, 10),
+            ])
+
+        report = await verify_ledger(
+            engine, workers=2, chunk_size=2, cutoff=CUTOFF
+        )
+
+        assert report.wallets == 5
+        assert report.chunks == 3
+        assert report.drift == []
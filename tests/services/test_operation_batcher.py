@@ -0,0 +1,153 @@
+import asyncio
+import pytest
+import uuid
+from http import HTTPStatus
+from fastapi import HTTPException
+from httpx import AsyncClient
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.models import Transaction, Wallet
+from app.schemas import WalletOperationSchema
+from app.services.operation_batcher import OperationBatcher
+
+pytestmark = pytest.mark.asyncio
+
+
+def make_operation(operation_type: str, amount: int) -> WalletOperationSchema:
+    return WalletOperationSchema(operation_type=operation_type, amount=amount)
+
+
+class TestOperationBatcher:
+    async def test_concurrent_operations_share_one_batch(self):
+        """
+        Тестирование объединения конкурентных операций в один пакет
+        """
+        calls = []
+
+        async def apply_batch(db, wallet_uuid, operations):
+            calls.append(operations)
+            return [100 + i for i in range(len(operations))]
+
+        batcher = OperationBatcher(apply_batch, window_ms=50, max_size=100)
+        wallet_uuid = uuid.uuid4()
+
+        results = await asyncio.gather(*[
+            batcher.submit(None, wallet_uuid, make_operation("DEPOSIT", 1))
+            for _ in range(5)
+        ])
+
+        assert len(calls) == 1
+        assert len(calls[0]) == 5
+        assert results == [100, 101, 102, 103, 104]
+
+    async def test_batch_max_size(self):
+        """
+        Тестирование ограничения размера пакета
+        """
+        calls = []
+
+        async def apply_batch(db, wallet_uuid, operations):
+            calls.append(len(operations))
+            return [0] * len(operations)
+
+        batcher = OperationBatcher(apply_batch, window_ms=50, max_size=2)
+        wallet_uuid = uuid.uuid4()
+
+        await asyncio.gather(*[
+            batcher.submit(None, wallet_uuid, make_operation("DEPOSIT", 1))
+            for _ in range(5)
+        ])
+
+        assert sorted(calls) == [1, 2, 2]
+
+    async def test_errors_are_per_operation(self):
+        """
+        Тестирование раздачи ошибок только упавшим операциям
+        """
+        async def apply_batch(db, wallet_uuid, operations):
+            return [
+                HTTPException(HTTPStatus.BAD_REQUEST, "Insufficient funds")
+                if operation.operation_type == "WITHDRAW"
+                else 10
+                for operation in operations
+            ]
+
+        batcher = OperationBatcher(apply_batch, window_ms=50, max_size=100)
+        wallet_uuid = uuid.uuid4()
+
+        results = await asyncio.gather(
+            batcher.submit(None, wallet_uuid, make_operation("DEPOSIT", 1)),
+            batcher.submit(None, wallet_uuid, make_operation("WITHDRAW", 1)),
+            return_exceptions=True
+        )
+
+        assert results[0] == 10
+        assert isinstance(results[1], HTTPException)
+        assert results[1].status_code == HTTPStatus.BAD_REQUEST
+
+    async def test_leader_cancelled_during_apply(self):
+        """
+        Тестирование отмены лидера во время применения пакета: остальные
+        получают результаты закоммиченных операций
+        """
+        started = asyncio.Event()
+        committed = asyncio.Event()
+
+        async def apply_batch(db, wallet_uuid, operations):
+            started.set()
+            await asyncio.sleep(0.05)
+            committed.set()
+            return [100 + i for i in range(len(operations))]
+
+        batcher = OperationBatcher(apply_batch, window_ms=10, max_size=100)
+        wallet_uuid = uuid.uuid4()
+        leader = asyncio.create_task(
+            batcher.submit(None, wallet_uuid, make_operation("DEPOSIT", 1))
+        )
+        await asyncio.sleep(0)
+        follower = asyncio.create_task(
+            batcher.submit(None, wallet_uuid, make_operation("DEPOSIT", 1))
+        )
+        await started.wait()
+
+        leader.cancel()
+
+        assert await follower == 101
+        assert committed.is_set()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+
+    async def test_batched_endpoint_operations(
+        self, async_client: AsyncClient, db_session, monkeypatch
+    ):
+        """
+        Тестирование пакетного режима через API
+        """
+        monkeypatch.setattr(settings, "OPERATION_BATCHING_ENABLED", True)
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        operations = [("DEPOSIT", 10)] * 5 + [("WITHDRAW", 500)]
+        responses = await asyncio.gather(*[
+            async_client.post(
+                f"/api/v1/wallets/{wallet.id}/operations/",
+                json={"operation_type": operation_type, "amount": amount},
+            )
+            for operation_type, amount in operations
+        ])
+
+        status_codes = [response.status_code for response in responses]
+        assert status_codes.count(HTTPStatus.OK) == 5
+        assert status_codes.count(HTTPStatus.BAD_REQUEST) == 1
+
+        check_response = await async_client.get(f"/api/v1/wallets/{wallet.id}")
+        assert check_response.json()["balance"] == 150
+
+        transactions_count = await db_session.scalar(
+            select(func.count())
+            .select_from(Transaction)
+            .where(Transaction.wallet_id == wallet.id)
+        )
+        assert transactions_count == 5
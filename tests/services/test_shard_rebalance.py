@@ -0,0 +1,183 @@
+import pytest
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.sharding import ShardRouter
+from app.core.uuid7 import uuid7
+from app.models import (
+    Transaction,
+    TransactionStatus,
+    TransactionType,
+    Wallet,
+    WalletAuditLog,
+    WalletBalanceSnapshot
+)
+from app.services.balance_snapshots import take_snapshots
+from app.services.shard_rebalance import rebalance_shards
+
+pytestmark = pytest.mark.asyncio
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def wallet_id_on(shards: ShardRouter, shard: str):
+    wallet_id = uuid7()
+    while shards.shard_for(wallet_id) != shard:
+        wallet_id = uuid7()
+    return wallet_id
+
+
+async def add_transactions(engine, wallet_id, history):
+    """Успешные пополнения кошелька: [(created_at, сумма)]"""
+    async with AsyncSession(engine) as session:
+        session.add_all(
+            Transaction(
+                wallet_id=wallet_id,
+                type=TransactionType.DEPOSIT,
+                amount=amount,
+                status=TransactionStatus.SUCCESS,
+                created_at=created_at
+            )
+            for created_at, amount in history
+        )
+        await session.commit()
+
+
+async def add_wallet(engine, wallet_id, history):
+    async with AsyncSession(engine) as session:
+        session.add(Wallet(id=wallet_id))
+        await session.commit()
+    await add_transactions(engine, wallet_id, history)
+
+
+async def create_misplaced_wallet(shards: ShardRouter):
+    """Кошелек шарда 1 с историей, записанный на шард 0"""
+    wallet_id = wallet_id_on(shards, "1")
+
+    async with AsyncSession(shards.engines["0"]) as session:
+        session.add(Wallet(id=wallet_id, balance=100))
+        await session.flush()
+        session.add(Transaction(
+            wallet_id=wallet_id,
+            type=TransactionType.DEPOSIT,
+            amount=100,
+            status=TransactionStatus.SUCCESS,
+            balance_after=100
+        ))
+        session.add(WalletAuditLog(
+            wallet_id=wallet_id,
+            action="BALANCE_DEPOSIT",
+            old_balance=0,
+            new_balance=100
+        ))
+        await session.commit()
+    return wallet_id
+
+
+async def count_rows(engine, model, wallet_id) -> int:
+    column = model.id if model is Wallet else model.wallet_id
+    async with engine.connect() as conn:
+        return await conn.scalar(
+            select(func.count()).select_from(model).where(column == wallet_id)
+        )
+
+
+class TestShardRebalance:
+    async def test_wallet_is_moved_with_its_rows(self, shards):
+        """
+        Тестирование переноса кошелька с транзакциями и аудитом
+        """
+        wallet_id = await create_misplaced_wallet(shards)
+
+        report = await rebalance_shards(shards)
+
+        assert report.moved == {("0", "1"): 1}
+        for model in (Wallet, Transaction, WalletAuditLog):
+            assert await count_rows(shards.engines["0"], model, wallet_id) == 0
+            assert await count_rows(shards.engines["1"], model, wallet_id) == 1
+
+    async def test_history_is_copied_in_batches(self, shards):
+        """
+        Тестирование копирования истории несколькими страницами
+        """
+        wallet_id = await create_misplaced_wallet(shards)
+        async with AsyncSession(shards.engines["0"]) as session:
+            session.add_all(
+                Transaction(
+                    wallet_id=wallet_id,
+                    type=TransactionType.DEPOSIT,
+                    amount=1,
+                    status=TransactionStatus.SUCCESS,
+                )
+                for _ in range(4)
+            )
+            await session.commit()
+
+        await rebalance_shards(shards, copy_batch_size=2)
+
+        source, target = shards.engines["0"], shards.engines["1"]
+        assert await count_rows(target, Transaction, wallet_id) == 5
+        assert await count_rows(source, Transaction, wallet_id) == 0
+
+    async def test_snapshots_follow_target_cutoff(self, shards):
+        """
+        Тестирование снимков кошелька, перенесенного на шард, срез
+        снимков которого позже среза исходного шарда
+        """
+        resident_id = wallet_id_on(shards, "1")
+        moved_id = wallet_id_on(shards, "1")
+        await add_wallet(shards.engines["1"], resident_id, [(START, 5)])
+        await add_wallet(shards.engines["0"], moved_id, [
+            (START, 100), (START + timedelta(minutes=1), 10)
+        ])
+        for shard, minutes in (("0", 0), ("1", 2)):
+            async with AsyncSession(shards.engines[shard]) as session:
+                await take_snapshots(
+                    session, cutoff=START + timedelta(minutes=minutes)
+                )
+
+        await rebalance_shards(shards)
+        await add_transactions(shards.engines["1"], moved_id, [
+            (START + timedelta(minutes=2, seconds=30), 1)
+        ])
+        async with AsyncSession(shards.engines["1"]) as session:
+            await take_snapshots(session, cutoff=START + timedelta(minutes=3))
+            snapshots = (await session.execute(
+                select(
+                    WalletBalanceSnapshot.as_of,
+                    WalletBalanceSnapshot.balance
+                )
+                .where(WalletBalanceSnapshot.wallet_id == moved_id)
+                .order_by(WalletBalanceSnapshot.as_of)
+            )).all()
+
+        assert snapshots == [
+            (START, 100),
+            (START + timedelta(minutes=2), 110),
+            (START + timedelta(minutes=3), 111),
+        ]
+
+    async def test_dry_run_moves_nothing(self, shards):
+        """
+        Тестирование режима --dry-run
+        """
+        wallet_id = await create_misplaced_wallet(shards)
+
+        report = await rebalance_shards(shards, dry_run=True)
+
+        assert report.moved == {("0", "1"): 1}
+        assert await count_rows(shards.engines["0"], Wallet, wallet_id) == 1
+        assert await count_rows(shards.engines["1"], Wallet, wallet_id) == 0
+
+    async def test_repeated_run_is_noop(self, shards):
+        """
+        Тестирование повторного запуска после переноса
+        """
+        await create_misplaced_wallet(shards)
+        await rebalance_shards(shards)
+
+        report = await rebalance_shards(shards)
+
+        assert report.moved == {}
+        assert report.wallets == 1
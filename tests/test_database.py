@@ -0,0 +1,68 @@
+import pytest
+import pytest_asyncio
+from http import HTTPStatus
+from httpx import AsyncClient
+from sqlalchemy import text
+
+import app.database
+from app.core.config import settings
+from app.core.replicas import ReplicaRouter
+from app.database import _create_engine, get_read_db, wallet_session
+from app.main import app as fastapi_app
+from app.models import Wallet
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest_asyncio.fixture
+async def read_router(monkeypatch):
+    """Чтение без реплик: primary в режиме AUTOCOMMIT, как read_engine"""
+    test_engine = _create_engine(settings.test_db_url, "shard:0")
+    router = ReplicaRouter(
+        test_engine.execution_options(isolation_level="AUTOCOMMIT"), []
+    )
+    monkeypatch.setattr(app.database, "replica_router", router)
+    yield router
+    await test_engine.dispose()
+
+
+class TestReadSession:
+    async def test_statements_run_outside_transaction(self, read_router):
+        """
+        Тестирование сессии чтения: каждый запрос - отдельная транзакция
+        """
+        async with wallet_session(None, read_only=True) as session:
+            first = await session.scalar(text("SELECT now()"))
+            second = await session.scalar(text("SELECT now()"))
+
+        # Внутри транзакции now() не меняется между запросами
+        assert first != second
+
+    async def test_read_endpoints_through_read_session(
+        self, async_client: AsyncClient, db_session, read_router
+    ):
+        """
+        Тестирование читающих эндпоинтов через ReadSessionLocal
+        """
+        wallet = Wallet(balance=0)
+        db_session.add(wallet)
+        await db_session.commit()
+        url = f"/api/v1/wallets/{wallet.id}"
+        await async_client.post(
+            f"{url}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 50},
+        )
+        fastapi_app.dependency_overrides.pop(get_read_db)
+
+        responses = [
+            await async_client.get(url),
+            await async_client.get(f"{url}/balance"),
+            await async_client.get(f"{url}/transactions/"),
+            await async_client.get(f"{url}/audit/"),
+        ]
+
+        assert [r.status_code for r in responses] == [HTTPStatus.OK] * 4
+        assert responses[0].json()["balance"] == 50
+        assert responses[1].json()["balance"] == 50
+        assert len(responses[2].json()["items"]) == 1
+        assert len(responses[3].json()["items"]) == 1
@@ -0,0 +1,77 @@
+import pytest
+from http import HTTPStatus
+from httpx import AsyncClient
+
+from app import repository
+from app.core.config import settings
+from app.models import Wallet, WalletStatus
+
+pytestmark = pytest.mark.asyncio
+
+
+@pytest.fixture
+def core_layer(monkeypatch):
+    monkeypatch.setattr(settings, "DB_QUERY_LAYER", "core")
+
+
+class TestRepository:
+    async def test_get_wallet(self, db_session):
+        """
+        Тестирование чтения кошелька строкой запроса
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+
+        row = await repository.get_wallet(db_session, wallet.id)
+
+        assert (row.id, row.balance, row.status) == (
+            wallet.id, 100, WalletStatus.ACTIVE
+        )
+
+    async def test_set_wallet_status(self, db_session):
+        """
+        Тестирование смены статуса и отказа для удаленного кошелька
+        """
+        wallet = Wallet()
+        deleted = Wallet(status=WalletStatus.DELETED)
+        db_session.add_all([wallet, deleted])
+        await db_session.commit()
+
+        row = await repository.set_wallet_status(
+            db_session, wallet.id, WalletStatus.FROZEN
+        )
+        assert row.status == WalletStatus.FROZEN
+        assert row.updated_at is not None
+
+        assert await repository.set_wallet_status(
+            db_session, deleted.id, WalletStatus.ACTIVE
+        ) is None
+
+    async def test_endpoints_on_core_layer(
+        self, async_client: AsyncClient, db_session, core_layer
+    ):
+        """
+        Тестирование операций и чтения кошелька через Core-слой
+        """
+        wallet = Wallet(balance=100)
+        db_session.add(wallet)
+        await db_session.commit()
+        url = f"/api/v1/wallets/{wallet.id}"
+
+        deposit = await async_client.post(
+            f"{url}/operations/",
+            json={"operation_type": "DEPOSIT", "amount": 50}
+        )
+        withdraw = await async_client.post(
+            f"{url}/operations/",
+            json={"operation_type": "WITHDRAW", "amount": 500}
+        )
+        frozen = await async_client.patch(url, json={"status": "FROZEN"})
+        response = await async_client.get(url)
+
+        assert deposit.json() == {"new_balance": 150}
+        assert withdraw.status_code == HTTPStatus.BAD_REQUEST
+        assert frozen.status_code == HTTPStatus.OK
+        assert response.json()["balance"] == 150
+        assert response.json()["status"] == "FROZEN"